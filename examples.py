@@ -3,6 +3,7 @@
 
 import getwowdataasync
 import asyncio
+import sys
 
 async def main():
     us_api = await getwowdataasync.WowApi.create('us') #region
@@ -48,5 +49,6 @@ async def main():
     # 'last_updated_timestamp': 1653847530000,
     # 'price': 1656890000} 
 
-asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 asyncio.run(main())
\ No newline at end of file
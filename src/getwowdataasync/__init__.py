@@ -1,2 +1,22 @@
 from .getdata import *
 from .helpers import *
+from .interning import *
+from .expansions import *
+from .ratelimit import *
+from .media import *
+from .polling import *
+from .auctions import *
+from .history import *
+from .timeseries import *
+from .priceindex import *
+from .regions import *
+from .hedging import *
+from .deadlines import *
+from .progress import *
+from .sinks import *
+from .database import *
+from .mirror import *
+from .crafting import *
+from .realms import *
+from .itemnames import *
+from .catalog import *
@@ -0,0 +1,5 @@
+import sys
+
+from getwowdataasync.cli import main
+
+sys.exit(main())
@@ -0,0 +1,145 @@
+"""This module contains tools for comparing auction snapshots.
+
+get_auctions() and get_commodities() return a list of auction dicts.
+AuctionSnapshot stores the same auctions as compact arrays sorted by
+auction id so two snapshots can be compared with a single merge join
+instead of building dicts and sets of 100k+ auctions.
+
+Typical usage example:
+
+old = AuctionSnapshot.from_json(await us_api.get_auctions(4))
+... an hour later ...
+new = AuctionSnapshot.from_json(await us_api.get_auctions(4))
+diff = diff_snapshots(old, new)
+diff.estimated_sold() # {item_id: quantity, ...}
+"""
+from array import array
+
+time_left_codes = {"SHORT": 0, "MEDIUM": 1, "LONG": 2, "VERY_LONG": 3}
+
+
+def auction_price(auction: dict) -> int:
+    """Returns an auction's price per item in copper.
+
+    Commodities have a unit_price, other items a buyout and/or bid.
+    """
+    return auction.get("unit_price") or auction.get("buyout") or auction.get("bid") or 0
+
+
+class AuctionSnapshot:
+    """Auctions stored as columns (one array per field) sorted by auction id.
+
+    Attributes:
+        ids (array): Auction ids in increasing order.
+        item_ids (array): The id of the item being sold.
+        quantities (array): How many of the item are in the auction.
+        prices (array): The price per item in copper. See auction_price().
+        time_left (array): time_left_codes of each auction.
+    """
+
+    def __init__(self, ids: array, item_ids: array, quantities: array, prices: array, time_left: array):
+        self.ids = ids
+        self.item_ids = item_ids
+        self.quantities = quantities
+        self.prices = prices
+        self.time_left = time_left
+
+    @classmethod
+    def from_json(cls, auctions_json: dict) -> "AuctionSnapshot":
+        """Builds a snapshot from get_auctions() or get_commodities() json."""
+        auctions = sorted(auctions_json["auctions"], key=lambda auction: auction["id"])
+        return cls(
+            array("q", [auction["id"] for auction in auctions]),
+            array("q", [auction["item"]["id"] for auction in auctions]),
+            array("q", [auction["quantity"] for auction in auctions]),
+            array("q", [auction_price(auction) for auction in auctions]),
+            array("b", [time_left_codes.get(auction.get("time_left"), 0) for auction in auctions]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class AuctionDiff:
+    """The differences between two consecutive snapshots.
+
+    Attributes:
+        old (AuctionSnapshot): The earlier snapshot.
+        new (AuctionSnapshot): The later snapshot.
+        added (array): Indexes in new of auctions that aren't in old.
+        removed (array): Indexes in old of auctions that aren't in new.
+        changed_old (array): Indexes in old of auctions whose price or
+            quantity changed.
+        changed_new (array): Indexes in new of the same auctions as changed_old.
+    """
+
+    def __init__(self, old: AuctionSnapshot, new: AuctionSnapshot):
+        self.old = old
+        self.new = new
+        self.added = array("l")
+        self.removed = array("l")
+        self.changed_old = array("l")
+        self.changed_new = array("l")
+
+    def estimated_sold(self) -> dict:
+        """Estimates how many of each item sold between the snapshots.
+
+        A removed auction counts as sold unless it had SHORT time left
+        since it may have just expired. A quantity drop in an auction
+        that is still listed (a partly bought commodity) counts as sold.
+
+        Returns:
+            A dict of item id to estimated quantity sold.
+        """
+        sold = {}
+        short = time_left_codes["SHORT"]
+        old = self.old
+        for index in self.removed:
+            if old.time_left[index] != short:
+                item_id = old.item_ids[index]
+                sold[item_id] = sold.get(item_id, 0) + old.quantities[index]
+        for old_index, new_index in zip(self.changed_old, self.changed_new):
+            difference = old.quantities[old_index] - self.new.quantities[new_index]
+            if difference > 0:
+                item_id = old.item_ids[old_index]
+                sold[item_id] = sold.get(item_id, 0) + difference
+        return sold
+
+
+def diff_snapshots(old: AuctionSnapshot, new: AuctionSnapshot) -> AuctionDiff:
+    """Finds the added, removed and changed auctions between two snapshots.
+
+    Both snapshots are sorted by auction id so one pass over each is enough.
+
+    Args:
+        old (AuctionSnapshot): The earlier snapshot.
+        new (AuctionSnapshot): The later snapshot.
+
+    Returns:
+        An AuctionDiff of the two snapshots.
+    """
+    diff = AuctionDiff(old, new)
+    old_ids, new_ids = old.ids, new.ids
+    old_length, new_length = len(old_ids), len(new_ids)
+    old_index = new_index = 0
+    while old_index < old_length and new_index < new_length:
+        old_id = old_ids[old_index]
+        new_id = new_ids[new_index]
+        if old_id == new_id:
+            if (
+                old.prices[old_index] != new.prices[new_index]
+                or old.quantities[old_index] != new.quantities[new_index]
+            ):
+                diff.changed_old.append(old_index)
+                diff.changed_new.append(new_index)
+            old_index += 1
+            new_index += 1
+        elif old_id < new_id:
+            diff.removed.append(old_index)
+            old_index += 1
+        else:
+            diff.added.append(new_index)
+            new_index += 1
+    diff.removed.extend(range(old_index, old_length))
+    diff.added.extend(range(new_index, new_length))
+    return diff
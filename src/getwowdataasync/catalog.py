@@ -0,0 +1,321 @@
+"""This module contains the ItemCatalog, an item file many processes can memory map and share.
+
+The file holds a sorted array of item ids, a fixed size record of each
+item's common fields and two offset tables into blobs of every item's
+name and full json. Looking an item up is a binary search of the ids and
+reading at the found position, so nothing is loaded into each process's
+memory and the operating system shares the file's pages between them.
+
+Layout (little endian):
+    header: b"WOWCAT01", item count, then the start of each section
+    ids: int64 per item, increasing
+    fields: a _fields record per item, same order as ids
+    name offsets, json offsets: uint64 per item plus one, into the blobs
+    names: utf-8 names
+    jsons: utf-8 json of each item
+
+Typical usage example:
+
+with ItemCatalogWriter("items.catalog") as writer:
+    await us_api.get_all_items(sink=writer)
+
+catalog = ItemCatalog("items.catalog") # in every worker process
+catalog.name(19019)         # 'Thunderfury, Blessed Blade of the Windseeker'
+catalog.fields(19019).level # 80
+catalog[19019]              # the item's full json
+"""
+import bisect
+import collections
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+_magic = b"WOWCAT01"
+_header = struct.Struct("<8sQ6Q")
+# quality, flags, level, required_level, item_class_id, item_subclass_id, max_count, purchase_price, sell_price
+_fields = struct.Struct("<bBhhhhiqq")
+
+qualities = ["POOR", "COMMON", "UNCOMMON", "RARE", "EPIC", "LEGENDARY", "ARTIFACT", "HEIRLOOM", "WOW_TOKEN"]
+_quality_codes = {quality: code for code, quality in enumerate(qualities)}
+# Each flag has a second bit set when the item has the field at all.
+_EQUIPPABLE = 1
+_STACKABLE = 2
+_HAS_EQUIPPABLE = 4
+_HAS_STACKABLE = 8
+
+ItemFields = collections.namedtuple(
+    "ItemFields",
+    [
+        "id", "quality", "level", "required_level", "item_class_id", "item_subclass_id",
+        "max_count", "purchase_price", "sell_price", "is_equippable", "is_stackable",
+    ],
+)
+ItemFields.__doc__ = """An item's common fields. Missing fields are None."""
+
+
+class ItemCatalogWriter:
+    """Builds an ItemCatalog file from items as they are crawled.
+
+    It is a sink, so a crawl can write to it directly. Names and json go to
+    temporary files as items arrive and only ids, fields and offsets are
+    kept in memory. The catalog is written when the writer is closed and
+    replaces any earlier file at the path in one step, so processes that
+    already mapped the old file keep reading it safely.
+    """
+
+    def __init__(self, path: str, locale: str = "en_US"):
+        """
+        Args:
+            path (str): Where the catalog is written.
+            locale (str): Which name to keep of items whose names are in
+                every locale, like item search results.
+        """
+        self.path = path
+        self.locale = locale
+        self.written = 0
+        self._ids = array("q")
+        self._fields = bytearray()
+        self._names = tempfile.TemporaryFile()
+        self._jsons = tempfile.TemporaryFile()
+        self._name_offsets = array("Q", [0])
+        self._json_offsets = array("Q", [0])
+
+    async def write(self, elements: list) -> None:
+        """Adds a batch of items. Lets the writer be a crawl's sink."""
+        self.add(elements)
+
+    def add(self, items) -> None:
+        """Adds items. An item added again replaces the earlier one.
+
+        Args:
+            items: An iterable of item json. None's are skipped.
+        """
+        for item in items:
+            if not item:
+                continue
+            name = item.get("name")
+            if isinstance(name, dict):
+                name = name.get(self.locale)
+            name = name if isinstance(name, str) else ""
+            self._ids.append(item["id"])
+            self._fields += _pack_fields(item)
+            self._name_offsets.append(self._name_offsets[-1] + self._names.write(name.encode("utf-8")))
+            encoded = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self._json_offsets.append(self._json_offsets[-1] + self._jsons.write(encoded))
+            self.written += 1
+
+    def close(self) -> None:
+        """Writes the catalog file and removes the temporary files."""
+        try:
+            self._write_catalog()
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Removes the temporary files without writing the catalog."""
+        self._names.close()
+        self._jsons.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A failed crawl leaves any earlier catalog in place instead of a partial one.
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _write_catalog(self) -> None:
+        # Keeps the last of each id, in id order.
+        last_rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        order = [last_rows[item_id] for item_id in sorted(last_rows)]
+        count = len(order)
+        name_offsets = _offsets(self._name_offsets, order)
+        json_offsets = _offsets(self._json_offsets, order)
+
+        ids_start = _header.size
+        fields_start = ids_start + 8 * count
+        name_offsets_start = fields_start + _fields.size * count
+        json_offsets_start = name_offsets_start + 8 * (count + 1)
+        names_start = json_offsets_start + 8 * (count + 1)
+        jsons_start = names_start + name_offsets[-1]
+
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(_header.pack(
+                _magic, count, ids_start, fields_start, name_offsets_start,
+                json_offsets_start, names_start, jsons_start,
+            ))
+            file.write(array("q", (self._ids[row] for row in order)).tobytes())
+            fields = memoryview(self._fields)
+            for row in order:
+                file.write(fields[row * _fields.size:(row + 1) * _fields.size])
+            file.write(name_offsets.tobytes())
+            file.write(json_offsets.tobytes())
+            _copy_rows(self._names, self._name_offsets, order, file)
+            _copy_rows(self._jsons, self._json_offsets, order, file)
+        os.replace(temporary_path, self.path)
+
+
+class ItemCatalog:
+    """A read only, memory mapped ItemCatalog file.
+
+    Lookups by item id are a binary search of the mapped ids. Open one
+    per process; the mapped pages are shared by all of them.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): A file written by ItemCatalogWriter.
+
+        Raises:
+            ValueError: The file isn't an item catalog.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, self._count, ids_start, self._fields_start, name_offsets_start,
+            json_offsets_start, self._names_start, self._jsons_start,
+        ) = _header.unpack_from(self._map)
+        if magic != _magic:
+            self._map.close()
+            raise ValueError(f"{path} is not an item catalog")
+        view = memoryview(self._map)
+        self._ids = view[ids_start:ids_start + 8 * self._count].cast("q")
+        self._name_offsets = view[name_offsets_start:name_offsets_start + 8 * (self._count + 1)].cast("Q")
+        self._json_offsets = view[json_offsets_start:json_offsets_start + 8 * (self._count + 1)].cast("Q")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item_id: int) -> bool:
+        return self._row(item_id) is not None
+
+    def __getitem__(self, item_id: int) -> dict:
+        """Returns an item's full json.
+
+        Raises:
+            KeyError: The item isn't in the catalog.
+        """
+        row = self._existing_row(item_id)
+        start = self._jsons_start + self._json_offsets[row]
+        end = self._jsons_start + self._json_offsets[row + 1]
+        return json.loads(self._map[start:end])
+
+    def get(self, item_id: int, default=None):
+        """Returns an item's full json or default if it isn't in the catalog."""
+        if item_id not in self:
+            return default
+        return self[item_id]
+
+    def name(self, item_id: int) -> str:
+        """Returns an item's name.
+
+        Raises:
+            KeyError: The item isn't in the catalog.
+        """
+        row = self._existing_row(item_id)
+        start = self._names_start + self._name_offsets[row]
+        end = self._names_start + self._name_offsets[row + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def fields(self, item_id: int) -> ItemFields:
+        """Returns an item's common fields without parsing its json.
+
+        Raises:
+            KeyError: The item isn't in the catalog.
+        """
+        row = self._existing_row(item_id)
+        (
+            quality, flags, level, required_level, item_class_id, item_subclass_id,
+            max_count, purchase_price, sell_price,
+        ) = _fields.unpack_from(self._map, self._fields_start + row * _fields.size)
+        return ItemFields(
+            item_id,
+            qualities[quality] if quality >= 0 else None,
+            *(None if value < 0 else value for value in (
+                level, required_level, item_class_id, item_subclass_id, max_count, purchase_price, sell_price,
+            )),
+            bool(flags & _EQUIPPABLE) if flags & _HAS_EQUIPPABLE else None,
+            bool(flags & _STACKABLE) if flags & _HAS_STACKABLE else None,
+        )
+
+    def ids(self):
+        """Returns the item ids in increasing order. Backed by the mapped file."""
+        return self._ids
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._ids.release()
+        self._name_offsets.release()
+        self._json_offsets.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _row(self, item_id: int):
+        row = bisect.bisect_left(self._ids, item_id)
+        if row < self._count and self._ids[row] == item_id:
+            return row
+        return None
+
+    def _existing_row(self, item_id: int) -> int:
+        row = self._row(item_id)
+        if row is None:
+            raise KeyError(item_id)
+        return row
+
+
+def _pack_fields(item: dict) -> bytes:
+    def number(value):
+        return value if isinstance(value, int) and not isinstance(value, bool) else -1
+
+    def nested(key, nested_key):
+        value = item.get(key)
+        return value.get(nested_key) if isinstance(value, dict) else None
+
+    flags = 0
+    if "is_equippable" in item:
+        flags |= _HAS_EQUIPPABLE | (_EQUIPPABLE if item["is_equippable"] else 0)
+    if "is_stackable" in item:
+        flags |= _HAS_STACKABLE | (_STACKABLE if item["is_stackable"] else 0)
+    return _fields.pack(
+        _quality_codes.get(nested("quality", "type"), -1),
+        flags,
+        number(item.get("level")),
+        number(item.get("required_level")),
+        number(nested("item_class", "id")),
+        number(nested("item_subclass", "id")),
+        number(item.get("max_count")),
+        number(item.get("purchase_price")),
+        number(item.get("sell_price")),
+    )
+
+
+def _offsets(offsets: array, order: list) -> array:
+    """Returns offsets of the rows laid out one after another in order."""
+    new_offsets = array("Q", [0])
+    for row in order:
+        new_offsets.append(new_offsets[-1] + offsets[row + 1] - offsets[row])
+    return new_offsets
+
+
+def _copy_rows(source, offsets: array, order: list, destination) -> None:
+    """Copies each row's bytes from source to destination in order."""
+    position = None
+    for row in order:
+        start, end = offsets[row], offsets[row + 1]
+        if position != start:
+            source.seek(start)
+        destination.write(source.read(end - start))
+        position = end
@@ -0,0 +1,375 @@
+"""This module contains the getwowdata command line tool which dumps api data to files.
+
+Credentials are read from the wow_api_id and wow_api_secret environment
+variables (or a .env file) like WowApi.create().
+
+Typical usage example:
+
+getwowdata dump auctions --realms all --out dumps/
+getwowdata dump items --format csv --resume dumps/items.checkpoint --rate-limit 50
+getwowdata dump commodities --format columnar --cache-dir cache/ --out history/
+python -m getwowdataasync dump realms --region eu
+getwowdata mirror --port 8080
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+
+import httpx
+
+from getwowdataasync.auctions import AuctionSnapshot
+from getwowdataasync.deadlines import PartialResults
+from getwowdataasync.expansions import ExpansionIdRanges
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.helpers import convert_to_datetime, get_id_from_url
+from getwowdataasync.history import COMMODITIES_REALM_ID, AuctionHistoryStore
+from getwowdataasync.mirror import ApiMirror
+from getwowdataasync.progress import ProgressReporter
+from getwowdataasync.ratelimit import RateLimiter
+from getwowdataasync.sinks import CSVSink, NDJSONSink
+
+dump_targets = ["items", "realms", "professions", "auctions", "commodities"]
+formats = ["ndjson", "csv", "columnar"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Returns the parser of getwowdata's arguments."""
+    parser = argparse.ArgumentParser(prog="getwowdata", description="Dumps World of Warcraft api data to files or serves it from a local mirror.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    dump = subparsers.add_parser("dump", help="Write api data to files in --out.")
+    dump.add_argument("target", choices=dump_targets)
+    dump.add_argument("--region", default="us", help="us, eu, kr or tw. Default: us")
+    dump.add_argument("--locale", default="en_US", help="Default: en_US")
+    dump.add_argument("--out", default=".", help="Directory to write to. Default: the current directory")
+    dump.add_argument(
+        "--format", choices=formats, default="ndjson",
+        help="columnar is an AuctionHistoryStore and only works for auctions and commodities. Default: ndjson",
+    )
+    dump.add_argument(
+        "--realms", default="all",
+        help="Connected realm ids to dump auctions of, comma separated, or all. Default: all",
+    )
+    dump.add_argument(
+        "--concurrency", type=int, default=8,
+        help="Item detail requests made at once for items, or connected realms whose auctions are "
+        "downloaded at once for auctions. realms and professions are requested one at a time. Default: 8",
+    )
+    dump.add_argument("--rate-limit", type=int, default=100, help="Most requests per second. Default: 100")
+    dump.add_argument("--hourly-limit", type=int, default=36000, help="Most requests per hour. Default: 36000")
+    dump.add_argument(
+        "--cache-dir",
+        help="Directory to remember last-modified times and expansion id ranges in, "
+        "so unchanged auctions aren't downloaded again.",
+    )
+    dump.add_argument(
+        "--resume",
+        help="Checkpoint file. An interrupted items or auctions dump continues from it "
+        "and it is deleted once the dump finishes.",
+    )
+    dump.add_argument("--quiet", action="store_true", help="Don't print progress.")
+
+    mirror = subparsers.add_parser("mirror", help="Serve api requests from a local cache. See ApiMirror.")
+    mirror.add_argument("--host", default="127.0.0.1", help="Default: 127.0.0.1")
+    mirror.add_argument("--port", type=int, default=8080, help="Default: 8080")
+    mirror.add_argument("--rate-limit", type=int, default=100, help="Most requests per second. Default: 100")
+    mirror.add_argument("--hourly-limit", type=int, default=36000, help="Most requests per hour. Default: 36000")
+    mirror.add_argument(
+        "--revalidate-interval", type=float, default=60,
+        help="Least seconds between upstream checks of dynamic data. Default: 60",
+    )
+    mirror.add_argument(
+        "--max-megabytes", type=int, default=1024, help="Most megabytes of responses kept. Default: 1024"
+    )
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """Runs getwowdata with argv (defaults to sys.argv) and returns its exit code."""
+    args = build_parser().parse_args(argv)
+    if args.command == "mirror":
+        return asyncio.run(serve_mirror(args))
+    if args.format == "columnar" and args.target not in ("auctions", "commodities"):
+        print("getwowdata: --format columnar only works for auctions and commodities", file=sys.stderr)
+        return 2
+    return asyncio.run(dump(args))
+
+
+async def dump(args: argparse.Namespace) -> int:
+    """Dumps args.target and prints the throughput.
+
+    Returns:
+        0 if everything was dumped, 1 if the dump stopped early.
+    """
+    os.makedirs(args.out, exist_ok=True)
+    if args.cache_dir:
+        os.makedirs(args.cache_dir, exist_ok=True)
+    throughput = Throughput()
+    client = httpx.AsyncClient(timeout=30, event_hooks={"request": [throughput.count_request]})
+    expansion_id_ranges = None
+    if args.cache_dir:
+        expansion_id_ranges = ExpansionIdRanges(os.path.join(args.cache_dir, "expansion_id_ranges.json"))
+    progress = None if args.quiet else ProgressReporter(_print_progress, interval=10)
+    api = await WowApi.create(
+        args.region,
+        args.locale,
+        rate_limiter=RateLimiter(args.rate_limit, args.hourly_limit),
+        client=client,
+        expansion_id_ranges=expansion_id_ranges,
+        progress=progress,
+    )
+    try:
+        error = await dumpers[args.target](api, args, throughput)
+    except httpx.HTTPError as e:
+        error = e
+    finally:
+        await api.close()
+
+    print(throughput.report(), file=sys.stderr)
+    if error is not None:
+        print(f"getwowdata: stopped early: {error!r}", file=sys.stderr)
+        return 1
+    return 0
+
+
+async def serve_mirror(args: argparse.Namespace) -> int:
+    """Runs an ApiMirror until interrupted."""
+    api = await WowApi.create("us", rate_limiter=RateLimiter(args.rate_limit, args.hourly_limit))
+    mirror = ApiMirror(
+        api,
+        args.host,
+        args.port,
+        revalidate_interval=args.revalidate_interval,
+        max_bytes=args.max_megabytes << 20,
+    )
+    await mirror.start()
+    print(f"getwowdata: mirroring on http://{args.host}:{mirror.port}", file=sys.stderr)
+    try:
+        await mirror.serve_forever()
+    finally:
+        await mirror.close()
+        await api.close()
+    return 0
+
+
+class Throughput:
+    """Counts requests and elements written to report their rates."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.elements = 0
+
+    async def count_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f"{self.elements} elements from {self.requests} requests in {elapsed:.1f}s "
+            f"({self.elements / elapsed:.1f} elements/s, {self.requests / elapsed:.1f} requests/s)"
+        )
+
+
+class Checkpoint:
+    """A json file of a dump's progress, replaced atomically on every save."""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.state = json.load(file)
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.state)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(self.state, file)
+        os.replace(self.path + ".tmp", self.path)
+
+    def finish(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _CountingSink:
+    """Passes batches to a sink, counts them and records a checkpoint after each."""
+
+    def __init__(self, sink, throughput: Throughput, checkpoint: Checkpoint = None):
+        self.sink = sink
+        self.throughput = throughput
+        self.checkpoint = checkpoint
+
+    async def write(self, elements: list) -> None:
+        await self.sink.write(elements)
+        self.throughput.elements += len(elements)
+        ids = [element["id"] for element in elements if element]
+        if self.checkpoint and ids:
+            self.checkpoint.state["next_id"] = max(ids) + 1
+            self.checkpoint.save()
+
+
+def _open_sink(args: argparse.Namespace, name: str, append: bool = False):
+    path = os.path.join(args.out, f"{name}.{args.format}")
+    if args.format == "csv":
+        return CSVSink(path, append=append)
+    return NDJSONSink(path, append=append)
+
+
+def _print_progress(event) -> None:
+    eta = f", eta {datetime.timedelta(seconds=round(event.eta))}" if event.eta is not None else ""
+    print(f"{event.operation}: {event.done} done, {event.rate:.1f}/s{eta}", file=sys.stderr)
+
+
+async def _dump_items(api: WowApi, args: argparse.Namespace, throughput: Throughput):
+    checkpoint = Checkpoint(args.resume)
+    with _open_sink(args, "items", append=checkpoint.resumed) as sink:
+        items = await api.get_all_items(
+            sink=_CountingSink(sink, throughput, checkpoint),
+            start_id=checkpoint.state.get("next_id", 0),
+            concurrency=args.concurrency,
+        )
+    if isinstance(items, PartialResults):
+        return items.error
+    checkpoint.finish()
+
+
+async def _dump_realms(api: WowApi, args: argparse.Namespace, throughput: Throughput):
+    with _open_sink(args, "realms") as sink:
+        realms = await api.get_all_realms(sink=_CountingSink(sink, throughput))
+    if isinstance(realms, PartialResults):
+        return realms.error
+
+
+async def _dump_professions(api: WowApi, args: argparse.Namespace, throughput: Throughput):
+    professions = await api.get_professions_tree_by_expansion("df")
+    recipes = [
+        {"profession_id": profession["id"], "profession": profession["name"], "category": category["name"], **recipe}
+        for profession in professions
+        for category in profession["categories"]
+        for recipe in category["recipes"]
+        if recipe
+    ]
+    with _open_sink(args, "recipes") as sink:
+        await _CountingSink(sink, throughput).write(recipes)
+    if isinstance(professions, PartialResults):
+        return professions.error
+
+
+async def _dump_auctions(api: WowApi, args: argparse.Namespace, throughput: Throughput):
+    if args.realms == "all":
+        index = await api.get_connected_realm_index()
+        realm_ids = [int(get_id_from_url(realm["href"])) for realm in index["connected_realms"]]
+    else:
+        realm_ids = [int(realm_id) for realm_id in args.realms.split(",")]
+    checkpoint = Checkpoint(args.resume)
+    done = set(checkpoint.state.get("done", []))
+    last_modified = _LastModified(args.cache_dir, args.region)
+    store = AuctionHistoryStore(args.out) if args.format == "columnar" else None
+    semaphore = asyncio.Semaphore(args.concurrency)
+    errors = []
+
+    async def dump_realm(realm_id):
+        async with semaphore:
+            try:
+                changed = await _dump_snapshot(
+                    api, args, throughput, store, last_modified, f"auctions-{realm_id}", realm_id,
+                    lambda since: api.get_auctions_if_modified(realm_id, since),
+                )
+            except Exception as e:
+                errors.append(e)
+                return
+            if changed is not None:
+                done.add(realm_id)
+                checkpoint.state["done"] = sorted(done)
+                checkpoint.save()
+
+    try:
+        await asyncio.gather(*(dump_realm(realm_id) for realm_id in realm_ids if realm_id not in done))
+    finally:
+        if store:
+            store.close()
+    if errors:
+        return errors[0]
+    checkpoint.finish()
+
+
+async def _dump_commodities(api: WowApi, args: argparse.Namespace, throughput: Throughput):
+    last_modified = _LastModified(args.cache_dir, args.region)
+    store = AuctionHistoryStore(args.out) if args.format == "columnar" else None
+    try:
+        changed = await _dump_snapshot(
+            api, args, throughput, store, last_modified, "commodities", COMMODITIES_REALM_ID,
+            api.get_commodities_if_modified,
+        )
+    finally:
+        if store:
+            store.close()
+    if changed is None:
+        return RuntimeError("commodities couldn't be downloaded")
+
+
+async def _dump_snapshot(api, args, throughput, store, last_modified, name, connected_realm_id, get_if_modified):
+    """Writes one auctions or commodities snapshot unless it is unchanged since the last dump.
+
+    Returns:
+        True if it was written, False if it was unchanged or None if the request failed.
+    """
+    result = await get_if_modified(last_modified.get(name))
+    if result is None:  # every retry failed
+        return None
+    auctions, modified = result
+    if auctions is None:
+        return False
+
+    if store is not None:
+        timestamp = time.time()
+        if modified:
+            timestamp = convert_to_datetime(modified).replace(tzinfo=datetime.timezone.utc).timestamp()
+        store.append(AuctionSnapshot.from_json(auctions), int(timestamp), connected_realm_id)
+        throughput.elements += len(auctions["auctions"])
+    else:
+        with _open_sink(args, name) as sink:
+            await _CountingSink(sink, throughput).write(auctions["auctions"])
+    last_modified.set(name, modified)
+    return True
+
+
+class _LastModified:
+    """The last-modified header of each dumped snapshot, kept in the cache directory."""
+
+    def __init__(self, cache_dir: str = None, region: str = "us"):
+        self.path = os.path.join(cache_dir, f"last_modified-{region}.json") if cache_dir else None
+        self.times = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                self.times = json.load(file)
+
+    def get(self, name: str):
+        return self.times.get(name)
+
+    def set(self, name: str, last_modified: str) -> None:
+        if not self.path or not last_modified:
+            return
+        self.times[name] = last_modified
+        with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(self.times, file)
+        os.replace(self.path + ".tmp", self.path)
+
+
+dumpers = {
+    "items": _dump_items,
+    "realms": _dump_realms,
+    "professions": _dump_professions,
+    "auctions": _dump_auctions,
+    "commodities": _dump_commodities,
+}
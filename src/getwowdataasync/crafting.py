@@ -0,0 +1,297 @@
+"""This module contains the CraftingGraph which finds every recipe's cheapest crafting cost.
+
+The graph is compiled once from recipe data into flat arrays: each recipe's
+reagents (as item indexes and quantities) sit in one array with an offsets
+array marking where each recipe's start, and recipes are ordered so every
+recipe comes after the recipes crafting its reagents. Evaluating a new
+snapshot's prices is then one pass over those arrays where each item costs
+the lower of its market price and its cheapest recipe's cost per item.
+
+Typical usage example:
+
+graph = CraftingGraph.from_professions_tree(await us_api.get_professions_tree_by_expansion('df'))
+costs = graph.evaluate(await us_api.get_commodities())
+costs.recipe_cost(recipe_id) # copper to craft once from the cheapest reagents
+costs.item_cost(item_id)     # min(market price, cheapest crafting cost per item)
+"""
+import collections
+import math
+from array import array
+
+from getwowdataasync.auctions import AuctionSnapshot, auction_price
+
+
+class CraftingGraph:
+    """Recipes compiled into arrays in the order their costs can be evaluated.
+
+    Recipes that craft each other's reagents form cycles which have no
+    such order. A cycle is broken by evaluating one of its recipes with the
+    market price of its not yet evaluated reagents. Only recipes in the
+    cycle are candidates, recipes using its output wait for all of it.
+
+    Recipes without reagent data (Ex: only modified_crafting_slots) cost
+    inf rather than nothing so they never make their crafted item free.
+
+    Attributes:
+        recipe_ids (array): Recipe ids in evaluation order.
+        item_ids (array): The item id of each item index.
+        cycles_broken (int): How many recipes were evaluated early to break cycles.
+    """
+
+    def __init__(self, recipes):
+        """
+        Args:
+            recipes: An iterable of recipe json from get_recipe().
+        """
+        self._item_indexes = {}
+        self.item_ids = array("q")
+        recipes = [recipe for recipe in recipes if recipe]
+
+        crafted_items = array("l")
+        crafted_quantities = array("d")
+        reagents = []
+        for recipe in recipes:
+            crafted_item = _crafted_item_id(recipe)
+            crafted_items.append(self._item_index(crafted_item) if crafted_item is not None else -1)
+            crafted_quantities.append(_crafted_quantity(recipe))
+            reagents.append([
+                (self._item_index(reagent["reagent"]["id"]), reagent["quantity"])
+                for reagent in recipe.get("reagents", [])
+            ])
+
+        order = self._evaluation_order(crafted_items, reagents)
+        self.recipe_ids = array("q", (recipes[recipe]["id"] for recipe in order))
+        self._recipe_indexes = {recipe_id: index for index, recipe_id in enumerate(self.recipe_ids)}
+        self._crafted_items = array("l", (crafted_items[recipe] for recipe in order))
+        self._crafted_quantities = array("d", (crafted_quantities[recipe] for recipe in order))
+        self._reagent_offsets = array("l", [0])
+        self._reagent_items = array("l")
+        self._reagent_quantities = array("d")
+        for recipe in order:
+            for item, quantity in reagents[recipe]:
+                self._reagent_items.append(item)
+                self._reagent_quantities.append(quantity)
+            self._reagent_offsets.append(len(self._reagent_items))
+
+    @classmethod
+    def from_professions_tree(cls, professions: list) -> "CraftingGraph":
+        """Builds a graph of every recipe in get_professions_tree_by_expansion()'s result."""
+        return cls(
+            recipe
+            for profession in professions
+            for category in profession["categories"]
+            for recipe in category["recipes"]
+        )
+
+    def evaluate(self, prices) -> "CraftingCosts":
+        """Finds every recipe's and item's cheapest cost.
+
+        Args:
+            prices: The json from get_commodities() or get_auctions(), an
+                AuctionSnapshot or a dict of item id to price in copper.
+                Items without a price can only be crafted.
+
+        Returns:
+            CraftingCosts of the prices.
+        """
+        costs = self.price_vector(prices)
+        recipe_costs = array("d", bytes(8 * len(self.recipe_ids)))
+        offsets = self._reagent_offsets
+        reagent_items = self._reagent_items
+        reagent_quantities = self._reagent_quantities
+        crafted_items = self._crafted_items
+        crafted_quantities = self._crafted_quantities
+        for recipe in range(len(recipe_costs)):
+            if offsets[recipe] == offsets[recipe + 1]:
+                recipe_costs[recipe] = math.inf
+                continue
+            total = 0.0
+            for reagent in range(offsets[recipe], offsets[recipe + 1]):
+                total += reagent_quantities[reagent] * costs[reagent_items[reagent]]
+            recipe_costs[recipe] = total
+            crafted_item = crafted_items[recipe]
+            if crafted_item >= 0:
+                cost_per_item = total / crafted_quantities[recipe]
+                if cost_per_item < costs[crafted_item]:
+                    costs[crafted_item] = cost_per_item
+        return CraftingCosts(self, costs, recipe_costs)
+
+    def price_vector(self, prices) -> array:
+        """Returns the lowest price of each item index, inf when it isn't listed."""
+        vector = array("d", [math.inf]) * len(self.item_ids)
+        if isinstance(prices, AuctionSnapshot):
+            listings = zip(prices.item_ids, prices.prices)
+        elif isinstance(prices, dict) and "auctions" in prices:
+            listings = ((auction["item"]["id"], auction_price(auction)) for auction in prices["auctions"])
+        else:
+            listings = prices.items()
+        item_indexes = self._item_indexes
+        for item_id, price in listings:
+            index = item_indexes.get(item_id)
+            if index is not None and price < vector[index]:
+                vector[index] = price
+        return vector
+
+    def _item_index(self, item_id: int) -> int:
+        index = self._item_indexes.get(item_id)
+        if index is None:
+            index = self._item_indexes[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+        return index
+
+    def _evaluation_order(self, crafted_items: array, reagents: list) -> list:
+        """Returns recipe positions ordered so recipes come after those crafting their reagents.
+
+        Recipes are grouped into strongly connected components, which are
+        put in topological order, so cycles are only broken among the
+        recipes that are part of them.
+        """
+        users = collections.defaultdict(list)
+        for recipe, recipe_reagents in enumerate(reagents):
+            for item in {item for item, _ in recipe_reagents}:
+                users[item].append(recipe)
+        successors = [users.get(item, ()) if item >= 0 else () for item in crafted_items]
+
+        self.cycles_broken = 0
+        order = []
+        # Tarjan's algorithm finds components in reverse topological order.
+        for component in reversed(_strongly_connected_components(successors)):
+            order += self._component_order(sorted(component), crafted_items, reagents)
+        return order
+
+    def _component_order(self, component: list, crafted_items: array, reagents: list) -> list:
+        """Orders one strongly connected component's recipes, breaking its cycles."""
+        crafters = collections.Counter(crafted_items[recipe] for recipe in component if crafted_items[recipe] >= 0)
+        users = collections.defaultdict(list)
+        waiting = {}
+        for recipe in component:
+            items = {item for item, _ in reagents[recipe] if crafters[item]}
+            for item in items:
+                users[item].append(recipe)
+            waiting[recipe] = len(items)
+        if not any(waiting.values()):
+            return component
+
+        queued = {recipe: waiting[recipe] == 0 for recipe in component}
+        ready = collections.deque(recipe for recipe in component if queued[recipe])
+        order = []
+        unqueued = iter(component)
+        while len(order) < len(component):
+            if not ready:
+                # Every remaining recipe waits on a cycle so evaluate one now.
+                recipe = next(recipe for recipe in unqueued if not queued[recipe])
+                queued[recipe] = True
+                ready.append(recipe)
+                self.cycles_broken += 1
+            recipe = ready.popleft()
+            order.append(recipe)
+            crafted_item = crafted_items[recipe]
+            if crafted_item < 0:
+                continue
+            crafters[crafted_item] -= 1
+            if crafters[crafted_item]:
+                continue
+            for user in users[crafted_item]:
+                waiting[user] -= 1
+                if waiting[user] == 0 and not queued[user]:
+                    queued[user] = True
+                    ready.append(user)
+        return order
+
+
+class CraftingCosts:
+    """The costs a CraftingGraph found for one set of prices.
+
+    Attributes:
+        item_costs (array): Each item index's cheapest cost per item.
+        recipe_costs (array): Each recipe's cost per craft, in the
+            graph's recipe order.
+    """
+
+    def __init__(self, graph: CraftingGraph, item_costs: array, recipe_costs: array):
+        self.graph = graph
+        self.item_costs = item_costs
+        self.recipe_costs = recipe_costs
+
+    def recipe_cost(self, recipe_id: int) -> float:
+        """Returns the copper it costs to craft a recipe once from the cheapest reagents.
+
+        inf if a reagent can't be bought or crafted.
+        """
+        return self.recipe_costs[self.graph._recipe_indexes[recipe_id]]
+
+    def item_cost(self, item_id: int) -> float:
+        """Returns an item's market price or cheapest crafting cost per item, whichever is lower."""
+        return self.item_costs[self.graph._item_indexes[item_id]]
+
+    def as_dict(self) -> dict:
+        """Returns {recipe id: cost per craft} of every recipe."""
+        return dict(zip(self.graph.recipe_ids, self.recipe_costs))
+
+
+def _crafted_item_id(recipe: dict):
+    crafted_item = recipe.get("crafted_item") or recipe.get("alliance_crafted_item") or recipe.get("horde_crafted_item")
+    return crafted_item["id"] if crafted_item else None
+
+
+def _crafted_quantity(recipe: dict) -> float:
+    """Returns how many items a craft makes. The average when it is a range."""
+    quantity = recipe.get("crafted_quantity", {})
+    if "value" in quantity:
+        return quantity["value"]
+    if "minimum" in quantity:
+        return (quantity["minimum"] + quantity.get("maximum", quantity["minimum"])) / 2
+    return 1
+
+
+def _strongly_connected_components(successors: list) -> list:
+    """Returns the strongly connected components of a graph in reverse topological order.
+
+    An iterative Tarjan's algorithm, since recipe chains can be deeper
+    than the recursion limit.
+
+    Args:
+        successors (list): The nodes each node has edges to.
+    """
+    index = [None] * len(successors)
+    lowlink = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack = []
+    components = []
+    counter = 0
+    for root in range(len(successors)):
+        if index[root] is not None:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, position = work[-1]
+            if position < len(successors[node]):
+                work[-1] = (node, position + 1)
+                successor = successors[node][position]
+                if index[successor] is None:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, 0))
+                elif on_stack[successor]:
+                    lowlink[node] = min(lowlink[node], index[successor])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
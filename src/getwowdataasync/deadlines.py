@@ -0,0 +1,122 @@
+"""This module bounds how long and how many requests a bulk operation may take.
+
+A bulk operation like get_all_items() can be given a deadline in seconds
+and a budget of requests. Every request made inside it, however deeply
+nested, counts against them. When either runs out, or a request fails
+in an operation that has either, the requests still running are
+cancelled and what was gathered so far is returned as PartialResults.
+Without a deadline or budget errors are raised as usual.
+
+Typical usage example:
+
+items = await us_api.get_all_items(deadline=600, max_requests=20000)
+if isinstance(items, PartialResults):
+    print(f"Stopped early by {items.error!r} after {len(items)} items")
+"""
+import asyncio
+import contextvars
+
+from getwowdataasync.exceptions import DeadlineExceededError, RequestBudgetExceededError
+
+_budget = contextvars.ContextVar("budget", default=None)
+
+
+class PartialResults(list):
+    """The results a bulk operation gathered before it was stopped early.
+
+    Attributes:
+        error (Exception): Why it stopped. A DeadlineExceededError,
+            RequestBudgetExceededError or the exception a request raised.
+    """
+
+    def __init__(self, results, error: Exception):
+        super().__init__(results)
+        self.error = error
+
+
+class RequestBudget:
+    """How many requests a bulk operation may still make."""
+
+    def __init__(self, max_requests: int, parent: "RequestBudget" = None):
+        """
+        Args:
+            max_requests (int): Most requests allowed.
+            parent (RequestBudget): Optional. The budget of an enclosing bulk
+                operation that every request also counts against.
+        """
+        self.max_requests = max_requests
+        self.parent = parent
+        self.requests_made = 0
+
+    def charge(self) -> None:
+        """Counts a request.
+
+        Raises:
+            RequestBudgetExceededError: Every request in the budget was already made.
+        """
+        if self.requests_made >= self.max_requests:
+            raise RequestBudgetExceededError(f"the budget of {self.max_requests} requests is used up")
+        if self.parent:
+            self.parent.charge()
+        self.requests_made += 1
+
+
+def charge_request() -> None:
+    """Counts a request against the running bulk operation's budget, if it has one."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.charge()
+
+
+async def gather_or_cancel(*aws) -> list:
+    """Like asyncio.gather() but the others are cancelled when one fails.
+
+    Returns:
+        A list of every awaitable's result in order.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Waits for the cancelled tasks so none are left running.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def run_bounded(coro, results: list, deadline: float = None, max_requests: int = None) -> list:
+    """Runs a bulk operation that adds to results until it finishes or is stopped.
+
+    Args:
+        coro: The bulk operation. It appends to results as it goes.
+        results (list): Where the operation puts what it gathered.
+        deadline (float): Optional. Seconds the operation may run for.
+        max_requests (int): Optional. Requests the operation may make.
+
+    Returns:
+        results when the operation finished or PartialResults of them
+        when it ran out of time or requests or, if it had a deadline or
+        max_requests, a request failed.
+
+    Raises:
+        Exception: Whatever the operation raised when it had neither a
+            deadline nor max_requests.
+    """
+    token = None
+    if max_requests is not None:
+        token = _budget.set(RequestBudget(max_requests, parent=_budget.get()))
+    try:
+        # wait_for cancels the operation, and with it every nested
+        # request, once the deadline passes.
+        await asyncio.wait_for(coro, deadline)
+    except asyncio.TimeoutError:
+        return PartialResults(results, DeadlineExceededError(f"stopped after {deadline} seconds"))
+    except Exception as e:
+        if deadline is None and max_requests is None:
+            raise
+        return PartialResults(results, e)
+    finally:
+        if token is not None:
+            _budget.reset(token)
+    return results
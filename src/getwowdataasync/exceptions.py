@@ -14,3 +14,19 @@ MIT License see LICENSE for more details
 
 class JSONChangedError(Exception):
     """Should the structure of a blizzard response change this error will be raised"""
+
+
+class DeadlineExceededError(Exception):
+    """A bulk operation ran past its deadline"""
+
+
+class RequestBudgetExceededError(Exception):
+    """A bulk operation tried to make more requests than its budget allows"""
+
+
+class UnknownExpansionError(KeyError):
+    """An expansion's item id range isn't known and no signal was given to find it"""
+
+    def __str__(self):
+        # KeyError would show the message in quotes
+        return str(self.args[0]) if self.args else ""
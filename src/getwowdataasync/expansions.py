@@ -0,0 +1,122 @@
+"""This module keeps track of which item ids belong to which expansion.
+
+Blizzard hands out item ids in increasing order so every expansion's items
+sit in one id range. Only the first item id of each expansion is stored,
+the range ends right before the next expansion's first id.
+
+Only Dragonflight's first item id ships with the library and no signals
+do: search results don't say which expansion an item is from. Any other
+expansion has to be found once with discover_expansion_id_range() and a
+signal that tells its items apart, and is then remembered if the table
+has a path.
+
+Typical usage example:
+
+ranges = ExpansionIdRanges("expansion_ids.json")
+us_api = await WowApi.create('us', expansion_id_ranges=ranges)
+await us_api.discover_expansion_id_range('sl', signal=lambda item: ...)
+shadowlands_items = await us_api.get_items_by_expansion('sl')
+"""
+import json
+import os
+
+from getwowdataasync.exceptions import UnknownExpansionError
+
+expansion_order = [
+    "classic",
+    "tbc",
+    "wotlk",
+    "cata",
+    "mop",
+    "wod",
+    "legion",
+    "bfa",
+    "sl",
+    "df",
+    "tww",
+]
+
+known_expansion_first_item_ids = {
+    "df": 188658,
+}
+
+
+class ExpansionIdRanges:
+    """A table of expansion names to the first item id of that expansion.
+
+    The table starts with known_expansion_first_item_ids. If a path is given
+    the table is loaded from and saved to that json file so discovered ids
+    are only searched for once.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Optional. A json file to persist the table in.
+        """
+        self.path = path
+        self.first_item_ids = dict(known_expansion_first_item_ids)
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self.first_item_ids.update(json.load(file))
+
+    def __contains__(self, expansion_name: str) -> bool:
+        return expansion_name in self.first_item_ids
+
+    def get(self, expansion_name: str) -> tuple:
+        """Returns the first and last item id of an expansion.
+
+        Args:
+            expansion_name (str): An expansion's initials from expansion_order.
+
+        Returns:
+            (first_id, last_id). last_id is None when no later expansion
+            is known, meaning the range is open ended.
+
+        Raises:
+            UnknownExpansionError: The expansion's first item id is not
+                known yet. A KeyError.
+        """
+        if expansion_name not in self.first_item_ids:
+            raise UnknownExpansionError(
+                f"The first item id of {expansion_name!r} isn't known (known: {', '.join(sorted(self.first_item_ids))}). "
+                f"Find it once with WowApi.discover_expansion_id_range({expansion_name!r}, signal=...), "
+                "the library has no built in signal for it."
+            )
+        first_id = self.first_item_ids[expansion_name]
+        _, last_id = self.search_bounds(expansion_name)
+        return first_id, last_id
+
+    def set(self, expansion_name: str, first_item_id: int) -> None:
+        """Records an expansion's first item id and saves the table if it has a path.
+
+        Args:
+            expansion_name (str): An expansion's initials from expansion_order.
+            first_item_id (int): The id of the expansion's first item.
+        """
+        if expansion_name not in expansion_order:
+            raise KeyError(f"{expansion_name} is not one of {expansion_order}")
+        self.first_item_ids[expansion_name] = first_item_id
+        if self.path:
+            with open(self.path, "w") as file:
+                json.dump(self.first_item_ids, file, indent=2)
+
+    def search_bounds(self, expansion_name: str) -> tuple:
+        """Returns the narrowest known ids that an expansion's first item id lies between.
+
+        Args:
+            expansion_name (str): An expansion's initials from expansion_order.
+
+        Returns:
+            (low, high). high is None when no later expansion is known.
+        """
+        position = expansion_order.index(expansion_name)
+        low = 0
+        for earlier_expansion in expansion_order[:position]:
+            low = self.first_item_ids.get(earlier_expansion, low)
+        high = None
+        for later_expansion in expansion_order[position + 1:]:
+            if later_expansion in self.first_item_ids:
+                high = self.first_item_ids[later_expansion] - 1
+                break
+        return low, high
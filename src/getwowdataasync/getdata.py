@@ -7,6 +7,13 @@ from dotenv import load_dotenv
 
 from getwowdataasync.urls import *
 from getwowdataasync.helpers import *
+from getwowdataasync.interning import Interner
+from getwowdataasync.expansions import ExpansionIdRanges
+from getwowdataasync.ratelimit import RateLimiter, QuotaPlanner, bulk
+from getwowdataasync.hedging import Hedger
+from getwowdataasync.deadlines import charge_request, gather_or_cancel, run_bounded
+from getwowdataasync.progress import Progress, ProgressReporter
+from getwowdataasync.sinks import SinkWriter
 
 class WowApi:
     """Instantiate with WowApi.create('region'). You need to have
@@ -16,7 +23,21 @@ class WowApi:
 
     # couldn't get __init__ to work with async
     @classmethod
-    async def create(cls, region: str, locale: str = "en_US", wow_api_id: str = None, wow_api_secret: str = None):
+    async def create(
+        cls,
+        region: str,
+        locale: str = "en_US",
+        wow_api_id: str = None,
+        wow_api_secret: str = None,
+        interner: Interner = None,
+        expansion_id_ranges: ExpansionIdRanges = None,
+        rate_limiter: RateLimiter = None,
+        client: httpx.AsyncClient = None,
+        access_token: str = None,
+        hedger: Hedger = None,
+        progress: ProgressReporter = None,
+        api_url: str = None,
+    ):
         """Gets an instance of WowApi with an access token, region, and httpx client.
 
         Args:
@@ -27,6 +48,29 @@ class WowApi:
                 language or all supported ones.
             wow_api_id (str): Your api client id from blizzards api website
             wow_api_secret (str): Your api client secret from blizzards api website
+            interner (Interner): Optional. Every response is passed through it
+                so repeated strings and small dicts are shared between results.
+                Useful for large crawls like get_all_items().
+            expansion_id_ranges (ExpansionIdRanges): Optional. The table of
+                expansion item id ranges used by get_items_by_expansion().
+                Pass one with a path to keep discovered ranges between runs.
+            rate_limiter (RateLimiter): Optional. Every request waits on it.
+                Pass the same one to several WowApi's so they share a budget
+                or a SQLiteRateLimiter to share it with other processes.
+                Defaults to Blizzard's limits of 100/s and 36,000/h.
+            client (httpx.AsyncClient): Optional. Pass the same one to several
+                WowApi's so they share its connection pool.
+            access_token (str): Optional. An already fetched access token.
+                A token from one region works for us, eu, kr and tw.
+            hedger (Hedger): Optional. Duplicates requests for single
+                elements that are slower than usual to cut tail latency.
+                Give it the same rate limiter so duplicates are counted.
+            progress (ProgressReporter): Optional. Reports how far bulk
+                operations like get_all_items() are. Defaults to reporting nothing.
+            api_url (str): Optional. Where requests are sent instead of
+                Blizzard's api. Ex: an ApiMirror's 'http://localhost:8080'.
+                Links inside responses, like get_all_realms() follows,
+                still go to Blizzard.
         Returns:
             An instance of the WowApi class.
         """
@@ -34,8 +78,14 @@ class WowApi:
 
         self.region = region
         self.locale = locale
-        self.client = httpx.AsyncClient(timeout=30)
-        self.access_token = await self._get_access_token(wow_api_id=wow_api_id, wow_api_secret=wow_api_secret)
+        self.interner = interner
+        self.expansion_id_ranges = expansion_id_ranges or ExpansionIdRanges()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.client = client or httpx.AsyncClient(timeout=30)
+        self.hedger = hedger
+        self.progress = progress or ProgressReporter()
+        self.base_url = api_url or base_url
+        self.access_token = access_token or await self._get_access_token(wow_api_id=wow_api_id, wow_api_secret=wow_api_secret)
         return self
 
     @retry
@@ -60,13 +110,35 @@ class WowApi:
         params = self._make_required_auth_and_query_params(url)
 
         if url in paths: # needs to be built
-            url = self._build_urls(base_url, url)
+            url = self._build_urls(self.base_url, url)
         if "{region}" in url: # needs to be formatted
             url = self._format_url(url, path_ids)
 
         json_response = await self._make_get_request(url, path_ids, params)
         return json_response
 
+    @retry
+    async def _get_data_if_modified(self, url: str, path_ids: dict = {}, last_modified: str = None) -> tuple:
+        """Like _get_data() but nothing is downloaded if the data is unchanged since last_modified.
+
+        Returns:
+            (json, last_modified). json is None when the data hasn't changed.
+        """
+        params = self._make_required_auth_and_query_params(url)
+
+        if url in paths: # needs to be built
+            url = self._build_urls(self.base_url, url)
+        url = self._format_url(url, path_ids)
+
+        headers = {"If-Modified-Since": last_modified} if last_modified else {}
+        charge_request()
+        await self.rate_limiter.acquire()
+        response = await self.client.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, last_modified
+        response.raise_for_status()
+        return self._parse_json(response), response.headers.get("last-modified")
+
     def _build_urls(self, base_url :str, path: str) -> str:
         return urljoin(base_url, paths[path])
 
@@ -96,9 +168,16 @@ class WowApi:
     async def _make_get_request(self, url: str, path_ids: dict = {}, params: dict = {}):
         formatted_url = self._format_url(url, path_ids)
 
-        response = await self.client.get(formatted_url, params=params)
+        charge_request()
+        await self.rate_limiter.acquire()
+        if self.hedger:
+            response = await self.hedger.run(
+                formatted_url, lambda: self.client.get(formatted_url, params=params)
+            )
+        else:
+            response = await self.client.get(formatted_url, params=params)
         response.raise_for_status()            
-        return response.json()
+        return self._parse_json(response)
 
     @retry
     async def _search_data(self, url_name: str, search_parameters: dict = {}) -> dict:
@@ -109,89 +188,330 @@ class WowApi:
             **search_parameters
         }
 
-        url = self._build_urls(base_url, url_name)
+        url = self._build_urls(self.base_url, url_name)
         url = self._format_url(url)
 
         json_response = await self._make_search_request(url, search_parameters)
         return json_response
 
     async def _make_search_request(self, url: str, search_parameters: dict = {}):
+        charge_request()
+        await self.rate_limiter.acquire()
         response = await self.client.get(url, params=search_parameters)
         response.raise_for_status()            
+        return self._parse_json(response)
+
+    def _parse_json(self, response: httpx.Response):
+        if self.interner:
+            return self.interner.intern(response.json())
         return response.json()
 
-    async def get_all_items(self) -> list:
+    @bulk
+    async def get_all_items(
+        self,
+        fields: list = None,
+        deadline: float = None,
+        max_requests: int = None,
+        sink=None,
+        start_id: int = 0,
+        concurrency: int = None,
+    ) -> list:
         """Adds all urls from an item or realm search to the queue.
 
         A worker is then needed to remove urls from the queue and make requests with them.
+
+        Args:
+            fields (list): Optional. Only these top level fields (and id) are
+                returned for each item. An item's detail is only requested
+                when one of the fields is missing from its search result,
+                so ['id', 'name', 'quality', 'item_class', 'level'] needs
+                no extra requests at all.
+            deadline (float): Optional. Seconds the crawl may take.
+            max_requests (int): Optional. Requests the crawl may make.
+            sink: Optional. Each page of items is written to it instead of
+                kept in memory. See sinks. The returned list is then empty.
+            start_id (int): Optional. Only items with this id or higher are
+                crawled. Ex: to resume a crawl that was stopped.
+            concurrency (int): Optional. Most item detail requests made at
+                once. By default a whole search page's (up to 1000).
+
+        Returns:
+            A list of every item. PartialResults of the items gathered so far
+            if the crawl ran out of time or requests or a request failed
+            while it had a deadline or max_requests.
         """
-        url_name = 'search_item'
-        params_to_start_search_from_id_0 = {"id": "[0,]", "orderby": "id", "_pageSize": 1000}
-        items = []
-        from pprint import pprint
-        print("Starting search...")
-        set_of_items = await self._search_data(url_name, params_to_start_search_from_id_0)
-        while set_of_items['results']:
-            items += await self._get_detailed_list_of_elements(set_of_items)
-            print('finshed 1000 items! continuing...')
-            next_id_in_sequence = items[-1]['id'] + 1  # +1 so that the last item search returns empty
-            prams_to_search_next_set_of_ids = {"orderby": "id", "id": f"[{next_id_in_sequence},]", "_pageSize": 1000}
-            print(len(items))
-            print(items[-1]['id'])
-            set_of_items = await self._search_data(url_name, prams_to_search_next_set_of_ids)
-
-        print("Finished getting all items!")
-        return items
-
-
-    async def get_items_by_expansion(self, expansion_name: str) -> list:
+        return await self._run_crawl(
+            lambda emit: self._crawl_item_range(emit, "get_all_items", start_id, None, fields, concurrency),
+            deadline,
+            max_requests,
+            sink,
+        )
+
+    @bulk
+    async def get_items_by_expansion(
+        self,
+        expansion_name: str,
+        fields: list = None,
+        deadline: float = None,
+        max_requests: int = None,
+        sink=None,
+        concurrency: int = None,
+    ) -> list:
         """Gets all items from an expansion.
 
-        Currently only Dragonflight is supported.
-        To extend find the first and last item id's of
-        each expansion.
+        Only item ids inside the expansion's id range are searched. Ranges
+        come from WowApi's expansion_id_ranges, which only knows "df" until
+        discover_expansion_id_range() is used with a signal for another.
 
         Args:
-            expansion_name (str): Name of a WoW expansion.
-                Ex: "Classic", "Burning Crusade", "Dragonflight"
+            expansion_name (str): Initials of a WoW expansion.
+                Ex: "classic", "tbc", "df". See expansions.expansion_order.
+            fields (list): Optional. Only these top level fields (and id) are
+                returned for each item. See get_all_items().
+            deadline (float): Optional. Seconds the crawl may take.
+            max_requests (int): Optional. Requests the crawl may make.
+            sink: Optional. Each page of items is written to it instead of
+                kept in memory. See sinks. The returned list is then empty.
+            concurrency (int): Optional. Most item detail requests made at
+                once. See get_all_items().
 
         Returns:
             A list containing all the items from the 
-            specified expansion.
+            specified expansion. PartialResults of the items gathered so far
+            if the crawl ran out of time or requests or a request failed
+            while it had a deadline or max_requests.
+
+        Raises:
+            UnknownExpansionError: The expansion's id range is unknown. A KeyError.
         """
-        expansions = {
-            'df' : [188658, 1000000000]
-        }
-        expansions_min_max_ids = expansions[expansion_name]    
-        items = []
-        start_id = expansions_min_max_ids[0]
-        end_id = expansions_min_max_ids[1]
+        start_id, end_id = self.expansion_id_ranges.get(expansion_name)
+        return await self._run_crawl(
+            lambda emit: self._crawl_item_range(
+                emit, "get_items_by_expansion", start_id, end_id, fields, concurrency
+            ),
+            deadline,
+            max_requests,
+            sink,
+        )
+
+    async def _run_crawl(self, crawl, deadline: float = None, max_requests: int = None, sink=None) -> list:
+        """Runs a crawl that passes each batch of elements it gathers to an emit function.
+
+        Args:
+            crawl (callable): Takes emit and returns the crawl's coroutine.
+            deadline (float): Optional. Seconds the crawl may take.
+            max_requests (int): Optional. Requests the crawl may make.
+            sink: Optional. Where batches are written instead of a list.
+
+        Returns:
+            The gathered elements (an empty list with a sink) or
+            PartialResults if the crawl was stopped early.
+        """
+        results = []
+        if sink is None:
+            async def collect(elements):
+                results.extend(elements)
+            return await run_bounded(crawl(collect), results, deadline, max_requests)
+
+        writer = SinkWriter(sink)
+
+        async def crawl_to_sink():
+            try:
+                await crawl(writer.write)
+            finally:
+                await writer.close()
+
+        return await run_bounded(crawl_to_sink(), results, deadline, max_requests)
+
+    async def _crawl_item_range(
+        self, emit, operation: str, start_id: int, end_id: int = None, fields: list = None, concurrency: int = None
+    ) -> None:
+        end_id = "" if end_id is None else end_id
         url_name = 'search_item'
-        starting_params = {"orderby": "id", "id": f"[{start_id},]", "_pageSize": 1000}
+        starting_params = {"orderby": "id", "id": f"[{start_id},{end_id}]", "_pageSize": 1000}
+
+        first_id = start_id
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        progress = self.progress.track(operation)
+        crawl, last_id = await self._start_crawl(first_id, end_id or None, progress)
+        try:
+            set_of_items = await self._search_data(url_name, starting_params)
+            while set_of_items['results']:
+                await emit(await self._get_detailed_list_of_elements(set_of_items, fields, progress, semaphore))
+                # +1 so that the last item search returns empty
+                start_id = set_of_items['results'][-1]['data']['id'] + 1
+                prams_to_search_next_set_of_ids = {"orderby": "id", "id": f"[{start_id},{end_id}]", "_pageSize": 1000}
+
+                self._update_crawl(crawl, progress, first_id, start_id, last_id)
+                set_of_items = await self._search_data(url_name, prams_to_search_next_set_of_ids)
+        finally:
+            self._finish_crawl(crawl, progress)
+
+    async def _start_crawl(self, first_id: int, last_id: int = None, progress=None) -> tuple:
+        """Starts tracking an item crawl's progress.
+
+        The last item id is only looked up when something needs the
+        crawl's fraction done: a QuotaPlanner or a progress callback.
 
-        set_of_items = await self._search_data(url_name, starting_params)
-        while set_of_items['results'] and start_id < end_id:
-            items += await self._get_detailed_list_of_elements(set_of_items)
-            start_id = items[-1]['id'] + 1  # +1 so that the last item search returns empty
-            prams_to_search_next_set_of_ids = {"orderby": "id", "id": f"[{start_id},]", "_pageSize": 1000}
+        Returns:
+            (crawl, last_id). crawl is None without a QuotaPlanner and
+            last_id is None when nothing needs it.
+        """
+        planned = isinstance(self.rate_limiter, QuotaPlanner)
+        if last_id is None and (planned or isinstance(progress, Progress)):
+            last_id = await self._get_last_item_id()
+        return self.rate_limiter.start_crawl() if planned else None, last_id
+
+    def _update_crawl(self, crawl, progress, first_id: int, next_id: int, last_id: int) -> None:
+        if last_id is None:
+            return
+        fraction_done = (next_id - first_id) / max(last_id + 1 - first_id, 1)
+        progress.update(fraction_done)
+        if crawl:
+            crawl.update(fraction_done)
+
+    def _finish_crawl(self, crawl, progress) -> None:
+        progress.finish()
+        if crawl:
+            crawl.finish()
+
+    async def discover_expansion_id_range(self, expansion_name: str, signal=None) -> tuple:
+        """Finds an expansion's first item id with a binary search and records it.
+
+        Each step of the search is a single item_search request so only
+        about log2(number of item ids) requests are made.
 
-            set_of_items = await self._search_data(url_name, prams_to_search_next_set_of_ids)
-        
-        return items
+        Args:
+            expansion_name (str): Initials of a WoW expansion. See expansions.expansion_order.
+            signal (callable): Takes an item's search data (dict) and returns
+                True if the item is from this expansion or a later one. It has
+                to be False for every item before the expansion and True for
+                every item after it starts.
+                Not needed if the expansion's first item id is already known.
+                No signals ship with the library since search results don't
+                say which expansion an item is from.
+
+        Returns:
+            (first_id, last_id). last_id is None when the expansion is the
+            latest one known.
+
+        Raises:
+            UnknownExpansionError: The expansion is unknown and no signal was given.
+            KeyError: No item in the search bounds matched the signal.
+        """
+        if signal is None:
+            # Raises UnknownExpansionError naming the missing signal when unknown.
+            return self.expansion_id_ranges.get(expansion_name)
+
+        low, high = self.expansion_id_ranges.search_bounds(expansion_name)
+        if high is None:
+            high = await self._get_last_item_id()
+        first_id = await self._find_first_item_id(signal, low, high)
+        if first_id is None:
+            raise KeyError(f"No item between ids {low} and {high} matched the signal for {expansion_name}")
+        self.expansion_id_ranges.set(expansion_name, first_id)
+        return self.expansion_id_ranges.get(expansion_name)
+
+    async def _get_first_item_from(self, item_id: int):
+        """Returns the search data of the item with the lowest id >= item_id or None."""
+        params = {"orderby": "id", "id": f"[{item_id},]", "_pageSize": 1}
+        search_results = await self._search_data('search_item', params)
+        if search_results['results']:
+            return search_results['results'][0]['data']
+        return None
+
+    async def _find_first_item_id(self, signal, low: int, high: int):
+        # Binary search for the lowest id in [low, high] whose item matches
+        # signal. Ids without an item are skipped by searching from an id.
+        first_id = None
+        while low <= high:
+            middle = (low + high) // 2
+            item = await self._get_first_item_from(middle)
+            if item is None or item['id'] > high:
+                high = middle - 1
+            elif signal(item):
+                first_id = item['id']
+                high = middle - 1
+            else:
+                low = item['id'] + 1
+        return first_id
+
+    async def _get_last_item_id(self) -> int:
+        # Doubles an upper bound until no items are past it then binary
+        # searches between the last seen item and that bound.
+        last_id = (await self._get_first_item_from(0))['id']
+        empty_from = max(last_id, 1) * 2
+        item = await self._get_first_item_from(empty_from)
+        while item is not None:
+            last_id = item['id']
+            empty_from = last_id * 2
+            item = await self._get_first_item_from(empty_from)
+        while last_id + 1 < empty_from:
+            middle = (last_id + empty_from) // 2
+            item = await self._get_first_item_from(middle)
+            if item is None:
+                empty_from = middle
+            else:
+                last_id = item['id']
+        return last_id
 
     # A search returns data on the items but is missing some
     # important details. This Makes a request to each individual
-    # item to get all its information
-    async def _get_detailed_list_of_elements(self, json: dict):
+    # item to get all its information unless the search result
+    # already has every requested field.
+    async def _get_detailed_list_of_elements(
+        self, json: dict, fields: list = None, progress=None, semaphore: asyncio.Semaphore = None
+    ):
         temp_collection = []
         for item in json["results"]:
-            await asyncio.sleep(1/10) # need to throttle to prevent 429
+            if fields:
+                projected_item = self._project(item["data"], fields)
+                if projected_item is not None:
+                    temp_collection.append(self._completed_future(projected_item))
+                    if progress:
+                        progress.advance()
+                    continue
 
             item_id = item["data"]["id"]
-            task = asyncio.create_task(self.get_item_by_id(item_id))
+            task = asyncio.create_task(self._get_projected_item(item_id, fields, semaphore))
+            if progress:
+                task.add_done_callback(lambda _: progress.advance())
             temp_collection.append(task)
-            print(f"{len(temp_collection)} items requested")
-        return list(await asyncio.gather(*temp_collection))
+        return await gather_or_cancel(*temp_collection)
+
+    async def _get_projected_item(self, item_id: int, fields: list = None, semaphore: asyncio.Semaphore = None):
+        if semaphore:
+            async with semaphore:
+                item = await self.get_item_by_id(item_id)
+        else:
+            item = await self.get_item_by_id(item_id)
+        if fields and item is not None:
+            return self._project(item, fields, localized=True)
+        return item
+
+    @staticmethod
+    def _completed_future(result) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        return future
+
+    def _project(self, data: dict, fields: list, localized: bool = False):
+        """Returns only fields (and id) from data or None if data is missing one.
+
+        Search results hold every locale's text ({'en_US': ..., 'de_DE': ...})
+        where detail responses only hold WowApi's locale. Unless localized
+        is True the search text is reduced to WowApi's locale so both look
+        the same.
+        """
+        projected = {"id": data["id"]}
+        for field in fields:
+            if field not in data:
+                return None
+            if localized:
+                projected[field] = data[field]
+            else:
+                projected[field] = localize(data[field], self.locale)
+        return projected
 
     # async def _get_item(self, item_id: int) -> None:
     #     items = []
@@ -230,61 +550,133 @@ class WowApi:
         path_ids = {"item_id": item_id}
         return await self._get_data(url_name, path_ids)
 
-    async def get_all_realms(self) -> list:
-        """Returns all realms in WowApi's given region."""
-        connected_realms_index = await self.get_connected_realm_index()
-        realms = []
+    async def get_items_by_ids(self, item_ids, concurrency: int = 50) -> dict:
+        """Gets many items by their ids at once.
 
-        for realm in connected_realms_index['connected_realms']:
-            realm = await self._get_data(realm['href'])
-            realms.append(realm)
-        
-        return realms
+        Args:
+            item_ids (iterable): Item ids. Duplicates are only requested once.
+            concurrency (int): Most requests in flight at one time. All
+                requests still wait on WowApi's rate limiter.
+
+        Returns:
+            A dict of item id to item in the order the ids were given.
+            If an item's request failed its value is the exception raised
+            (or None if every retry got an error status).
+        """
+        return await self._get_batch(self.get_item_by_id, item_ids, concurrency)
+
+    async def get_recipes_by_ids(self, recipe_ids, concurrency: int = 50) -> dict:
+        """Gets many recipes by their ids at once.
+
+        Args:
+            recipe_ids (iterable): Recipe ids. Duplicates are only requested once.
+            concurrency (int): Most requests in flight at one time. All
+                requests still wait on WowApi's rate limiter.
+
+        Returns:
+            A dict of recipe id to recipe in the order the ids were given.
+            If a recipe's request failed its value is the exception raised
+            (or None if every retry got an error status).
+        """
+        return await self._get_batch(self.get_recipe, recipe_ids, concurrency)
+
+    async def _get_batch(self, get_element, ids, concurrency: int) -> dict:
+        unique_ids = list(dict.fromkeys(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_one(element_id):
+            async with semaphore:
+                try:
+                    return await get_element(element_id)
+                except Exception as e:
+                    return e
+
+        elements = await asyncio.gather(*(get_one(element_id) for element_id in unique_ids))
+        return dict(zip(unique_ids, elements))
+
+    @bulk
+    async def get_all_realms(self, deadline: float = None, max_requests: int = None, sink=None) -> list:
+        """Returns all realms in WowApi's given region.
+
+        Args:
+            deadline (float): Optional. Seconds it may take.
+            max_requests (int): Optional. Requests it may make.
+            sink: Optional. Each realm is written to it instead of
+                kept in memory. See sinks. The returned list is then empty.
+
+        Returns:
+            A list of connected realms. PartialResults of the realms gathered
+            so far if it ran out of time or requests or a request failed
+            while it had a deadline or max_requests.
+        """
+        return await self._run_crawl(self._crawl_realms, deadline, max_requests, sink)
+
+    async def _crawl_realms(self, emit) -> None:
+        connected_realms_index = await self.get_connected_realm_index()
 
-    async def get_professions_tree_by_expansion(self, expansion_name: str) -> list:
+        progress = self.progress.track("get_all_realms", len(connected_realms_index['connected_realms']))
+        try:
+            for realm in connected_realms_index['connected_realms']:
+                realm = await self._get_data(realm['href'])
+                await emit([realm])
+                progress.advance()
+        finally:
+            progress.finish()
+
+    @bulk
+    async def get_professions_tree_by_expansion(
+        self, expansion_name: str, deadline: float = None, max_requests: int = None
+    ) -> list:
         """Returns all professions and recipes from a provided expaneion.
 
         Args:
             Expansion_name (str): The initals of an expansion. Currently only 'df'
                 for Dragonflight is currently supported.
+            deadline (float): Optional. Seconds it may take.
+            max_requests (int): Optional. Requests it may make.
 
         Returns:
             A list of profession dictionaries with all of that
-            profession's recipes divided by caregory ('Shields, Armor, ...')
+            profession's recipes divided by caregory ('Shields, Armor, ...').
+            PartialResults if it ran out of time or requests or a request
+            failed while it had a deadline or max_requests, where the last
+            profession may be missing categories.
         
         """
         professions = []
+        return await run_bounded(self._crawl_professions_tree(professions), professions, deadline, max_requests)
 
+    async def _crawl_professions_tree(self, professions: list) -> None:
         profession_index = await self.get_profession_index()
-        for profession in profession_index['professions']:
-            profession_id = profession['id']
-            profession_name = profession['name']
-
-            print(f"Getting {profession_name}'s recipes")
-            profession_tree = {
-                'name' : profession_name,
-                'id': profession_id,
-                'categories': []
-            }
-            skill_tiers = await self.get_profession_tiers(profession_id)
-            for skill_tier in skill_tiers['skill_tiers']:
-                if 'Dragon Isles' in skill_tier['name']:
-                    recipe_categories = await self.get_recipe_categories(profession['id'], skill_tier['id'])
-                    for category in recipe_categories['categories']:
-                        category_name = category['name']
-
-                        print(f"Getting {category_name}")
-                        category_branch = {
-                            'name' : category_name,
-                            'recipes': []
-                        }
-                        for recipe in category['recipes']:
-                            recipe_leaf = await self.get_recipe(recipe['id'])
-                            category_branch['recipes'].append(recipe_leaf)
-        
-                        profession_tree['categories'].append(category_branch)
-            professions.append(profession_tree)
-        return professions
+        progress = self.progress.track("get_professions_tree_by_expansion")
+        try:
+            for profession in profession_index['professions']:
+                profession_id = profession['id']
+                profession_name = profession['name']
+
+                profession_tree = {
+                    'name' : profession_name,
+                    'id': profession_id,
+                    'categories': []
+                }
+                professions.append(profession_tree)
+                skill_tiers = await self.get_profession_tiers(profession_id)
+                for skill_tier in skill_tiers['skill_tiers']:
+                    if 'Dragon Isles' in skill_tier['name']:
+                        recipe_categories = await self.get_recipe_categories(profession['id'], skill_tier['id'])
+                        for category in recipe_categories['categories']:
+                            category_name = category['name']
+                            category_branch = {
+                                'name' : category_name,
+                                'recipes': []
+                            }
+                            profession_tree['categories'].append(category_branch)
+                            for recipe in category['recipes']:
+                                recipe_leaf = await self.get_recipe(recipe['id'])
+                                category_branch['recipes'].append(recipe_leaf)
+                                progress.advance()
+        finally:
+            progress.finish()
 
     async def connected_realm_search(self, filters: dict = {}) -> dict:
         """Preforms a search of all realms in that region.
@@ -337,11 +729,40 @@ class WowApi:
         ids = {"connected_realm_id": connected_realm_id}
         return await self._get_data(url_name, ids)
 
+    async def get_auctions_if_modified(self, connected_realm_id: int, last_modified: str = None) -> tuple:
+        """Returns a connected realm's auctions only if they changed since last_modified.
+
+        Args:
+            connected_realm_id (int):
+                The id of a connected realm cluster.
+            last_modified (str): The last-modified header of the last
+                auctions received. Ex: 'Mon, 27 Jun 2022 18:28:56 GMT'
+
+        Returns:
+            (auctions, last_modified). auctions is None if they are unchanged.
+        """
+        url_name = "auction"
+        ids = {"connected_realm_id": connected_realm_id}
+        return await self._get_data_if_modified(url_name, ids, last_modified)
+
     async def get_commodities(self) -> dict:
         """Returns all commodities data for the region."""
         url_name = 'commodities'
         return await self._get_data(url_name)
 
+    async def get_commodities_if_modified(self, last_modified: str = None) -> tuple:
+        """Returns the region's commodities only if they changed since last_modified.
+
+        Args:
+            last_modified (str): The last-modified header of the last
+                commodities received. Ex: 'Mon, 27 Jun 2022 18:28:56 GMT'
+
+        Returns:
+            (commodities, last_modified). commodities is None if they are unchanged.
+        """
+        url_name = 'commodities'
+        return await self._get_data_if_modified(url_name, last_modified=last_modified)
+
 
     async def get_profession_index(self, true_professions_only: bool = True) -> dict:
         """Returns the all professions.
@@ -0,0 +1,141 @@
+"""This module contains the Hedger which cuts the tail latency of small requests.
+
+A few requests to an endpoint take far longer than the rest. When a
+request hasn't finished by the time 95% of that endpoint's recent requests
+had, the Hedger sends a duplicate and uses whichever answers first.
+
+Typical usage example:
+
+limiter = RateLimiter()
+us_api = await WowApi.create('us', rate_limiter=limiter, hedger=Hedger(limiter))
+"""
+import asyncio
+import collections
+import re
+import time
+from urllib.parse import urlparse
+
+from getwowdataasync.deadlines import charge_request
+from getwowdataasync.exceptions import RequestBudgetExceededError
+
+_id_pattern = re.compile(r"\d+")
+
+
+def endpoint_of(url: str) -> str:
+    """Returns a url's path with ids replaced so every item (or recipe, ...) shares one endpoint."""
+    return _id_pattern.sub("{id}", urlparse(url).path)
+
+
+class Hedger:
+    """Sends a duplicate of slow requests and keeps the first response.
+
+    Only GET requests that are safe to repeat should be hedged. Every
+    duplicate waits on the rate limiter like any other request and no more
+    than max_extra_ratio of requests are duplicated.
+    """
+
+    def __init__(
+        self,
+        rate_limiter,
+        max_extra_ratio: float = 0.05,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        samples: int = 200,
+        excluded_endpoints: tuple = ("/auctions",),
+    ):
+        """
+        Args:
+            rate_limiter (RateLimiter): Duplicates wait on it. Use the same
+                one as the WowApi.
+            max_extra_ratio (float): The most duplicates per request made.
+            percentile (float): How slow (compared to recent requests to the
+                endpoint) a request has to be before it is duplicated.
+            min_samples (int): Requests to an endpoint needed before its
+                requests are hedged.
+            samples (int): How many recent latencies per endpoint are kept.
+            excluded_endpoints (tuple): Endpoints containing any of these
+                are never hedged. Auctions are excluded since they are big.
+        """
+        self.rate_limiter = rate_limiter
+        self.max_extra_ratio = max_extra_ratio
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.samples = samples
+        self.excluded_endpoints = excluded_endpoints
+        self.requests = 0
+        self.hedges = 0
+        self._latencies = {}
+
+    def hedge_delay(self, endpoint: str):
+        """Returns how long a request to endpoint may take before it is duplicated or None."""
+        latencies = self._latencies.get(endpoint)
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        return ordered[int(self.percentile * (len(ordered) - 1))]
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Records how long a request to endpoint took."""
+        if endpoint not in self._latencies:
+            self._latencies[endpoint] = collections.deque(maxlen=self.samples)
+        self._latencies[endpoint].append(seconds)
+
+    async def run(self, url: str, make_request):
+        """Makes a request, duplicating it if it is slower than usual.
+
+        Args:
+            url (str): The request's url. Used to group latencies by endpoint.
+            make_request (callable): Returns a new awaitable of the request each call.
+
+        Returns:
+            The result of whichever request finished first without an error.
+        """
+        endpoint = endpoint_of(url)
+        start = time.monotonic()
+        self.requests += 1
+        delay = None
+        if not any(excluded in endpoint for excluded in self.excluded_endpoints):
+            delay = self.hedge_delay(endpoint)
+        if delay is None or self._hedges_used_up():
+            result = await make_request()
+            self.record(endpoint, time.monotonic() - start)
+            return result
+
+        first = asyncio.ensure_future(make_request())
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            self.record(endpoint, time.monotonic() - start)
+            return first.result()
+
+        # Checked again since requests running alongside this one may have hedged while it waited.
+        if self._hedges_used_up():
+            return await self._await_unhedged(first, endpoint, start)
+        try:
+            charge_request()
+        except RequestBudgetExceededError:
+            # Not worth failing the bulk operation over, the first request is still running.
+            return await self._await_unhedged(first, endpoint, start)
+        # Counted before waiting for the rate limiter so others waiting can't exceed the cap.
+        self.hedges += 1
+        await self.rate_limiter.acquire()
+        pending = {first, asyncio.ensure_future(make_request())}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished = [task for task in done if task.exception() is None]
+                if finished:
+                    self.record(endpoint, time.monotonic() - start)
+                    return finished[0].result()
+            # Both failed, raise the first's error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedges_used_up(self) -> bool:
+        return self.hedges + 1 > self.max_extra_ratio * self.requests
+
+    async def _await_unhedged(self, first: asyncio.Future, endpoint: str, start: float):
+        result = await first
+        self.record(endpoint, time.monotonic() - start)
+        return result
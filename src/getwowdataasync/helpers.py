@@ -39,6 +39,32 @@ def get_id_from_url(url: str) -> int:
     return pattern.search(url).group()
 
 
+locale_pattern = re.compile(r"^[a-z]{2}_[A-Z]{2}$")
+
+
+def localize(json, locale: str):
+    """Replaces every dict of translations in json with the locale's translation.
+
+    Searches return text in every locale like
+    {'en_US': 'Armor', 'de_DE': 'Rüstung', ...} while other requests
+    only return the text in the requested locale.
+
+    Args:
+        json: Parsed json from a search result.
+        locale (str): The locale to keep. Ex: 'en_US'
+
+    Returns:
+        json with each translations dict replaced by its locale's text.
+    """
+    if isinstance(json, list):
+        return [localize(element, locale) for element in json]
+    if isinstance(json, dict):
+        if locale in json and all(locale_pattern.match(key) for key in json):
+            return json[locale]
+        return {key: localize(value, locale) for key, value in json.items()}
+    return json
+
+
 def convert_to_datetime(Date: str):
     """Takes last-modified header and converts it to a datetime object."""
     # last-modified: Mon, 27 Jun 2022 18:28:56 GMT
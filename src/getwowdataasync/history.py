@@ -0,0 +1,274 @@
+"""This module contains the AuctionHistoryStore which keeps auction snapshots in compact binary files.
+
+Each snapshot is appended to a data file as fixed width columns (item ids,
+prices, quantities and auction ids) sorted by item id. A small index file
+records where each snapshot's columns are. Readers memory map both files so
+an item's history across many snapshots is found with a binary search in
+each snapshot instead of decoding them. Compressed snapshots are split
+into blocks of block_rows rows compressed on their own, with the first
+item id of each block kept uncompressed, so looking an item up only
+decompresses the blocks its rows are in.
+
+Typical usage example:
+
+store = AuctionHistoryStore('auction_history/')
+store.append(AuctionSnapshot.from_json(auctions), timestamp, connected_realm_id=4)
+for timestamp, connected_realm_id, prices, quantities in store.item_history(190320):
+    print(timestamp, min(prices), sum(quantities))
+"""
+import bisect
+import itertools
+import mmap
+import os
+import struct
+import zlib
+from array import array
+
+from getwowdataasync.auctions import AuctionSnapshot
+
+COMMODITIES_REALM_ID = 0
+"""The connected_realm_id commodities snapshots are stored under."""
+
+column_names = ("item_ids", "prices", "quantities", "ids")
+
+DELTA_ENCODED = 1
+COMPRESSED = 2
+
+block_rows = 4096
+"""How many rows of a new compressed snapshot are compressed together."""
+
+# timestamp, connected realm id, rows, flags, rows per compressed block,
+# then (offset, length) per column
+_index_record = struct.Struct("<qqQII" + "QQ" * len(column_names))
+_block_rows_field = 4
+_locations_field = 5
+
+
+class AuctionHistoryStore:
+    """An append only store of auction snapshots on disk.
+
+    Uncompressed snapshots are read straight from the memory mapped file.
+    Compressed snapshots (delta encoded item ids and zlib compressed
+    blocks of rows) take far less space but the blocks an item is in are
+    decompressed when it is read. Columns are written in the machine's
+    byte order.
+
+    A compressed column starts with the offsets of its blocks (uint64,
+    one per block plus one, from the end of this header); the item ids
+    column then has each block's first item id (int64). The compressed
+    blocks follow.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Where the data and index files are kept. Created if missing.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, "snapshots.dat")
+        self.index_path = os.path.join(directory, "snapshots.idx")
+        for path in (self.data_path, self.index_path):
+            if not os.path.exists(path):
+                open(path, "wb").close()
+        self._maps = {}
+
+    def append(
+        self,
+        snapshot: AuctionSnapshot,
+        timestamp: int,
+        connected_realm_id: int = COMMODITIES_REALM_ID,
+        compress: bool = False,
+    ) -> None:
+        """Adds a snapshot to the end of the store.
+
+        Args:
+            snapshot (AuctionSnapshot): The auctions to store.
+            timestamp (int): When the snapshot was published. Ex: seconds since epoch.
+            connected_realm_id (int): The snapshot's connected realm.
+                COMMODITIES_REALM_ID for commodities.
+            compress (bool): Delta encode and zlib compress the columns in
+                blocks of block_rows rows.
+        """
+        order = sorted(
+            range(len(snapshot)),
+            key=lambda row: (snapshot.item_ids[row], snapshot.prices[row]),
+        )
+        columns = [
+            array("q", [getattr(snapshot, name)[row] for row in order])
+            for name in column_names
+        ]
+        flags = 0
+        if compress:
+            flags = DELTA_ENCODED | COMPRESSED
+            blobs = [_compress_blocks(column, delta_encode=position == 0) for position, column in enumerate(columns)]
+        else:
+            blobs = [column.tobytes() for column in columns]
+
+        column_locations = []
+        with open(self.data_path, "ab") as data_file:
+            offset = data_file.tell()
+            for blob in blobs:
+                data_file.write(blob)
+                # Keeps every column 8 byte aligned for memoryview casts
+                padding = -len(blob) % 8
+                data_file.write(b"\0" * padding)
+                column_locations += [offset, len(blob)]
+                offset += len(blob) + padding
+
+        record = _index_record.pack(
+            timestamp, connected_realm_id, len(order), flags, block_rows if compress else 0, *column_locations
+        )
+        with open(self.index_path, "ab") as index_file:
+            index_file.write(record)
+
+    def snapshots(self, connected_realm_id: int = None, start: int = None, end: int = None):
+        """Yields (position, timestamp, connected_realm_id, rows) of stored snapshots.
+
+        Args:
+            connected_realm_id (int): Optional. Only this connected realm's snapshots.
+            start (int): Optional. Only snapshots at or after this timestamp.
+            end (int): Optional. Only snapshots at or before this timestamp.
+        """
+        index = self._map(self.index_path)
+        for position, record in enumerate(_index_record.iter_unpack(index)):
+            timestamp, realm_id, rows = record[:3]
+            if connected_realm_id is not None and realm_id != connected_realm_id:
+                continue
+            if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                continue
+            yield position, timestamp, realm_id, rows
+
+    def item_history(self, item_id: int, connected_realm_id: int = None, start: int = None, end: int = None):
+        """Yields an item's auctions from every matching snapshot.
+
+        Args:
+            item_id (int): The item to look up.
+            connected_realm_id (int): Optional. Only this connected realm's snapshots.
+            start (int): Optional. Only snapshots at or after this timestamp.
+            end (int): Optional. Only snapshots at or before this timestamp.
+
+        Yields:
+            (timestamp, connected_realm_id, prices, quantities) where prices
+            are in increasing order. Snapshots without the item are skipped.
+        """
+        for position, timestamp, realm_id, _ in self.snapshots(connected_realm_id, start, end):
+            prices, quantities = self.read_item(position, item_id)
+            if prices:
+                yield timestamp, realm_id, prices, quantities
+
+    def read_item(self, position: int, item_id: int) -> tuple:
+        """Returns (prices, quantities) of an item's auctions in one snapshot.
+
+        Args:
+            position (int): The snapshot's position. See snapshots().
+            item_id (int): The item to look up.
+        """
+        record = self._record(position)
+        first_block = end_block = None
+        if record[3] & COMPRESSED:
+            first_item_ids = self._first_item_ids(record)
+            # The block before the first starting with item_id may hold its first rows.
+            first_block = max(bisect.bisect_left(first_item_ids, item_id) - 1, 0)
+            end_block = max(bisect.bisect_right(first_item_ids, item_id), first_block + 1)
+        item_ids = self._column(record, 0, first_block, end_block)
+        first = bisect.bisect_left(item_ids, item_id)
+        last = bisect.bisect_right(item_ids, item_id, first)
+        if first == last:
+            return [], []
+        prices = self._column(record, 1, first_block, end_block)[first:last]
+        quantities = self._column(record, 2, first_block, end_block)[first:last]
+        return list(prices), list(quantities)
+
+    def read_snapshot(self, position: int) -> AuctionSnapshot:
+        """Returns a whole stored snapshot. Rows are sorted by item id, not auction id.
+
+        time_left isn't stored so every auction's time_left is 0.
+        """
+        record = self._record(position)
+        item_ids, prices, quantities, ids = (
+            array("q", self._column(record, column)) for column in range(len(column_names))
+        )
+        return AuctionSnapshot(ids, item_ids, quantities, prices, array("b", bytes(len(ids))))
+
+    def close(self) -> None:
+        """Unmaps the files. The store can still be used afterwards."""
+        for mapped_file in self._maps.values():
+            mapped_file.close()
+        self._maps.clear()
+
+    def _record(self, position: int) -> tuple:
+        return _index_record.unpack_from(self._map(self.index_path), position * _index_record.size)
+
+    def _column(self, record: tuple, column: int, first_block: int = None, end_block: int = None):
+        """Returns a column's values. Of compressed columns only those of blocks [first_block, end_block)."""
+        if record[3] & COMPRESSED:
+            return self._blocks(record, column, first_block, end_block)
+        offset, length = record[_locations_field + column * 2: _locations_field + 2 + column * 2]
+        return memoryview(self._map(self.data_path))[offset: offset + length].cast("q")
+
+    def _blocks(self, record: tuple, column: int, first_block: int = None, end_block: int = None) -> array:
+        blocks = _block_count(record)
+        first_block = 0 if first_block is None else first_block
+        end_block = blocks if end_block is None else min(end_block, blocks)
+        offset = record[_locations_field + column * 2]
+        data = self._map(self.data_path)
+        block_offsets = array("Q")
+        block_offsets.frombytes(data[offset: offset + 8 * (blocks + 1)])
+        blocks_start = offset + 8 * (blocks + 1) + (8 * blocks if column == 0 else 0)
+        values = array("q")
+        for block in range(first_block, end_block):
+            decompressed = array("q")
+            decompressed.frombytes(zlib.decompress(
+                data[blocks_start + block_offsets[block]: blocks_start + block_offsets[block + 1]]
+            ))
+            if column == 0 and record[3] & DELTA_ENCODED:
+                decompressed = array("q", itertools.accumulate(decompressed))
+            values += decompressed
+        return values
+
+    def _first_item_ids(self, record: tuple) -> array:
+        blocks = _block_count(record)
+        start = record[_locations_field] + 8 * (blocks + 1)
+        first_item_ids = array("q")
+        first_item_ids.frombytes(self._map(self.data_path)[start: start + 8 * blocks])
+        return first_item_ids
+
+    def _map(self, path: str):
+        # Remaps a file once it has grown since it was last mapped.
+        size = os.path.getsize(path)
+        current = self._maps.get(path)
+        if current is None or len(current) != size:
+            if size == 0:
+                return b""
+            if current is not None:
+                try:
+                    current.close()
+                except BufferError:
+                    pass  # a column view still uses it, it is unmapped once that is gone
+            with open(path, "rb") as file:
+                current = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = current
+        return current
+
+
+def _block_count(record: tuple) -> int:
+    """Returns how many blocks a compressed snapshot's columns have, using the block size it was written with."""
+    return -(-record[2] // record[_block_rows_field])
+
+
+def _delta_encode(values: array) -> array:
+    encoded = array("q", values)
+    for position in range(len(encoded) - 1, 0, -1):
+        encoded[position] -= encoded[position - 1]
+    return encoded
+
+
+def _compress_blocks(column: array, delta_encode: bool = False) -> bytes:
+    """Returns a column's block offsets, first item ids if delta_encode, then its compressed blocks."""
+    blocks = [column[start: start + block_rows] for start in range(0, len(column), block_rows)]
+    compressed = [zlib.compress((_delta_encode(block) if delta_encode else block).tobytes()) for block in blocks]
+    block_offsets = array("Q", itertools.accumulate((len(blob) for blob in compressed), initial=0))
+    header = block_offsets.tobytes()
+    if delta_encode:
+        header += array("q", (block[0] for block in blocks)).tobytes()
+    return header + b"".join(compressed)
@@ -0,0 +1,128 @@
+"""This module contains the Interner which shrinks large crawl results.
+
+Blizzard's responses repeat the same strings (hrefs, class names, quality
+names, locale keys, ...) and the same small objects (item_class, quality,
+inventory_type, ...) on every element. Passing each response through an
+Interner makes all of those repeats point to a single shared object.
+
+Typical usage example:
+
+interner = Interner()
+us_api = await WowApi.create('us', interner=interner)
+items = await us_api.get_all_items()
+print(interner.report())
+"""
+import sys
+
+_hashable_types = (str, int, float, bool, type(None))
+
+
+class Interner:
+    """Deduplicates repeated strings and small dicts in parsed json.
+
+    Shared dicts are the same object in every result they appear in so
+    mutating one of them changes it everywhere. Copy a shared dict before
+    changing it.
+
+    Attributes:
+        strings_deduplicated (int): How many string objects were replaced
+            with an already seen equal string.
+        dicts_shared (int): How many dicts were replaced with an already
+            seen equal dict.
+        bytes_saved (int): Estimated number of bytes no longer held by
+            the replaced duplicates.
+    """
+
+    def __init__(self, max_shared_dict_size: int = 8):
+        """
+        Args:
+            max_shared_dict_size (int): Dicts with more keys than this are never
+                shared. Large dicts (an entire item for example) are rarely
+                duplicated so comparing them only wastes time.
+        """
+        self.max_shared_dict_size = max_shared_dict_size
+        self.strings_deduplicated = 0
+        self.dicts_shared = 0
+        self.bytes_saved = 0
+        self._strings = {}
+        self._dicts = {}
+        self._shared_dict_ids = set()
+
+    def intern(self, json):
+        """Returns json with its repeated strings and small dicts replaced by shared ones.
+
+        Args:
+            json: Parsed json. Dicts, lists, strings and numbers.
+
+        Returns:
+            The deduplicated json. Lists and large dicts are rebuilt
+            so the passed in json is not modified.
+        """
+        if isinstance(json, str):
+            return self._intern_string(json)
+        if isinstance(json, list):
+            return [self.intern(element) for element in json]
+        if isinstance(json, dict):
+            return self._intern_dict(json)
+        return json
+
+    def _intern_string(self, string: str) -> str:
+        shared = self._strings.setdefault(string, string)
+        if shared is not string:
+            self.strings_deduplicated += 1
+            self.bytes_saved += sys.getsizeof(string)
+        return shared
+
+    def _intern_dict(self, json: dict) -> dict:
+        interned = {
+            self._intern_string(key): self.intern(value)
+            for key, value in json.items()
+        }
+        if len(interned) > self.max_shared_dict_size:
+            return interned
+
+        key = self._dict_key(interned)
+        if key is None:
+            return interned
+
+        shared = self._dicts.setdefault(key, interned)
+        if shared is interned:
+            self._shared_dict_ids.add(id(shared))
+        else:
+            self.dicts_shared += 1
+            self.bytes_saved += sys.getsizeof(interned)
+        return shared
+
+    def _dict_key(self, json: dict):
+        # Nested dicts can only be part of the key once they are shared
+        # themselves, then their id stands in for their contents.
+        key = []
+        for name, value in json.items():
+            if isinstance(value, _hashable_types):
+                key.append((name, type(value), value))
+            elif isinstance(value, dict) and id(value) in self._shared_dict_ids:
+                key.append((name, dict, id(value)))
+            else:
+                return None
+        return tuple(key)
+
+    def report(self) -> dict:
+        """Returns how much deduplication has happened so far.
+
+        Returns:
+            A dict with strings_deduplicated, dicts_shared, bytes_saved
+            and the number of unique strings and dicts being held.
+        """
+        return {
+            "strings_deduplicated": self.strings_deduplicated,
+            "dicts_shared": self.dicts_shared,
+            "bytes_saved": self.bytes_saved,
+            "unique_strings": len(self._strings),
+            "unique_dicts": len(self._dicts),
+        }
+
+    def clear(self) -> None:
+        """Forgets every shared object. Already interned results are unchanged."""
+        self._strings.clear()
+        self._dicts.clear()
+        self._shared_dict_ids.clear()
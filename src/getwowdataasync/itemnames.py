@@ -0,0 +1,214 @@
+"""This module contains the ItemNameIndex which searches item names without a request.
+
+Every word of every item name (in every locale) points to the items whose
+names contain it. The words are also kept sorted so all words starting
+with what was typed so far are found with a binary search, which makes
+typeahead queries like "thunderf" or "blade of" answer from memory.
+Prefixes of one or two letters match a large share of all items, so a
+query made only of those is ranked once and its top results cached until
+the index changes, and in longer queries they only filter the items the
+other words matched. The
+index is built from item search pages, which carry names in every locale,
+and refreshed by only searching item ids above the highest it has.
+
+Typical usage example:
+
+index = ItemNameIndex("item_names.json")
+await index.refresh(us_api)          # the first refresh searches every item
+index.search("thunderfury")          # [(19019, 'Thunderfury, Blessed Blade of the Windseeker')]
+index.search("blade of", limit=5, locale="de_DE")
+"""
+import bisect
+import heapq
+import json
+import os
+import re
+
+_word_pattern = re.compile(r"\w+")
+# Words this short are short prefixes, see ItemNameIndex.search().
+_short_prefix_length = 2
+# How many results of a short prefix query are cached, and how many queries.
+_cached_results = 50
+_max_cached_queries = 4096
+
+
+def _words(text: str) -> list:
+    return _word_pattern.findall(text.casefold())
+
+
+class ItemNameIndex:
+    """An in memory word and prefix index of item names in every locale."""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Optional. A json file to persist the names in.
+        """
+        self.path = path
+        # item id -> {locale: name}
+        self.names = {}
+        self.max_item_id = -1
+        # word -> set of item ids
+        self._postings = {}
+        self._sorted_words = []
+        self._sorted = True
+        # (words, query, locale) -> ranked item ids of short prefix queries
+        self._cache = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for item_id, names in json.load(file).items():
+                    self._add(int(item_id), names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, items, locale: str = "en_US") -> None:
+        """Adds or replaces items' names.
+
+        Args:
+            items: An iterable of item search results, their data or items
+                from get_item_by_id(). None's are skipped.
+            locale (str): The locale of names that aren't in every locale,
+                like those of get_item_by_id().
+        """
+        for item in items:
+            if not item:
+                continue
+            item = item.get("data", item)
+            names = item.get("name")
+            if names is None:
+                continue
+            if not isinstance(names, dict):
+                names = {locale: names}
+            self._add(item["id"], names)
+
+    def search(self, query: str, limit: int = 10, locale: str = "en_US") -> list:
+        """Returns items whose names contain a word starting with each word of query.
+
+        Names that start with the query come first, then shorter names.
+
+        Args:
+            query (str): What was typed so far. Ex: "blade of the w"
+            limit (int): Most results returned.
+            locale (str): Which locale's name to return and rank by.
+
+        Returns:
+            A list of (item id, name).
+        """
+        words = _words(query)
+        if not words:
+            return []
+        query = query.strip().casefold()
+        short_words = [word for word in words if len(word) <= _short_prefix_length]
+        long_words = [word for word in words if len(word) > _short_prefix_length]
+        if long_words:
+            ranked = self._rank(self._matches(long_words, short_words), query, limit, locale)
+        elif limit <= _cached_results:
+            key = (tuple(words), query, locale)
+            ranked = self._cache.get(key)
+            if ranked is None:
+                if len(self._cache) >= _max_cached_queries:
+                    self._cache.clear()
+                ranked = self._cache[key] = self._rank(self._matches(words), query, _cached_results, locale)
+            ranked = ranked[:limit]
+        else:
+            ranked = self._rank(self._matches(words), query, limit, locale)
+        return [(item_id, self._name(item_id, locale)) for item_id in ranked]
+
+    async def refresh(self, api) -> int:
+        """Adds every item with a higher id than the index's highest.
+
+        Args:
+            api (WowApi): Searches the items.
+
+        Returns:
+            How many items were added.
+        """
+        added = 0
+        while True:
+            results = await api.item_search(
+                {"id": f"[{self.max_item_id + 1},]", "orderby": "id", "_pageSize": 1000}
+            )
+            if not results or not results["results"]:
+                break
+            self.add(results["results"], api.locale)
+            added += len(results["results"])
+        if added:
+            self.save()
+        return added
+
+    def save(self) -> None:
+        """Writes the names to the index's path, if it has one."""
+        if not self.path:
+            return
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(self.names, file, ensure_ascii=False)
+
+    def _matches(self, words: list, filter_words: list = ()) -> set:
+        """Returns the ids of items with a word starting with each of words and filter_words.
+
+        filter_words are checked against the names of the items words
+        matched instead of having their own, large, prefix matches looked up.
+        """
+        matches = sorted((self._prefix_matches(word) for word in words), key=len)
+        item_ids = matches[0]
+        for other_matches in matches[1:]:
+            item_ids = item_ids & other_matches
+            if not item_ids:
+                return item_ids
+        if filter_words:
+            item_ids = {item_id for item_id in item_ids if self._has_words_starting(item_id, filter_words)}
+        return item_ids
+
+    def _has_words_starting(self, item_id: int, prefixes: list) -> bool:
+        words = {word for name in self.names[item_id].values() if name for word in _words(name)}
+        return all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
+
+    def _rank(self, item_ids: set, query: str, limit: int, locale: str) -> list:
+        """Returns the best limit item ids: names starting with query first, then shorter names."""
+        def rank(item_id):
+            name = self._name(item_id, locale)
+            return (not name.casefold().startswith(query), len(name), item_id)
+
+        return heapq.nsmallest(limit, item_ids, key=rank)
+
+    def _add(self, item_id: int, names: dict) -> None:
+        self._cache.clear()
+        if item_id in self.names:
+            self._remove(item_id)
+        self.names[item_id] = names
+        self.max_item_id = max(self.max_item_id, item_id)
+        for word in {word for name in names.values() if name for word in _words(name)}:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = set()
+                self._sorted = False
+            postings.add(item_id)
+
+    def _remove(self, item_id: int) -> None:
+        self._cache.clear()
+        for word in {word for name in self.names.pop(item_id).values() if name for word in _words(name)}:
+            postings = self._postings[word]
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[word]
+                self._sorted = False
+
+    def _prefix_matches(self, prefix: str) -> set:
+        """Returns the ids of items with a word starting with prefix."""
+        if not self._sorted:
+            # Sorted once after a batch of adds instead of on every new word.
+            self._sorted_words = sorted(self._postings)
+            self._sorted = True
+        start = bisect.bisect_left(self._sorted_words, prefix)
+        end = bisect.bisect_left(self._sorted_words, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[self._sorted_words[start]]
+        item_ids = set()
+        for word in self._sorted_words[start:end]:
+            item_ids |= self._postings[word]
+        return item_ids
+
+    def _name(self, item_id: int, locale: str) -> str:
+        names = self.names[item_id]
+        return names.get(locale) or next((name for name in names.values() if name), "")
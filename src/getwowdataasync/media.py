@@ -0,0 +1,136 @@
+"""This module contains the MediaDownloader which saves icons to disk in bulk.
+
+get_item_icon(), get_recipe_icon() and get_profession_icon() only return
+json with links to the images. MediaDownloader requests that json for many
+ids at once and then downloads each linked image a single time, no matter
+how many items share it.
+
+Typical usage example:
+
+us_api = await WowApi.create('us')
+downloader = MediaDownloader(us_api, 'icons/')
+icon_paths = await downloader.download_item_icons([19019, 19351])
+# {19019: {'icon': 'icons/inv_sword_39.jpg'}, 19351: {...}}
+"""
+import asyncio
+import hashlib
+import os
+from urllib.parse import urlparse
+
+from getwowdataasync.getdata import WowApi
+
+
+class MediaDownloader:
+    """Downloads the assets of media json into a directory.
+
+    Assets are saved under the file name from their url. An asset is
+    skipped if that file already exists, if its url was already downloaded
+    or if a different url had the exact same content.
+    """
+
+    def __init__(self, api: WowApi, directory: str, concurrency: int = 20, chunk_size: int = 65536):
+        """
+        Args:
+            api (WowApi): Used to request the media json.
+            directory (str): Where assets are saved. Created if missing.
+            concurrency (int): Most media json requests and most asset
+                downloads in flight at one time.
+            chunk_size (int): Bytes read from a download before they
+                are written to disk.
+        """
+        self.api = api
+        self.directory = directory
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self._downloads = {}
+        self._paths_by_hash = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        os.makedirs(directory, exist_ok=True)
+
+    async def download_item_icons(self, item_ids) -> dict:
+        """Downloads the icons of items.
+
+        Args:
+            item_ids (iterable): Item ids.
+
+        Returns:
+            A dict of item id to a dict of asset key ('icon') to file path.
+            If an item's media could not be downloaded its value is the
+            exception raised.
+        """
+        return await self._download_media(self.api.get_item_icon, item_ids)
+
+    async def download_recipe_icons(self, recipe_ids) -> dict:
+        """Downloads the icons of recipes. See download_item_icons()."""
+        return await self._download_media(self.api.get_recipe_icon, recipe_ids)
+
+    async def download_profession_icons(self, profession_ids) -> dict:
+        """Downloads the icons of professions. See download_item_icons()."""
+        return await self._download_media(self.api.get_profession_icon, profession_ids)
+
+    async def _download_media(self, get_media, ids) -> dict:
+        media_by_id = await self.api._get_batch(get_media, ids, self.concurrency)
+
+        async def download_assets(media):
+            if isinstance(media, Exception):
+                return media
+            if media is None:
+                return None
+            try:
+                paths = await asyncio.gather(
+                    *(self.download(asset["value"]) for asset in media.get("assets", []))
+                )
+            except Exception as e:
+                return e
+            return {asset["key"]: path for asset, path in zip(media.get("assets", []), paths)}
+
+        assets = await asyncio.gather(*(download_assets(media) for media in media_by_id.values()))
+        return dict(zip(media_by_id, assets))
+
+    async def download(self, url: str) -> str:
+        """Downloads a single asset unless it is already on disk.
+
+        Concurrent calls with the same url share one download.
+
+        Args:
+            url (str): The asset's url. Ex: the value of an asset in media json.
+
+        Returns:
+            The path of the downloaded (or already existing) file.
+        """
+        if url not in self._downloads:
+            self._downloads[url] = asyncio.ensure_future(self._download(url))
+        try:
+            return await asyncio.shield(self._downloads[url])
+        except Exception:
+            self._downloads.pop(url, None)
+            raise
+
+    async def _download(self, url: str) -> str:
+        file_name = os.path.basename(urlparse(url).path)
+        path = os.path.join(self.directory, file_name)
+        if os.path.exists(path):
+            return path
+
+        partial_path = path + ".part"
+        digest = hashlib.sha256()
+        try:
+            async with self._semaphore:
+                async with self.api.client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    with open(partial_path, "wb") as file:
+                        async for chunk in response.aiter_bytes(self.chunk_size):
+                            digest.update(chunk)
+                            file.write(chunk)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        content_hash = digest.hexdigest()
+        if content_hash in self._paths_by_hash:
+            os.remove(partial_path)
+            return self._paths_by_hash[content_hash]
+        os.replace(partial_path, path)
+        self._paths_by_hash[content_hash] = path
+        return path
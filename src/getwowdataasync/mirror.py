@@ -0,0 +1,235 @@
+"""This module contains the ApiMirror, a local caching http server in front of Blizzard's api.
+
+Services query the mirror with the same paths and query parameters as
+Blizzard's api (no access token needed) and the mirror makes the request
+upstream with its WowApi's token and rate limiter. Responses are cached by
+namespace. static namespaces change only with patches so they are kept
+for static_ttl. dynamic and profile responses are revalidated with
+If-Modified-Since at most every revalidate_interval so an unchanged hourly
+auction file costs one 304 per interval however many services ask.
+Identical requests that arrive while one is upstream wait for it instead
+of making their own.
+
+Typical usage example:
+
+api = await WowApi.create('us')
+mirror = ApiMirror(api, port=8080)
+await mirror.start()
+await mirror.serve_forever()
+
+# In another service, the region comes from each request's namespace
+us_api = await WowApi.create('us', api_url='http://localhost:8080', access_token='unused')
+"""
+import asyncio
+import collections
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+from getwowdataasync.deadlines import charge_request
+from getwowdataasync.urls import base_url
+
+# Upstream hosts are only ever built from these so a request can't send the token elsewhere.
+_regions = ("us", "eu", "kr", "tw")
+_reasons = {200: "OK", 304: "Not Modified", 400: "Bad Request", 405: "Method Not Allowed", 502: "Bad Gateway"}
+
+
+class CachedResponse:
+    """A response kept by the mirror."""
+
+    def __init__(self, status: int, body: bytes, content_type: str = None, last_modified: str = None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+        self.checked_at = self.fetched_at
+
+
+class ApiMirror:
+    """Serves Blizzard api requests from a cache, fetching upstream through a WowApi only when needed."""
+
+    def __init__(
+        self,
+        api,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        static_ttl: float = 7 * 86400,
+        revalidate_interval: float = 60,
+        max_bytes: int = 1 << 30,
+    ):
+        """
+        Args:
+            api (WowApi): Makes the upstream requests. Its access token,
+                client and rate limiter are used.
+            host (str): The address to listen on.
+            port (int): The port to listen on. 0 picks a free one.
+            static_ttl (float): Seconds a static namespace response is kept.
+            revalidate_interval (float): Least seconds between upstream
+                checks of a dynamic or profile namespace response.
+            max_bytes (int): Most response bytes kept. The least recently
+                used responses are dropped first.
+        """
+        self.api = api
+        self.host = host
+        self.port = port
+        self.static_ttl = static_ttl
+        self.revalidate_interval = revalidate_interval
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        self.hits = 0
+        self.upstream_requests = 0
+        self._cache = collections.OrderedDict()
+        self._in_flight = {}
+        self._server = None
+
+    async def start(self) -> None:
+        """Starts listening. self.port is the port listened on once it returns."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops listening."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def get(self, path: str, params: dict) -> CachedResponse:
+        """Returns the response to a request from the cache or upstream.
+
+        Args:
+            path (str): The request's path. Ex: '/data/wow/item/19019'
+            params (dict): The request's query parameters. An access_token
+                is ignored.
+        """
+        params = {key: value for key, value in params.items() if key != "access_token"}
+        # The namespace's suffix is the region. Ex: static-eu
+        region = params.get("namespace", "").rpartition("-")[2] or self.api.region
+        if region not in _regions:
+            return CachedResponse(400, f"unknown region {region!r}".encode())
+        # A path like //evil.example/x would be joined as another host.
+        if not path.startswith("/") or path.startswith("//"):
+            return CachedResponse(400, f"bad path {path!r}".encode())
+        key = (path, tuple(sorted(params.items())))
+        cached = self._cache.get(key)
+        if cached and self._is_fresh(cached, params):
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        if key not in self._in_flight:
+            future = asyncio.ensure_future(self._fetch(key, region, path, params, cached))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._in_flight[key] = future
+        else:
+            self.hits += 1
+        return await asyncio.shield(self._in_flight[key])
+
+    def _is_fresh(self, cached: CachedResponse, params: dict) -> bool:
+        now = time.monotonic()
+        if params.get("namespace", "").startswith("static"):
+            return now - cached.fetched_at < self.static_ttl
+        return now - cached.checked_at < self.revalidate_interval
+
+    async def _fetch(
+        self, key: tuple, region: str, path: str, params: dict, cached: CachedResponse = None
+    ) -> CachedResponse:
+        upstream = base_url.format(region=region)
+        url = upstream + path
+        if urlsplit(url).netloc != urlsplit(upstream).netloc:
+            return CachedResponse(400, f"bad path {path!r}".encode())
+        headers = {}
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        try:
+            charge_request()
+            await self.api.rate_limiter.acquire()
+            self.upstream_requests += 1
+            response = await self.api.client.get(
+                url, params={**params, "access_token": self.api.access_token}, headers=headers
+            )
+        except httpx.HTTPError as e:
+            if cached:  # a stale response beats none
+                return cached
+            return CachedResponse(502, str(e).encode())
+
+        if response.status_code == 304 and cached:
+            cached.checked_at = time.monotonic()
+            return cached
+        fetched = CachedResponse(
+            response.status_code,
+            response.content,
+            response.headers.get("content-type"),
+            response.headers.get("last-modified"),
+        )
+        if response.status_code == 200:
+            self._store(key, fetched)
+        return fetched
+
+    def _store(self, key: tuple, response: CachedResponse) -> None:
+        old = self._cache.pop(key, None)
+        if old:
+            self.cached_bytes -= len(old.body)
+        self._cache[key] = response
+        self.cached_bytes += len(response.body)
+        while self.cached_bytes > self.max_bytes and len(self._cache) > 1:
+            _, dropped = self._cache.popitem(last=False)
+            self.cached_bytes -= len(dropped.body)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, CachedResponse(400, b""), keep_alive=False)
+                    break
+                method, target, version = parts
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if method != "GET":
+                    await self._respond(writer, CachedResponse(405, b""), keep_alive)
+                else:
+                    target = urlsplit(target)
+                    response = await self.get(target.path, dict(parse_qsl(target.query)))
+                    not_modified = (
+                        response.status == 200
+                        and response.last_modified
+                        and headers.get("if-modified-since") == response.last_modified
+                    )
+                    await self._respond(writer, response, keep_alive, not_modified)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, response: CachedResponse, keep_alive: bool, not_modified: bool = False
+    ) -> None:
+        status = 304 if not_modified else response.status
+        body = b"" if not_modified else response.body
+        lines = [
+            f"HTTP/1.1 {status} {_reasons.get(status, '')}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if response.content_type:
+            lines.append(f"Content-Type: {response.content_type}")
+        if response.last_modified:
+            lines.append(f"Last-Modified: {response.last_modified}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
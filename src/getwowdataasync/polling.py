@@ -0,0 +1,191 @@
+"""This module contains the AuctionPoller which fetches auction snapshots as they are published.
+
+Blizzard publishes a new auction snapshot for each connected realm (and
+for the region's commodities) about once an hour but not at the same
+minute for every realm. The AuctionPoller learns when each one is
+published from its last-modified header and requests it again just after
+the next one is expected.
+
+Typical usage example:
+
+async def save_snapshot(connected_realm_id, auctions, published):
+    ...
+
+us_api = await WowApi.create('us')
+poller = AuctionPoller(us_api, save_snapshot)
+await poller.run() # runs until poller.stop() is called
+"""
+import asyncio
+import datetime
+import heapq
+import inspect
+import random
+import time
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.helpers import convert_to_datetime, get_id_from_url
+
+COMMODITIES = "commodities"
+
+
+class _Snapshot:
+    """What the poller knows about one connected realm's (or the commodities') snapshots."""
+
+    def __init__(self, interval: float):
+        self.last_modified = None
+        self.published = None
+        self.interval = interval
+        self.intervals_seen = 0
+
+
+class AuctionPoller:
+    """Polls auctions and commodities shortly after each new snapshot is published.
+
+    Each snapshot's publish interval is learned from consecutive
+    last-modified headers. The next request is scheduled for
+    published + interval + publish_delay plus a random jitter. Requests
+    use If-Modified-Since so an early poll of an unchanged snapshot
+    downloads nothing and is retried after retry_interval.
+    """
+
+    def __init__(
+        self,
+        api: WowApi,
+        callback,
+        connected_realm_ids: list = None,
+        include_commodities: bool = True,
+        default_interval: float = 3600,
+        publish_delay: float = 60,
+        jitter: float = 60,
+        retry_interval: float = 120,
+        spread: float = 300,
+    ):
+        """
+        Args:
+            api (WowApi): Used to make the requests.
+            callback (callable): Called (or awaited if it is async) with
+                (connected_realm_id, json, published datetime) for every new
+                snapshot. connected_realm_id is COMMODITIES for commodities.
+            connected_realm_ids (list): Optional. Defaults to every connected
+                realm from get_connected_realm_index().
+            include_commodities (bool): Also poll the region's commodities.
+            default_interval (float): Seconds between snapshots assumed until
+                one has been seen.
+            publish_delay (float): Seconds after the expected publish time to
+                wait before requesting.
+            jitter (float): Most seconds randomly added to each request's
+                time so realms published together aren't requested together.
+            retry_interval (float): Seconds to wait after an unchanged
+                snapshot or a failed request.
+            spread (float): The first requests are spread over this many seconds.
+        """
+        self.api = api
+        self.callback = callback
+        self.connected_realm_ids = connected_realm_ids
+        self.include_commodities = include_commodities
+        self.default_interval = default_interval
+        self.publish_delay = publish_delay
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.spread = spread
+        self.snapshots = {}
+        self._queue = []
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+
+    async def run(self) -> None:
+        """Polls until stop() is called."""
+        self._stopping = False
+        keys = await self._get_keys()
+        now = time.time()
+        for position, key in enumerate(keys):
+            self.snapshots[key] = _Snapshot(self.default_interval)
+            self._push(now + self.spread * position / len(keys), key)
+
+        tasks = set()
+        try:
+            while not self._stopping:
+                # Polls in progress push their next poll so the earliest
+                # due poll is checked again whenever woken.
+                self._wakeup.clear()
+                seconds_until_due = self._queue[0][0] - time.time() if self._queue else None
+                if seconds_until_due is None or seconds_until_due > 0:
+                    await self._sleep(seconds_until_due)
+                    continue
+                _, _, key = heapq.heappop(self._queue)
+                task = asyncio.create_task(self._poll(key))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Makes run() return. Polls in progress are cancelled."""
+        self._stopping = True
+        self._wakeup.set()
+
+    async def _get_keys(self) -> list:
+        if self.connected_realm_ids is None:
+            connected_realm_index = await self.api.get_connected_realm_index()
+            self.connected_realm_ids = [
+                int(get_id_from_url(connected_realm["href"]))
+                for connected_realm in connected_realm_index["connected_realms"]
+            ]
+        keys = list(self.connected_realm_ids)
+        if self.include_commodities:
+            keys.append(COMMODITIES)
+        return keys
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleeps for seconds (forever if None) or until woken by _push() or stop()."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _push(self, due: float, key) -> None:
+        heapq.heappush(self._queue, (due, str(key), key))
+        self._wakeup.set()
+
+    async def _poll(self, key) -> None:
+        snapshot = self.snapshots[key]
+        try:
+            if key == COMMODITIES:
+                json, last_modified = await self.api.get_commodities_if_modified(snapshot.last_modified)
+            else:
+                json, last_modified = await self.api.get_auctions_if_modified(key, snapshot.last_modified)
+        except Exception:
+            json, last_modified = None, snapshot.last_modified
+
+        if json is None or last_modified is None or last_modified == snapshot.last_modified:
+            self._push(self._retry_time(), key)
+            return
+
+        published = convert_to_datetime(last_modified).replace(tzinfo=datetime.timezone.utc)
+        self._learn_interval(snapshot, published.timestamp())
+        snapshot.last_modified = last_modified
+        self._push(self._next_poll_time(snapshot), key)
+
+        result = self.callback(key, json, published)
+        if inspect.isawaitable(result):
+            await result
+
+    def _learn_interval(self, snapshot: _Snapshot, published: float) -> None:
+        if snapshot.published is not None and published > snapshot.published:
+            interval = published - snapshot.published
+            if snapshot.intervals_seen == 0:
+                snapshot.interval = interval
+            else:
+                # Weighted average so a single late snapshot only shifts it slightly.
+                snapshot.interval = 0.7 * snapshot.interval + 0.3 * interval
+            snapshot.intervals_seen += 1
+        snapshot.published = published
+
+    def _next_poll_time(self, snapshot: _Snapshot) -> float:
+        expected = snapshot.published + snapshot.interval + self.publish_delay
+        return max(expected, time.time()) + random.uniform(0, self.jitter)
+
+    def _retry_time(self) -> float:
+        return time.time() + self.retry_interval + random.uniform(0, self.jitter)
@@ -0,0 +1,117 @@
+"""This module contains the CrossRealmPriceIndex which answers where an item is cheapest.
+
+The index keeps each item's lowest price on every connected realm in a
+list sorted by price. When a realm's new snapshot arrives only the items
+whose lowest price or quantity changed are updated.
+
+Typical usage example:
+
+index = CrossRealmPriceIndex()
+index.update_realm(4, await us_api.get_auctions(4))
+index.update_realm(5, await us_api.get_auctions(5))
+index.cheapest(190320, 3) # [(connected_realm_id, price, quantity), ...]
+"""
+import bisect
+
+from getwowdataasync.auctions import AuctionSnapshot, auction_price
+
+
+class CrossRealmPriceIndex:
+    """An in memory index of item id to each connected realm's lowest price."""
+
+    def __init__(self):
+        # item id -> [(lowest price, connected realm id, quantity), ...] sorted by price
+        self._listings = {}
+        # connected realm id -> {item id: (lowest price, quantity)}
+        self._realm_prices = {}
+
+    def update_realm(self, connected_realm_id: int, auctions) -> int:
+        """Replaces a connected realm's prices with those from a new snapshot.
+
+        Args:
+            connected_realm_id (int): The snapshot's connected realm.
+            auctions: The json from get_auctions() or an AuctionSnapshot.
+
+        Returns:
+            How many items' entries changed.
+        """
+        new_prices = _lowest_prices(auctions)
+        old_prices = self._realm_prices.get(connected_realm_id, {})
+        changed = 0
+        for item_id, old_price in old_prices.items():
+            if new_prices.get(item_id) != old_price:
+                self._remove(item_id, connected_realm_id, old_price)
+                changed += 1
+        for item_id, new_price in new_prices.items():
+            old_price = old_prices.get(item_id)
+            if old_price != new_price:
+                self._insert(item_id, connected_realm_id, new_price)
+                if old_price is None:
+                    changed += 1
+        self._realm_prices[connected_realm_id] = new_prices
+        return changed
+
+    def remove_realm(self, connected_realm_id: int) -> None:
+        """Removes every entry of a connected realm."""
+        for item_id, price in self._realm_prices.pop(connected_realm_id, {}).items():
+            self._remove(item_id, connected_realm_id, price)
+
+    def cheapest(self, item_id: int, k: int = 1) -> list:
+        """Returns the k connected realms with the lowest price for an item.
+
+        Returns:
+            A list of (connected_realm_id, lowest price, quantity listed)
+            from cheapest to most expensive.
+        """
+        return [
+            (realm_id, price, quantity)
+            for price, realm_id, quantity in self._listings.get(item_id, [])[:k]
+        ]
+
+    def most_expensive(self, item_id: int, k: int = 1) -> list:
+        """Returns the k connected realms where an item's lowest price is highest.
+
+        Returns:
+            A list of (connected_realm_id, lowest price, quantity listed)
+            from most expensive to cheapest.
+        """
+        listings = self._listings.get(item_id, [])
+        return [
+            (realm_id, price, quantity)
+            for price, realm_id, quantity in reversed(listings[max(len(listings) - k, 0):])
+        ]
+
+    def realm_price(self, item_id: int, connected_realm_id: int):
+        """Returns (lowest price, quantity listed) of an item on a connected realm or None."""
+        return self._realm_prices.get(connected_realm_id, {}).get(item_id)
+
+    def _insert(self, item_id: int, connected_realm_id: int, price: tuple) -> None:
+        lowest_price, quantity = price
+        bisect.insort(self._listings.setdefault(item_id, []), (lowest_price, connected_realm_id, quantity))
+
+    def _remove(self, item_id: int, connected_realm_id: int, price: tuple) -> None:
+        lowest_price, quantity = price
+        listings = self._listings[item_id]
+        entry = (lowest_price, connected_realm_id, quantity)
+        del listings[bisect.bisect_left(listings, entry)]
+        if not listings:
+            del self._listings[item_id]
+
+
+def _lowest_prices(auctions) -> dict:
+    """Returns {item id: (lowest price, total quantity)} of a snapshot."""
+    prices = {}
+    if isinstance(auctions, AuctionSnapshot):
+        rows = zip(auctions.item_ids, auctions.prices, auctions.quantities)
+    else:
+        rows = (
+            (auction["item"]["id"], auction_price(auction), auction["quantity"])
+            for auction in auctions["auctions"]
+        )
+    for item_id, price, quantity in rows:
+        current = prices.get(item_id)
+        if current is None:
+            prices[item_id] = (price, quantity)
+        else:
+            prices[item_id] = (min(current[0], price), current[1] + quantity)
+    return prices
@@ -0,0 +1,107 @@
+"""This module contains the ProgressReporter which reports how far bulk operations are.
+
+Bulk operations count their progress as they go and the reporter passes
+a ProgressEvent to your callback at most once per interval, plus once
+when the operation finishes. Without a callback nothing is reported.
+
+Typical usage example:
+
+def show(event):
+    print(f"{event.operation}: {event.done} done, {event.rate:.0f}/s, eta {event.eta}")
+
+us_api = await WowApi.create('us', progress=ProgressReporter(show, interval=5))
+items = await us_api.get_all_items()
+"""
+import collections
+import time
+
+ProgressEvent = collections.namedtuple(
+    "ProgressEvent", ["operation", "done", "total", "rate", "eta", "finished"]
+)
+ProgressEvent.__doc__ = """How far a bulk operation is.
+
+operation is the method's name and done how many elements it has gathered.
+total is how many it will gather and eta the seconds it still needs, both
+None when unknown. rate is elements per second since it started.
+"""
+
+
+class ProgressReporter:
+    """Passes aggregated progress of bulk operations to a callback."""
+
+    def __init__(self, callback=None, interval: float = 1.0):
+        """
+        Args:
+            callback (callable): Optional. Called with a ProgressEvent. It
+                runs in the event loop so it should return quickly.
+            interval (float): Least seconds between an operation's events.
+        """
+        self.callback = callback
+        self.interval = interval
+
+    def track(self, operation: str, total: int = None) -> "Progress":
+        """Returns a Progress that a bulk operation counts its elements with."""
+        if self.callback is None:
+            return _no_progress
+        return Progress(self, operation, total)
+
+
+class Progress:
+    """A single bulk operation's progress. Made with ProgressReporter.track()."""
+
+    def __init__(self, reporter: ProgressReporter, operation: str, total: int = None):
+        self.reporter = reporter
+        self.operation = operation
+        self.total = total
+        self.done = 0
+        self.fraction_done = None
+        self._started_at = time.monotonic()
+        self._reported_at = self._started_at
+
+    def advance(self, elements: int = 1) -> None:
+        """Counts finished elements and reports if interval has passed since the last event."""
+        self.done += elements
+        now = time.monotonic()
+        if now - self._reported_at >= self.reporter.interval:
+            self._reported_at = now
+            self._report(now, finished=False)
+
+    def update(self, fraction_done: float) -> None:
+        """Records how much of the operation is done when its total isn't known.
+
+        Ex: a crawl by item id knows how far through the ids it is.
+        """
+        self.fraction_done = fraction_done
+
+    def finish(self) -> None:
+        """Reports the operation's final event."""
+        self._report(time.monotonic(), finished=True)
+
+    def _report(self, now: float, finished: bool) -> None:
+        elapsed = now - self._started_at
+        rate = self.done / elapsed if elapsed > 0 else 0
+        fraction_done = self.fraction_done
+        if self.total:
+            fraction_done = self.done / self.total
+        eta = None
+        if finished:
+            eta = 0
+        elif fraction_done:
+            eta = elapsed * (1 - fraction_done) / fraction_done
+        self.reporter.callback(ProgressEvent(self.operation, self.done, self.total, rate, eta, finished))
+
+
+class _NoProgress:
+    """Stands in for Progress when there is no callback so counting costs nothing."""
+
+    def advance(self, elements: int = 1) -> None:
+        pass
+
+    def update(self, fraction_done: float) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+_no_progress = _NoProgress()
@@ -0,0 +1,354 @@
+"""This module contains the RateLimiter which keeps requests under Blizzard's limits.
+
+Blizzard allows each client 100 requests per second and 36,000 requests
+per hour. Going over either returns 429 Too Many Requests.
+
+Typical usage example:
+
+limiter = RateLimiter()
+us_api = await WowApi.create('us', rate_limiter=limiter)
+eu_api = await WowApi.create('eu', rate_limiter=limiter) # shares the same budget
+
+# Every process on the host shares the budget kept in the file
+limiter = SQLiteRateLimiter('/tmp/wow_api_requests.sqlite')
+
+# Crawls may only use 90% of the hourly budget
+planner = QuotaPlanner(RateLimiter(), reserve=0.1)
+us_api = await WowApi.create('us', rate_limiter=planner)
+
+# Jumps ahead of every waiting bulk and normal request
+with request_priority(HIGH):
+    item = await us_api.get_item_by_id(19019)
+"""
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import heapq
+import itertools
+import sqlite3
+import time
+
+HIGH = 0
+NORMAL = 1
+BULK = 2
+
+_priority = contextvars.ContextVar("priority", default=NORMAL)
+
+
+@contextlib.contextmanager
+def request_priority(priority: int):
+    """Sets the priority of every request made inside the with block (and tasks started in it).
+
+    Waiting requests are let through lowest priority number first so HIGH
+    requests go ahead of NORMAL ones which go ahead of BULK ones.
+
+    Args:
+        priority (int): HIGH, NORMAL (the default) or BULK.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def bulk_requests():
+    """Marks every request made inside the with block (and tasks started in it) as bulk.
+
+    Bulk requests wait behind all other requests and a QuotaPlanner keeps
+    part of the hourly budget away from them.
+    """
+    return request_priority(BULK)
+
+
+def bulk(func):
+    """Decorates an async function so every request it makes is a bulk request."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with bulk_requests():
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+class _PriorityLock:
+    """An asyncio lock that is handed to waiters by request priority, then arrival order."""
+
+    def __init__(self):
+        self._locked = False
+        self._waiters = []
+        self._arrivals = itertools.count()
+
+    async def __aenter__(self):
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (_priority.get(), next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Cancelled after being handed the lock so pass it on.
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._release()
+
+    def _release(self) -> None:
+        # The lock stays locked when it is handed straight to the next waiter.
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._locked = False
+
+
+class RateLimiter:
+    """Delays requests so no more than the limit are made in any window.
+
+    Each window (1 second, 1 hour) remembers when its recent requests were
+    made so the limits hold over any rolling second or hour, not just
+    over fixed clock periods. Waiting requests are let through by their
+    request_priority() so interactive calls don't queue behind a crawl.
+    """
+
+    def __init__(self, per_second: int = 100, per_hour: int = 36000, parent: "RateLimiter" = None):
+        """
+        Args:
+            per_second (int): Most requests allowed in any one second.
+            per_hour (int): Most requests allowed in any one hour.
+            parent (RateLimiter): Optional. A budget shared with other
+                limiters that every request also has to fit in. Ex: one
+                limiter per region with a parent for the whole client.
+        """
+        self.per_second = per_second
+        self.per_hour = per_hour
+        self.parent = parent
+        self._windows = [
+            (per_second, 1, collections.deque()),
+            (per_hour, 3600, collections.deque()),
+        ]
+        self._lock = _PriorityLock()
+
+    async def acquire(self) -> None:
+        """Waits until a request can be made without going over a limit then counts it."""
+        async with self._lock:
+            delay = self._delay(time.monotonic())
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._delay(time.monotonic())
+            self._record(time.monotonic())
+        if self.parent:
+            await self.parent.acquire()
+
+    async def used_this_hour(self) -> int:
+        """Returns how many requests were made in the last hour."""
+        self._delay(time.monotonic())
+        return len(self._windows[1][2])
+
+    async def hour_delay(self, limit: int) -> float:
+        """Returns how long until fewer than limit requests were made in the last hour."""
+        timestamps = self._windows[1][2]
+        self._delay(time.monotonic())
+        if len(timestamps) < limit:
+            return 0
+        return timestamps[len(timestamps) - limit] + 3600 - time.monotonic()
+
+    def _delay(self, now: float) -> float:
+        """Returns how long until every window has room for one more request."""
+        delay = 0
+        for limit, period, timestamps in self._windows:
+            while timestamps and timestamps[0] <= now - period:
+                timestamps.popleft()
+            if len(timestamps) >= limit:
+                delay = max(delay, timestamps[0] + period - now)
+        return delay
+
+    def _record(self, now: float) -> None:
+        for _, _, timestamps in self._windows:
+            timestamps.append(now)
+
+
+class SQLiteRateLimiter:
+    """A RateLimiter whose request history is kept in a SQLite database.
+
+    Every process using the same database file shares one budget, so
+    several workers with the same client id together stay under the
+    limits without each being capped to a fraction of them. The check
+    and the count happen in one write transaction which SQLite only lets
+    one process hold at a time.
+    """
+
+    def __init__(self, path: str, per_second: int = 100, per_hour: int = 36000):
+        """
+        Args:
+            path (str): The database file shared by every process. Created if missing.
+            per_second (int): Most requests allowed in any one second.
+            per_hour (int): Most requests allowed in any one hour.
+        """
+        self.path = path
+        self.per_second = per_second
+        self.per_hour = per_hour
+        self._windows = [(per_second, 1), (per_hour, 3600)]
+        self._lock = _PriorityLock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS requests (made_at REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS requests_made_at ON requests (made_at)")
+
+    async def acquire(self) -> None:
+        """Waits until a request can be made without going over a limit then counts it."""
+        async with self._lock:
+            # SQLite blocks while another process holds the lock so it
+            # runs in a thread instead of the event loop.
+            delay = await asyncio.to_thread(self._try_acquire)
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = await asyncio.to_thread(self._try_acquire)
+
+    def _try_acquire(self) -> float:
+        """Counts a request and returns 0 or returns how long to wait before trying again."""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            connection.execute("DELETE FROM requests WHERE made_at <= ?", (now - 3600,))
+            delay = 0
+            for limit, period in self._windows:
+                # The limit-th newest request in the window, if there is one, is
+                # the one that has to leave the window before another is allowed.
+                row = connection.execute(
+                    "SELECT made_at FROM requests WHERE made_at > ? ORDER BY made_at DESC LIMIT 1 OFFSET ?",
+                    (now - period, limit - 1),
+                ).fetchone()
+                if row:
+                    delay = max(delay, row[0] + period - now)
+            if delay <= 0:
+                connection.execute("INSERT INTO requests VALUES (?)", (now,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return delay
+
+    async def used_this_hour(self) -> int:
+        """Returns how many requests every process made in the last hour."""
+        async with self._lock:
+            return await asyncio.to_thread(self._count_since, time.time() - 3600)
+
+    async def hour_delay(self, limit: int) -> float:
+        """Returns how long until fewer than limit requests were made in the last hour."""
+        async with self._lock:
+            return await asyncio.to_thread(self._hour_delay, limit)
+
+    def _count_since(self, since: float) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM requests WHERE made_at > ?", (since,)).fetchone()[0]
+
+    def _hour_delay(self, limit: int) -> float:
+        now = time.time()
+        row = self._connection.execute(
+            "SELECT made_at FROM requests WHERE made_at > ? ORDER BY made_at DESC LIMIT 1 OFFSET ?",
+            (now - 3600, limit - 1),
+        ).fetchone()
+        return max(row[0] + 3600 - now, 0) if row else 0
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+class QuotaPlanner:
+    """Paces bulk requests so they never use the part of the hourly budget kept for other calls.
+
+    Wraps a RateLimiter (or SQLiteRateLimiter) and is used in its place.
+    Requests made inside bulk_requests() may only use the hourly budget
+    minus the reserve, other requests may use all of it. Crawls tell the
+    planner how far along they are so it can estimate how many requests
+    and how long they still need.
+    """
+
+    def __init__(self, rate_limiter=None, reserve: float = 0.1):
+        """
+        Args:
+            rate_limiter (RateLimiter): Optional. The limiter every request
+                still waits on. Defaults to a new RateLimiter.
+            reserve (float): The fraction of the hourly budget bulk
+                requests can't use.
+        """
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.per_second = self.rate_limiter.per_second
+        self.per_hour = self.rate_limiter.per_hour
+        self.reserve = reserve
+        self.bulk_requests_made = 0
+        self.crawls = []
+        self._bulk_lock = asyncio.Lock()
+
+    @property
+    def bulk_budget(self) -> int:
+        """How many bulk requests are allowed in any one hour."""
+        return int(self.per_hour * (1 - self.reserve))
+
+    async def acquire(self) -> None:
+        """Waits until a request can be made without going over a limit then counts it."""
+        if _priority.get() < BULK:
+            await self.rate_limiter.acquire()
+            return
+
+        async with self._bulk_lock:
+            delay = await self.rate_limiter.hour_delay(self.bulk_budget)
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = await self.rate_limiter.hour_delay(self.bulk_budget)
+            await self.rate_limiter.acquire()
+            self.bulk_requests_made += 1
+
+    def start_crawl(self) -> "Crawl":
+        """Returns a Crawl that estimates its remaining requests from its progress."""
+        crawl = Crawl(self)
+        self.crawls.append(crawl)
+        return crawl
+
+    async def estimate(self) -> dict:
+        """Estimates the requests and time every running crawl still needs.
+
+        Returns:
+            A dict with remaining_requests and seconds. seconds assumes
+            the crawls get the whole bulk budget.
+        """
+        remaining_requests = sum(crawl.remaining_requests() for crawl in self.crawls)
+        available_this_hour = max(self.bulk_budget - await self.rate_limiter.used_this_hour(), 0)
+        seconds = remaining_requests / self.per_second
+        if remaining_requests > available_this_hour:
+            seconds = max(seconds, (remaining_requests - available_this_hour) / self.bulk_budget * 3600)
+        return {"remaining_requests": round(remaining_requests), "seconds": seconds}
+
+
+class Crawl:
+    """A crawl's progress. Made with QuotaPlanner.start_crawl()."""
+
+    def __init__(self, planner: QuotaPlanner):
+        self.planner = planner
+        self.fraction_done = 0
+        self._requests_at_start = planner.bulk_requests_made
+
+    def update(self, fraction_done: float) -> None:
+        """Records how much of the crawl is done. Ex: 0.25 when a quarter of the ids are crawled."""
+        self.fraction_done = min(max(fraction_done, 0), 1)
+
+    def requests_made(self) -> int:
+        return self.planner.bulk_requests_made - self._requests_at_start
+
+    def remaining_requests(self) -> float:
+        """Estimates the remaining requests assuming the rest costs as much per fraction as so far."""
+        if not self.fraction_done:
+            return 0
+        return self.requests_made() * (1 - self.fraction_done) / self.fraction_done
+
+    def finish(self) -> None:
+        """Stops counting the crawl in the planner's estimates."""
+        if self in self.planner.crawls:
+            self.planner.crawls.remove(self)
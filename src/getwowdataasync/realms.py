@@ -0,0 +1,170 @@
+"""This module contains the RealmIndex which finds a realm's connected realm id without a request.
+
+The index is built once per region from a connected realm search (a few
+requests, since search results carry realm names in every locale) and
+refreshed later by comparing it with the connected realm index, so only
+connected realms that were added, and the realms of those that were
+removed, need to be requested. With a path the
+index is kept in a json file between runs.
+
+Typical usage example:
+
+index = RealmIndex("realms.json")
+if "us" not in index:
+    await index.build(us_api)
+index.connected_realm_id("Area 52")   # by name in any locale
+index.connected_realm_id("area-52")   # by slug
+index.connected_realm_id(3676)        # by realm id
+await index.refresh(us_api)           # picks up new connected realms
+"""
+import json
+import os
+
+from getwowdataasync.helpers import get_id_from_url
+
+
+class RealmIndex:
+    """A per region lookup of realm names, slugs and ids to connected realm ids."""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Optional. A json file to persist the index in.
+        """
+        self.path = path
+        # region -> realm id -> {"slug", "names": {locale: name}, "connected_realm_id"}
+        self.realms = {}
+        self._keys = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for region, realms in json.load(file).items():
+                    self.realms[region] = {int(realm_id): realm for realm_id, realm in realms.items()}
+                    self._index_region(region)
+
+    def __contains__(self, region: str) -> bool:
+        return region in self.realms
+
+    def connected_realm_id(self, realm, region: str = "us") -> int:
+        """Returns the connected realm id of a realm.
+
+        Args:
+            realm (str or int): The realm's name in any locale, its slug or its id.
+            region (str): The realm's region.
+
+        Raises:
+            KeyError: The realm isn't in the index.
+        """
+        return self.realm(realm, region)["connected_realm_id"]
+
+    def realm(self, realm, region: str = "us") -> dict:
+        """Returns a realm's entry: its slug, names by locale and connected_realm_id.
+
+        Args:
+            realm (str or int): The realm's name in any locale, its slug or its id.
+            region (str): The realm's region.
+
+        Raises:
+            KeyError: The realm isn't in the index.
+        """
+        realms = self.realms.get(region, {})
+        if isinstance(realm, int):
+            return realms[realm]
+        return realms[self._keys[region][_normalize(realm)]]
+
+    def connected_realm_ids(self, region: str = "us") -> set:
+        """Returns every connected realm id in a region."""
+        return {realm["connected_realm_id"] for realm in self.realms.get(region, {}).values()}
+
+    async def build(self, api) -> None:
+        """Replaces the api's region in the index with every connected realm from a search.
+
+        Args:
+            api (WowApi): The region's WowApi.
+        """
+        realms = {}
+        page = 1
+        while True:
+            results = await api.connected_realm_search({"orderby": "id", "_pageSize": 1000, "_page": page})
+            for result in results["results"]:
+                self._add_connected_realm(realms, result["data"], api.locale)
+            if page >= results.get("pageCount", 1):
+                break
+            page += 1
+        self.realms[api.region] = realms
+        self._index_region(api.region)
+        self.save()
+
+    async def refresh(self, api) -> tuple:
+        """Adds connected realms the index is missing and removes ones that no longer exist.
+
+        The realms of a removed connected realm are searched for again since
+        they are usually merged into another, possibly existing, one. Builds the region's index if it has none yet.
+
+        Args:
+            api (WowApi): The region's WowApi.
+
+        Returns:
+            (added, removed). Sets of connected realm ids.
+        """
+        if api.region not in self.realms:
+            await self.build(api)
+            return self.connected_realm_ids(api.region), set()
+
+        index = await api.get_connected_realm_index()
+        current_ids = {int(get_id_from_url(realm["href"])) for realm in index["connected_realms"]}
+        known_ids = self.connected_realm_ids(api.region)
+        added = current_ids - known_ids
+        removed = known_ids - current_ids
+
+        realms = self.realms[api.region]
+        orphaned_realm_ids = sorted(
+            realm_id for realm_id, realm in realms.items() if realm["connected_realm_id"] in removed
+        )
+        for realm_id in orphaned_realm_ids:
+            del realms[realm_id]
+        for connected_realm_id in sorted(added):
+            results = await api.connected_realm_search({"id": connected_realm_id})
+            for result in results["results"]:
+                self._add_connected_realm(realms, result["data"], api.locale)
+        for realm_id in orphaned_realm_ids:
+            if realm_id in realms:  # merged into an added connected realm
+                continue
+            results = await api.connected_realm_search({"realms.id": realm_id})
+            for result in results["results"]:
+                self._add_connected_realm(realms, result["data"], api.locale)
+        if added or removed:
+            self._index_region(api.region)
+            self.save()
+        return added, removed
+
+    def save(self) -> None:
+        """Writes the index to its path, if it has one."""
+        if not self.path:
+            return
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(self.realms, file, ensure_ascii=False)
+
+    @staticmethod
+    def _add_connected_realm(realms: dict, connected_realm: dict, locale: str) -> None:
+        for realm in connected_realm["realms"]:
+            names = realm["name"]
+            if not isinstance(names, dict):
+                names = {locale: names}
+            realms[realm["id"]] = {
+                "slug": realm["slug"],
+                "names": names,
+                "connected_realm_id": connected_realm["id"],
+            }
+
+    def _index_region(self, region: str) -> None:
+        keys = {}
+        for realm_id, realm in self.realms[region].items():
+            for name in realm["names"].values():
+                if name:
+                    keys[_normalize(name)] = realm_id
+            keys[_normalize(realm["slug"])] = realm_id
+        self._keys[region] = keys
+
+
+def _normalize(name: str) -> str:
+    return name.strip().casefold()
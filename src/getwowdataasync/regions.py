@@ -0,0 +1,114 @@
+"""This module contains the RegionPool which manages a WowApi for every region.
+
+Every WowApi in the pool shares one access token, one httpx client
+(and its connection pool) and one rate limit budget since Blizzard counts
+requests per client, not per region.
+
+Typical usage example:
+
+pool = await RegionPool.create(['us', 'eu', 'kr', 'tw'])
+wow_token_prices = await pool.fan_out('get_wow_token')
+# {'us': {...}, 'eu': {...}, 'kr': {...}, 'tw': {...}}
+await pool.close()
+"""
+import asyncio
+
+import httpx
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.ratelimit import RateLimiter
+
+
+class RegionPool:
+    """A WowApi per region that share a client, access token and rate limit.
+
+    Instantiate with RegionPool.create(). Use pool['us'] to get a single
+    region's WowApi or fan_out() to make the same call in every region.
+    Close the pool, not its WowApi's, since they share one client.
+    """
+
+    @classmethod
+    async def create(
+        cls,
+        regions: list = ("us", "eu", "kr", "tw"),
+        locale: str = "en_US",
+        wow_api_id: str = None,
+        wow_api_secret: str = None,
+        rate_limiter: RateLimiter = None,
+        region_rate_limits: dict = None,
+        **wow_api_options,
+    ):
+        """Gets a RegionPool with a WowApi for each region.
+
+        Args:
+            regions (list): The regions to create a WowApi for.
+            locale (str): The language some elements will return.
+            wow_api_id (str): Your api client id from blizzards api website
+            wow_api_secret (str): Your api client secret from blizzards api website
+            rate_limiter (RateLimiter): Optional. The budget every region
+                shares. Defaults to Blizzard's limits of 100/s and 36,000/h.
+            region_rate_limits (dict): Optional. Region to (per_second, per_hour)
+                caps so one region can't use the whole shared budget.
+            **wow_api_options: Passed to every WowApi.create(). Ex: interner.
+
+        Returns:
+            An instance of RegionPool.
+        """
+        self = RegionPool()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.client = httpx.AsyncClient(timeout=30)
+        self.apis = {}
+        region_rate_limits = region_rate_limits or {}
+
+        access_token = None
+        for region in regions:
+            if region in region_rate_limits:
+                per_second, per_hour = region_rate_limits[region]
+                region_rate_limiter = RateLimiter(per_second, per_hour, parent=self.rate_limiter)
+            else:
+                region_rate_limiter = self.rate_limiter
+            api = await WowApi.create(
+                region,
+                locale,
+                wow_api_id,
+                wow_api_secret,
+                rate_limiter=region_rate_limiter,
+                client=self.client,
+                access_token=access_token,
+                **wow_api_options,
+            )
+            access_token = api.access_token
+            self.apis[region] = api
+        return self
+
+    def __getitem__(self, region: str) -> WowApi:
+        return self.apis[region]
+
+    async def fan_out(self, method, *args, **kwargs) -> dict:
+        """Makes the same call in every region at once.
+
+        Args:
+            method (str or callable): The name of a WowApi method
+                (Ex: 'get_commodities') or an async function that takes
+                a WowApi. Ex: lambda api: api.get_auctions(ids[api.region])
+            *args: Passed to the method when method is a name.
+            **kwargs: Passed to the method when method is a name.
+
+        Returns:
+            A dict of region to that region's result. If a region's call
+            failed its value is the exception raised.
+        """
+        async def call(api):
+            try:
+                if callable(method):
+                    return await method(api)
+                return await getattr(api, method)(*args, **kwargs)
+            except Exception as e:
+                return e
+
+        results = await asyncio.gather(*(call(api) for api in self.apis.values()))
+        return dict(zip(self.apis, results))
+
+    async def close(self):
+        """Closes the shared httpx client."""
+        await self.client.aclose()
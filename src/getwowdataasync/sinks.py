@@ -0,0 +1,228 @@
+"""This module contains sinks that crawls write their results to instead of a list.
+
+A crawl given a sink passes each page of results through a small queue
+to the sink and keeps nothing itself, so memory stays the same however
+many items are crawled. When the sink falls behind the queue fills and
+the crawl waits before fetching more.
+
+Typical usage example:
+
+with NDJSONSink('items.ndjson') as sink:
+    await us_api.get_all_items(sink=sink)
+print(f"{sink.written} items written")
+
+with CSVSink('items.csv') as sink:
+    await us_api.get_all_items(sink=sink)
+
+with SQLiteSink('wow.sqlite', table='items') as sink:
+    await us_api.get_all_items(sink=sink)
+
+await us_api.get_all_realms(sink=CallbackSink(lambda realms: print(len(realms))))
+"""
+import asyncio
+import csv
+import inspect
+import json
+import os
+import sqlite3
+
+
+class NDJSONSink:
+    """Writes each element as a line of json to a file."""
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        Args:
+            path (str): The file to write. Created if missing.
+            append (bool): Add to the file instead of replacing it.
+        """
+        self.path = path
+        self.written = 0
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    async def write(self, elements: list) -> None:
+        self._file.write("".join(json.dumps(element, ensure_ascii=False) + "\n" for element in elements))
+        self.written += len(elements)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVSink:
+    """Writes each element as a row of a csv file.
+
+    Nested dicts are flattened into dotted columns (item.id) and lists are
+    written as json. The columns are those of the first batch written, or
+    the existing header's when appending to a file that has one. Fields
+    that aren't one of those columns are left out of the row and columns an
+    element lacks are left empty.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        Args:
+            path (str): The file to write. Created if missing.
+            append (bool): Add to the file instead of replacing it. Rows
+                use the file's header, which isn't written again, when it
+                has one.
+        """
+        self.path = path
+        self.written = 0
+        self.columns = None
+        if append and os.path.exists(path):
+            with open(path, encoding="utf-8", newline="") as file:
+                self.columns = next(csv.reader(file), None)
+        self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._writer = None
+
+    async def write(self, elements: list) -> None:
+        rows = [_flatten(element) for element in elements if element]
+        if not rows:
+            return
+        if self._writer is None:
+            has_header = self.columns is not None
+            if not has_header:
+                self.columns = list(dict.fromkeys(column for row in rows for column in row))
+            self._writer = csv.DictWriter(self._file, self.columns, extrasaction="ignore")
+            if not has_header:
+                self._writer.writeheader()
+        self._writer.writerows(rows)
+        self.written += len(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _flatten(element: dict, prefix: str = "") -> dict:
+    """Returns element with nested dicts flattened into dotted keys and lists as json strings."""
+    row = {}
+    for key, value in element.items():
+        if isinstance(value, dict):
+            row.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, list):
+            row[prefix + key] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[prefix + key] = value
+    return row
+
+
+class SQLiteSink:
+    """Writes each element's json to a SQLite table keyed by its id.
+
+    The table has an id INTEGER PRIMARY KEY and a json TEXT column. An
+    element written again replaces the earlier one.
+    """
+
+    def __init__(self, path: str, table: str = "elements"):
+        """
+        Args:
+            path (str): The database file. Created if missing.
+            table (str): The table to write to. Created if missing.
+        """
+        self.path = path
+        self.table = table
+        self.written = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY, json TEXT)')
+        self._connection.commit()
+
+    async def write(self, elements: list) -> None:
+        rows = [(element["id"], json.dumps(element, ensure_ascii=False)) for element in elements if element]
+        # Runs in a thread so the crawl keeps fetching while SQLite writes.
+        await asyncio.to_thread(self._write_rows, rows)
+        self.written += len(rows)
+
+    def _write_rows(self, rows: list) -> None:
+        with self._connection:
+            self._connection.executemany(f'INSERT OR REPLACE INTO "{self.table}" VALUES (?, ?)', rows)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CallbackSink:
+    """Passes each batch of elements to a function or async function."""
+
+    def __init__(self, callback):
+        """
+        Args:
+            callback (callable): Called with a list of elements. The crawl
+                waits for it if it returns an awaitable.
+        """
+        self.callback = callback
+        self.written = 0
+
+    async def write(self, elements: list) -> None:
+        result = self.callback(elements)
+        if inspect.isawaitable(result):
+            await result
+        self.written += len(elements)
+
+    def close(self) -> None:
+        pass
+
+
+class SinkWriter:
+    """Moves batches from a crawl to a sink through a bounded queue.
+
+    write() only waits when max_pending batches are already waiting for
+    the sink, which is what pauses the crawl when the sink falls behind.
+    """
+
+    def __init__(self, sink, max_pending: int = 4):
+        """
+        Args:
+            sink: Anything with an async write(elements) method.
+            max_pending (int): Batches that may wait for the sink.
+        """
+        self.sink = sink
+        self._queue = asyncio.Queue(max_pending)
+        self._writer = asyncio.ensure_future(self._write_batches())
+
+    async def write(self, elements: list) -> None:
+        """Queues a batch, waiting while the queue is full.
+
+        Raises:
+            Exception: Whatever the sink raised if it failed.
+        """
+        put = asyncio.ensure_future(self._queue.put(elements))
+        await asyncio.wait({put, self._writer}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+        if self._writer.done():
+            self._writer.result()
+
+    async def close(self) -> None:
+        """Waits until every queued batch is written.
+
+        Raises:
+            Exception: Whatever the sink raised if it failed.
+        """
+        if not self._writer.done():
+            await self._queue.put(None)
+        await self._writer
+
+    async def _write_batches(self) -> None:
+        while True:
+            elements = await self._queue.get()
+            if elements is None:
+                return
+            await self.sink.write(elements)
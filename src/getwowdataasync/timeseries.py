@@ -0,0 +1,152 @@
+"""This module contains the CommodityPriceSeries which keeps price history of every commodity.
+
+Each commodities snapshot is reduced to a few numbers per item (lowest
+price, a percentile price and how many were listed). Old points are
+rolled up into daily then weekly buckets so memory use and query time stay
+bounded however long the series runs.
+
+Typical usage example:
+
+series = CommodityPriceSeries()
+commodities, last_modified = await us_api.get_commodities_if_modified()
+series.ingest(commodities, convert_to_datetime(last_modified).timestamp())
+for point in series.series(190320):
+    print(point.timestamp, as_gold(point.min_price))
+"""
+import collections
+
+DAY = 86400
+WEEK = 7 * DAY
+# 1970-01-01 was a Thursday, weeks start on Monday.
+_FIRST_MONDAY = 4 * DAY
+
+PricePoint = collections.namedtuple(
+    "PricePoint", ["timestamp", "period", "min_price", "percentile_price", "volume"]
+)
+PricePoint.__doc__ = """A price summary of one item over a period.
+
+timestamp is the start of the period and period is its length in
+seconds (0 for a single snapshot). volume is the average quantity listed.
+"""
+
+
+class CommodityPriceSeries:
+    """Per item price series built from commodities snapshots.
+
+    Points are kept at three resolutions. Single snapshots are kept for
+    raw_retention seconds, daily buckets for daily_retention seconds and
+    weekly buckets after that.
+    """
+
+    def __init__(self, percentile: float = 0.1, raw_retention: float = 2 * DAY, daily_retention: float = 60 * DAY):
+        """
+        Args:
+            percentile (float): Which price to record as percentile_price.
+                0.1 is the price the cheapest 10% of listed quantity is under.
+            raw_retention (float): Seconds to keep every snapshot's point.
+            daily_retention (float): Seconds to keep daily buckets before
+                rolling them into weekly buckets.
+        """
+        self.percentile = percentile
+        self.raw_retention = raw_retention
+        self.daily_retention = daily_retention
+        # item id -> list of [start, min price, percentile price * volume, volume, snapshots]
+        self._raw = {}
+        self._daily = {}
+        self._weekly = {}
+
+    def ingest(self, commodities_json: dict, timestamp: float) -> None:
+        """Adds a commodities snapshot to the series and rolls up old points.
+
+        Args:
+            commodities_json (dict): The json from get_commodities().
+            timestamp (float): When the snapshot was published in seconds
+                since epoch. Snapshots must be ingested in order.
+        """
+        listings = {}
+        for auction in commodities_json["auctions"]:
+            listings.setdefault(auction["item"]["id"], []).append((auction["unit_price"], auction["quantity"]))
+
+        for item_id, item_listings in listings.items():
+            item_listings.sort()
+            volume = sum(quantity for _, quantity in item_listings)
+            percentile_price = _percentile_price(item_listings, volume * self.percentile)
+            point = [timestamp, item_listings[0][0], percentile_price * volume, volume, 1]
+            self._raw.setdefault(item_id, []).append(point)
+
+        self.roll_up(timestamp)
+
+    def roll_up(self, now: float) -> None:
+        """Moves points older than their retention into the next coarser buckets."""
+        _roll_up(self._raw, self._daily, now - self.raw_retention, _day_start)
+        _roll_up(self._daily, self._weekly, now - self.daily_retention, _week_start)
+
+    def series(self, item_id: int, start: float = None, end: float = None) -> list:
+        """Returns an item's price points from oldest to newest.
+
+        Args:
+            item_id (int): The commodity's item id.
+            start (float): Optional. Only points starting at or after this timestamp.
+            end (float): Optional. Only points starting at or before this timestamp.
+
+        Returns:
+            A list of PricePoint's. Older points cover longer periods.
+        """
+        points = []
+        for buckets, period in ((self._weekly, WEEK), (self._daily, DAY), (self._raw, 0)):
+            for bucket_start, min_price, percentile_sum, volume, snapshots in buckets.get(item_id, []):
+                if (start is not None and bucket_start < start) or (end is not None and bucket_start > end):
+                    continue
+                percentile_price = percentile_sum / volume if volume else min_price
+                points.append(PricePoint(bucket_start, period, min_price, percentile_price, volume / snapshots))
+        return points
+
+    def item_ids(self) -> set:
+        """Returns the ids of every item with at least one point."""
+        return set(self._raw) | set(self._daily) | set(self._weekly)
+
+
+def _percentile_price(sorted_listings: list, quantity: float) -> int:
+    """Returns the price of the listing that the cheapest quantity items reach."""
+    listed = 0
+    for price, listing_quantity in sorted_listings:
+        listed += listing_quantity
+        if listed >= quantity:
+            return price
+    return sorted_listings[-1][0]
+
+
+def _day_start(timestamp: float) -> float:
+    return timestamp // DAY * DAY
+
+
+def _week_start(timestamp: float) -> float:
+    return (timestamp - _FIRST_MONDAY) // WEEK * WEEK + _FIRST_MONDAY
+
+
+def _roll_up(finer: dict, coarser: dict, cutoff: float, bucket_start) -> None:
+    # Points are in time order so only the front of each list can be old
+    # enough and it always belongs in the newest coarser bucket or a new one.
+    for item_id in list(finer):
+        points = finer[item_id]
+        old_points = 0
+        while old_points < len(points) and points[old_points][0] < cutoff:
+            old_points += 1
+        if not old_points:
+            continue
+
+        buckets = coarser.setdefault(item_id, [])
+        for start, min_price, percentile_sum, volume, snapshots in points[:old_points]:
+            start = bucket_start(start)
+            if buckets and buckets[-1][0] == start:
+                bucket = buckets[-1]
+                bucket[1] = min(bucket[1], min_price)
+                bucket[2] += percentile_sum
+                bucket[3] += volume
+                bucket[4] += snapshots
+            else:
+                buckets.append([start, min_price, percentile_sum, volume, snapshots])
+
+        del points[:old_points]
+        if not points:
+            del finer[item_id]
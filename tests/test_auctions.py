@@ -0,0 +1,61 @@
+import unittest
+
+from getwowdataasync.auctions import AuctionSnapshot, diff_snapshots
+
+
+def auction(auction_id, item_id, quantity, unit_price, time_left='LONG'):
+    return {'id': auction_id, 'item': {'id': item_id}, 'quantity': quantity, 'unit_price': unit_price, 'time_left': time_left}
+
+
+class TestAuctionSnapshot(unittest.TestCase):
+    def test_from_json_sorts_by_auction_id(self):
+        snapshot = AuctionSnapshot.from_json({'auctions': [auction(3, 10, 1, 5), auction(1, 11, 2, 6)]})
+
+        self.assertEqual([1, 3], list(snapshot.ids))
+        self.assertEqual([11, 10], list(snapshot.item_ids))
+        self.assertEqual([6, 5], list(snapshot.prices))
+
+    def test_from_json_uses_buyout_when_there_is_no_unit_price(self):
+        snapshot = AuctionSnapshot.from_json(
+            {'auctions': [{'id': 1, 'item': {'id': 10}, 'quantity': 1, 'buyout': 500, 'time_left': 'SHORT'}]}
+        )
+
+        self.assertEqual([500], list(snapshot.prices))
+        self.assertEqual([0], list(snapshot.time_left))
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.old = AuctionSnapshot.from_json({'auctions': [
+            auction(1, 10, 5, 100),
+            auction(2, 10, 5, 100),
+            auction(3, 11, 1, 900, 'SHORT'),
+            auction(4, 12, 20, 50),
+        ]})
+        self.new = AuctionSnapshot.from_json({'auctions': [
+            auction(2, 10, 5, 120),
+            auction(4, 12, 15, 50),
+            auction(5, 13, 1, 10),
+        ]})
+
+    def test_diff_finds_added_removed_and_changed(self):
+        diff = diff_snapshots(self.old, self.new)
+
+        self.assertEqual([2], list(diff.added))
+        self.assertEqual([0, 2], list(diff.removed))
+        self.assertEqual([1, 3], list(diff.changed_old))
+        self.assertEqual([0, 1], list(diff.changed_new))
+
+    def test_estimated_sold_skips_short_auctions_and_counts_partial_sales(self):
+        diff = diff_snapshots(self.old, self.new)
+
+        self.assertEqual({10: 5, 12: 5}, diff.estimated_sold())
+
+    def test_diff_of_identical_snapshots_is_empty(self):
+        diff = diff_snapshots(self.old, self.old)
+
+        self.assertEqual(([], [], []), (list(diff.added), list(diff.removed), list(diff.changed_old)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from getwowdataasync.catalog import ItemCatalog, ItemCatalogWriter, ItemFields
+from getwowdataasync.sinks import SinkWriter
+
+THUNDERFURY = {
+    'id': 19019, 'name': 'Thunderfury, Blessed Blade of the Windseeker', 'quality': {'type': 'LEGENDARY'},
+    'level': 80, 'required_level': 60, 'item_class': {'id': 2}, 'item_subclass': {'id': 7},
+    'purchase_price': 1538560, 'sell_price': 307712, 'max_count': 1, 'is_equippable': True, 'is_stackable': False,
+}
+
+
+class TestItemCatalog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'items.catalog')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, items):
+        with ItemCatalogWriter(self.path) as writer:
+            writer.add(items)
+
+    def test_lookups_by_id(self):
+        self.write([THUNDERFURY, {'id': 25, 'name': {'en_US': 'Worn Shortsword', 'de_DE': 'Abgenutztes Kurzschwert'}}])
+
+        with ItemCatalog(self.path) as catalog:
+            self.assertEqual(2, len(catalog))
+            self.assertEqual([25, 19019], list(catalog.ids()))
+            self.assertEqual(THUNDERFURY, catalog[19019])
+            self.assertEqual('Worn Shortsword', catalog.name(25))
+            self.assertEqual(
+                ItemFields(19019, 'LEGENDARY', 80, 60, 2, 7, 1, 1538560, 307712, True, False),
+                catalog.fields(19019),
+            )
+            self.assertEqual(
+                ItemFields(25, None, None, None, None, None, None, None, None, None, None),
+                catalog.fields(25),
+            )
+
+    def test_missing_items(self):
+        self.write([THUNDERFURY])
+
+        with ItemCatalog(self.path) as catalog:
+            self.assertNotIn(19018, catalog)
+            self.assertIsNone(catalog.get(19020))
+            with self.assertRaises(KeyError):
+                catalog.name(1)
+
+    def test_unsorted_and_repeated_items(self):
+        self.write([{'id': 3, 'name': 'c'}, {'id': 1, 'name': 'a'}, None, {'id': 3, 'name': 'new c'}, {'id': 2, 'name': 'b'}])
+
+        with ItemCatalog(self.path) as catalog:
+            self.assertEqual([1, 2, 3], list(catalog.ids()))
+            self.assertEqual(['a', 'b', 'new c'], [catalog.name(item_id) for item_id in catalog.ids()])
+            self.assertEqual({'id': 3, 'name': 'new c'}, catalog[3])
+
+    def test_rebuild_replaces_the_file_under_open_readers(self):
+        self.write([THUNDERFURY])
+        catalog = ItemCatalog(self.path)
+        self.write([{'id': 1, 'name': 'a'}])
+
+        self.assertEqual('Thunderfury, Blessed Blade of the Windseeker', catalog.name(19019))
+        catalog.close()
+        with ItemCatalog(self.path) as catalog:
+            self.assertEqual([1], list(catalog.ids()))
+
+    def test_failed_rebuild_keeps_the_earlier_catalog(self):
+        self.write([THUNDERFURY])
+
+        with self.assertRaises(RuntimeError):
+            with ItemCatalogWriter(self.path) as writer:
+                writer.add([{'id': 1, 'name': 'a'}])
+                raise RuntimeError('crawl failed')
+
+        with ItemCatalog(self.path) as catalog:
+            self.assertEqual([19019], list(catalog.ids()))
+        self.assertEqual(['items.catalog'], os.listdir(self.directory.name))
+
+    def test_not_a_catalog(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'\0' * 128)
+
+        with self.assertRaises(ValueError):
+            ItemCatalog(self.path)
+
+    def test_built_from_a_crawl_stream(self):
+        async def crawl():
+            with ItemCatalogWriter(self.path) as catalog_writer:
+                writer = SinkWriter(catalog_writer)
+                for page in range(3):
+                    await writer.write([{'id': page * 10 + offset, 'name': str(page * 10 + offset)} for offset in range(10)])
+                await writer.close()
+
+        asyncio.run(crawl())
+
+        with ItemCatalog(self.path) as catalog:
+            self.assertEqual(30, len(catalog))
+            self.assertEqual('17', catalog.name(17))
+
+
+if __name__ == '__main__':
+    unittest.main()
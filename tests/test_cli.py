@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from getwowdataasync.cli import main
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.history import AuctionHistoryStore
+
+
+def auctions_json(realm_id):
+    return {'auctions': [{'id': realm_id, 'item': {'id': 19019}, 'quantity': 1, 'buyout': 100 * realm_id}]}
+
+
+class TestDump(unittest.TestCase):
+    def setUp(self):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        self.directory = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.directory.name, 'out')
+        self.cache_dir = os.path.join(self.directory.name, 'cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_ndjson(self, name):
+        with open(os.path.join(self.out, name), encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    @patch('getwowdataasync.WowApi.get_auctions_if_modified')
+    def test_dump_auctions_skips_unchanged_with_cache(self, mocked_get_auctions_if_modified):
+        async def get_auctions_if_modified(realm_id, last_modified=None):
+            if last_modified:
+                return None, last_modified
+            return auctions_json(realm_id), 'Mon, 27 Jun 2022 18:28:56 GMT'
+
+        mocked_get_auctions_if_modified.side_effect = get_auctions_if_modified
+        argv = ['dump', 'auctions', '--realms', '4,5', '--out', self.out, '--cache-dir', self.cache_dir, '--quiet']
+
+        self.assertEqual(0, main(argv))
+        self.assertEqual(auctions_json(4)['auctions'], self.read_ndjson('auctions-4.ndjson'))
+        self.assertEqual(auctions_json(5)['auctions'], self.read_ndjson('auctions-5.ndjson'))
+
+        self.assertEqual(0, main(argv))
+        self.assertEqual(
+            [(4, 'Mon, 27 Jun 2022 18:28:56 GMT'), (5, 'Mon, 27 Jun 2022 18:28:56 GMT')],
+            [call.args for call in mocked_get_auctions_if_modified.await_args_list[2:]],
+        )
+
+    @patch('getwowdataasync.WowApi.get_commodities_if_modified')
+    def test_dump_commodities_columnar(self, mocked_get_commodities_if_modified):
+        mocked_get_commodities_if_modified.return_value = (auctions_json(1), 'Mon, 27 Jun 2022 18:28:56 GMT')
+
+        self.assertEqual(0, main(['dump', 'commodities', '--format', 'columnar', '--out', self.out, '--quiet']))
+
+        store = AuctionHistoryStore(self.out)
+        snapshots = list(store.snapshots())
+        store.close()
+        self.assertEqual(1, len(snapshots))
+        self.assertEqual(1656354536, snapshots[0][1])
+
+    def test_columnar_only_for_auctions(self):
+        self.assertEqual(2, main(['dump', 'items', '--format', 'columnar', '--out', self.out]))
+
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    def test_dump_items_resumes_from_checkpoint(self, mocked_get_data, mocked_search_data):
+        checkpoint = os.path.join(self.directory.name, 'items.checkpoint')
+        with open(checkpoint, 'w', encoding='utf-8') as file:
+            json.dump({'next_id': 2}, file)
+        os.makedirs(self.out)
+        with open(os.path.join(self.out, 'items.csv'), 'w', encoding='utf-8') as file:
+            file.write('id,name,level\n1,first,10\n')
+        page = {'results': [{'key': {'href': 'https://dummyurl.com/'}, 'data': {'id': 2}}]}
+        mocked_search_data.side_effect = [page, {'results': []}]
+        mocked_get_data.return_value = {'level': 20, 'name': 'second', 'id': 2}
+
+        self.assertEqual(0, main(['dump', 'items', '--format', 'csv', '--out', self.out,
+                                  '--resume', checkpoint, '--quiet']))
+
+        self.assertEqual('[2,]', mocked_search_data.await_args_list[0].args[1]['id'])
+        with open(os.path.join(self.out, 'items.csv'), encoding='utf-8') as file:
+            self.assertEqual('id,name,level\n1,first,10\n2,second,20\n', file.read())
+        self.assertFalse(os.path.exists(checkpoint))
+
+
+if __name__ == '__main__':
+    unittest.main()
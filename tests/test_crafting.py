@@ -0,0 +1,113 @@
+import math
+import unittest
+
+from getwowdataasync.auctions import AuctionSnapshot
+from getwowdataasync.crafting import CraftingGraph
+
+
+def recipe(recipe_id, crafted_item_id, reagents, crafted_quantity=1):
+    return {
+        'id': recipe_id,
+        'crafted_item': {'id': crafted_item_id},
+        'crafted_quantity': {'value': crafted_quantity},
+        'reagents': [{'reagent': {'id': item_id}, 'quantity': quantity} for item_id, quantity in reagents],
+    }
+
+
+ORE, BAR, HANDLE, SWORD = 1, 2, 3, 4
+
+
+class TestCraftingGraph(unittest.TestCase):
+    def setUp(self):
+        # listed sword first so the order has to come from the graph
+        self.recipes = [
+            recipe(30, SWORD, [(BAR, 3), (HANDLE, 1)]),
+            recipe(10, BAR, [(ORE, 2)], crafted_quantity=2),
+            recipe(20, HANDLE, [(BAR, 1)]),
+        ]
+        self.graph = CraftingGraph(self.recipes)
+
+    def test_recipes_come_after_their_reagents_recipes(self):
+        self.assertEqual([10, 20, 30], list(self.graph.recipe_ids))
+        self.assertEqual(0, self.graph.cycles_broken)
+
+    def test_crafted_reagents_use_the_cheaper_of_market_and_crafting(self):
+        costs = self.graph.evaluate({ORE: 10, BAR: 50, HANDLE: 5})
+
+        self.assertEqual(20, costs.recipe_cost(10))
+        self.assertEqual(10, costs.item_cost(BAR))
+        self.assertEqual(5, costs.item_cost(HANDLE))  # cheaper to buy
+        self.assertEqual(35, costs.recipe_cost(30))
+        self.assertEqual({10: 20, 20: 10, 30: 35}, costs.as_dict())
+
+    def test_unlisted_reagents_can_only_be_crafted(self):
+        costs = self.graph.evaluate({ORE: 10})
+
+        self.assertEqual(10, costs.item_cost(HANDLE))
+        self.assertEqual(40, costs.recipe_cost(30))
+
+    def test_missing_reagent_makes_recipe_uncraftable(self):
+        costs = self.graph.evaluate({BAR: 7})
+
+        self.assertTrue(math.isinf(costs.recipe_cost(10)))
+        self.assertEqual(7, costs.item_cost(BAR))
+
+    def test_recipes_without_reagents_are_unknown(self):
+        no_reagents = {'id': 40, 'crafted_item': {'id': BAR}, 'modified_crafting_slots': [{'slot_type': {'id': 1}}]}
+        graph = CraftingGraph(self.recipes + [no_reagents])
+
+        costs = graph.evaluate({ORE: 10})
+
+        self.assertEqual(math.inf, costs.recipe_cost(40))
+        self.assertEqual(10, costs.item_cost(BAR))
+        self.assertEqual(40, costs.recipe_cost(30))
+
+    def test_evaluate_auction_json_and_snapshot(self):
+        commodities = {'auctions': [
+            {'id': 1, 'item': {'id': ORE}, 'quantity': 5, 'unit_price': 12},
+            {'id': 2, 'item': {'id': ORE}, 'quantity': 5, 'unit_price': 10},
+        ]}
+
+        self.assertEqual(20, self.graph.evaluate(commodities).recipe_cost(10))
+        self.assertEqual(20, self.graph.evaluate(AuctionSnapshot.from_json(commodities)).recipe_cost(10))
+
+    def test_cycles_are_broken(self):
+        graph = CraftingGraph([
+            recipe(1, ORE, [(BAR, 1)]),
+            recipe(2, BAR, [(ORE, 1)]),
+            recipe(3, SWORD, [(BAR, 1)]),
+        ])
+        costs = graph.evaluate({ORE: 10, BAR: 30})
+
+        self.assertEqual(1, graph.cycles_broken)
+        self.assertEqual([1, 2, 3], list(graph.recipe_ids))
+        self.assertEqual(10, costs.item_cost(BAR))
+        self.assertEqual(10, costs.recipe_cost(3))
+
+    def test_cycles_listed_after_their_consumers_are_evaluated_first(self):
+        graph = CraftingGraph([
+            recipe(3, SWORD, [(BAR, 1)]),
+            recipe(1, ORE, [(BAR, 1)]),
+            recipe(2, BAR, [(ORE, 1)]),
+        ])
+        costs = graph.evaluate({ORE: 1, BAR: 30})
+
+        self.assertEqual(1, graph.cycles_broken)
+        self.assertEqual(3, graph.recipe_ids[-1])
+        self.assertEqual(1, costs.item_cost(BAR))
+        self.assertEqual(1, costs.recipe_cost(3))
+
+    def test_self_crafting_recipe_is_a_cycle(self):
+        graph = CraftingGraph([recipe(1, BAR, [(BAR, 2)], crafted_quantity=3)])
+
+        self.assertEqual(1, graph.cycles_broken)
+        self.assertEqual(20, graph.evaluate({BAR: 30}).item_cost(BAR))
+
+    def test_from_professions_tree(self):
+        tree = [{'id': 164, 'name': 'Blacksmithing', 'categories': [{'name': 'Weapons', 'recipes': self.recipes + [None]}]}]
+
+        self.assertEqual([10, 20, 30], list(CraftingGraph.from_professions_tree(tree).recipe_ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from getwowdataasync.database import SQLiteLoader
+
+
+class TestSQLiteLoader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.loader = SQLiteLoader(os.path.join(self.directory.name, 'wow.sqlite'))
+
+    def tearDown(self):
+        self.loader.close()
+        self.directory.cleanup()
+
+    def test_load_auctions_adds_a_snapshot(self):
+        auctions_json = {'auctions': [
+            {'id': 2, 'item': {'id': 19019}, 'quantity': 1, 'buyout': 5000, 'time_left': 'LONG'},
+            {'id': 1, 'item': {'id': 190320}, 'quantity': 20, 'unit_price': 300, 'time_left': 'SHORT'},
+        ]}
+
+        snapshot_id = self.loader.load_auctions(auctions_json, connected_realm_id=4, timestamp=100)
+
+        self.assertEqual(
+            [(4, 100)],
+            self.loader.connection.execute('SELECT connected_realm_id, timestamp FROM snapshots').fetchall(),
+        )
+        self.assertEqual(
+            [(snapshot_id, 1, 190320, 20, 300, None, None, 'SHORT'),
+             (snapshot_id, 2, 19019, 1, 5000, 5000, None, 'LONG')],
+            self.loader.connection.execute('SELECT * FROM auctions ORDER BY id').fetchall(),
+        )
+
+    def test_load_many_auctions(self):
+        auctions_json = {'auctions': [
+            {'id': auction_id, 'item': {'id': auction_id % 500}, 'quantity': 1, 'buyout': auction_id}
+            for auction_id in range(50000)
+        ]}
+
+        self.loader.load_auctions(auctions_json)
+
+        self.assertEqual(50000, self.loader.connection.execute('SELECT COUNT(*) FROM auctions').fetchone()[0])
+
+    def test_load_items_localizes_and_skips_missing(self):
+        items = [
+            {'id': 19019, 'name': 'Thunderfury', 'quality': {'type': 'LEGENDARY'}, 'level': 80,
+             'item_class': {'id': 2}, 'is_equippable': True},
+            None,
+            {'id': 25, 'name': {'en_US': 'Worn Shortsword', 'de_DE': 'Abgenutztes Kurzschwert'}},
+        ]
+
+        self.loader.load_items(items)
+
+        self.assertEqual(
+            [(25, 'Worn Shortsword', None, None, None), (19019, 'Thunderfury', 'LEGENDARY', 80, 2)],
+            self.loader.connection.execute(
+                'SELECT id, name, quality, level, item_class_id FROM items ORDER BY id'
+            ).fetchall(),
+        )
+
+    def test_load_professions_tree_replaces_reagents(self):
+        recipe = {
+            'id': 1, 'name': 'Potion', 'crafted_item': {'id': 191}, 'crafted_quantity': {'value': 2},
+            'reagents': [{'reagent': {'id': 10}, 'quantity': 3}, {'reagent': {'id': 11}, 'quantity': 1}],
+        }
+        tree = [{'id': 171, 'name': 'Alchemy', 'categories': [{'name': 'Potions', 'recipes': [recipe]}]}]
+        self.loader.load_professions_tree(tree)
+        recipe['reagents'] = [{'reagent': {'id': 12}, 'quantity': 5}]
+        self.loader.load_professions_tree(tree)
+
+        self.assertEqual(
+            [(1, 'Potion', 171, 'Potions', 191, 2)],
+            self.loader.connection.execute('SELECT * FROM recipes').fetchall(),
+        )
+        self.assertEqual([(1, 12, 5)], self.loader.connection.execute('SELECT * FROM reagents').fetchall())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+
+from getwowdataasync.deadlines import (
+    PartialResults,
+    RequestBudget,
+    charge_request,
+    gather_or_cancel,
+    run_bounded,
+)
+from getwowdataasync.exceptions import DeadlineExceededError, RequestBudgetExceededError
+
+
+class TestRunBounded(unittest.IsolatedAsyncioTestCase):
+    async def test_finished_operation_returns_plain_results(self):
+        results = []
+
+        async def operation():
+            results.append(1)
+
+        actual_results = await run_bounded(operation(), results, deadline=1)
+
+        self.assertEqual([1], actual_results)
+        self.assertNotIsInstance(actual_results, PartialResults)
+
+    async def test_deadline_cancels_nested_tasks(self):
+        results = []
+        cancelled = []
+
+        async def slow_request():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def operation():
+            results.append(1)
+            await asyncio.gather(asyncio.create_task(slow_request()))
+
+        actual_results = await run_bounded(operation(), results, deadline=0.05)
+
+        self.assertIsInstance(actual_results.error, DeadlineExceededError)
+        self.assertEqual([1], actual_results)
+        self.assertEqual([True], cancelled)
+
+    async def test_budget_counts_nested_requests(self):
+        results = []
+
+        async def request():
+            charge_request()
+            results.append(1)
+
+        async def operation():
+            for _ in range(5):
+                await asyncio.create_task(request())
+
+        actual_results = await run_bounded(operation(), results, max_requests=3)
+
+        self.assertIsInstance(actual_results.error, RequestBudgetExceededError)
+        self.assertEqual([1, 1, 1], actual_results)
+
+    async def test_failure_returns_partial_results(self):
+        results = []
+
+        async def operation():
+            results.append(1)
+            raise ValueError('request failed')
+
+        actual_results = await run_bounded(operation(), results, deadline=1)
+
+        self.assertIsInstance(actual_results.error, ValueError)
+        self.assertEqual([1], actual_results)
+
+    async def test_failure_is_raised_without_bounds(self):
+        async def operation():
+            raise ValueError('request failed')
+
+        with self.assertRaises(ValueError):
+            await run_bounded(operation(), [])
+
+    def test_nested_budget_charges_parent(self):
+        parent = RequestBudget(1)
+        budget = RequestBudget(5, parent=parent)
+        budget.charge()
+
+        with self.assertRaises(RequestBudgetExceededError):
+            budget.charge()
+        self.assertEqual(1, parent.requests_made)
+
+
+class TestGatherOrCancel(unittest.IsolatedAsyncioTestCase):
+    async def test_failure_cancels_the_others(self):
+        slow_request = asyncio.create_task(asyncio.sleep(10))
+
+        async def failing_request():
+            raise ValueError('request failed')
+
+        with self.assertRaises(ValueError):
+            await gather_or_cancel(slow_request, failing_request())
+
+        self.assertTrue(slow_request.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.expansions import ExpansionIdRanges
+from getwowdataasync.exceptions import UnknownExpansionError
+
+
+class TestExpansionIdRanges(unittest.TestCase):
+    def test_latest_known_expansion_is_open_ended(self):
+        ranges = ExpansionIdRanges()
+
+        self.assertEqual((188658, None), ranges.get('df'))
+
+    def test_range_ends_before_next_known_expansion(self):
+        ranges = ExpansionIdRanges()
+        ranges.set('sl', 171000)
+
+        self.assertEqual((171000, 188657), ranges.get('sl'))
+
+    def test_unknown_expansion_raises_key_error(self):
+        ranges = ExpansionIdRanges()
+
+        with self.assertRaises(KeyError) as raised:
+            ranges.get('tbc')
+        self.assertIsInstance(raised.exception, UnknownExpansionError)
+        self.assertIn("discover_expansion_id_range('tbc', signal=...)", str(raised.exception))
+
+    def test_search_bounds_use_neighbouring_expansions(self):
+        ranges = ExpansionIdRanges()
+        ranges.set('legion', 120000)
+
+        self.assertEqual((120000, 188657), ranges.search_bounds('sl'))
+
+    def test_table_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ranges.json')
+            ExpansionIdRanges(path).set('sl', 171000)
+
+            self.assertEqual((171000, 188657), ExpansionIdRanges(path).get('sl'))
+
+
+class TestDiscoverExpansionIdRange(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        self.TestApi = await WowApi.create('us')
+        # Items exist at every even id below 1000, the expansion starts at 600.
+        self.item_ids = list(range(0, 1000, 2))
+        self.search_count = 0
+
+    async def asyncTearDown(self):
+        await self.TestApi.close()
+
+    async def fake_search(self, url_name, params):
+        self.search_count += 1
+        from_id = int(params['id'].strip('[]').split(',')[0])
+        matches = [{'data': {'id': item_id}} for item_id in self.item_ids if item_id >= from_id]
+        return {'results': matches[:params['_pageSize']]}
+
+    async def test_discover_finds_first_item_with_few_requests(self):
+        with patch.object(WowApi, '_search_data', side_effect=self.fake_search):
+            actual_range = await self.TestApi.discover_expansion_id_range('sl', lambda item: item['id'] >= 600)
+
+        self.assertEqual((600, 188657), actual_range)
+        self.assertLessEqual(self.search_count, 20)
+
+    async def test_get_last_item_id(self):
+        with patch.object(WowApi, '_search_data', side_effect=self.fake_search):
+            actual_last_id = await self.TestApi._get_last_item_id()
+
+        self.assertEqual(998, actual_last_id)
+
+    async def test_discover_without_signal_raises_for_unknown_expansion(self):
+        with self.assertRaises(UnknownExpansionError):
+            await self.TestApi.discover_expansion_id_range('tbc')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,15 @@ import unittest
 from unittest.mock import AsyncMock, Mock, patch
 from urllib.parse import urljoin
 
+import httpx
+
 from getwowdataasync.urls import *
 from getwowdataasync.getdata import WowApi
 from getwowdataasync.helpers import *
+from getwowdataasync.deadlines import PartialResults
+from getwowdataasync.progress import ProgressReporter
+from getwowdataasync.sinks import CallbackSink
+from getwowdataasync.exceptions import DeadlineExceededError
 
 
 # TODO Still uses aiohttp and is BOKEN because of it. Integreated QUICK tests work though.
@@ -158,6 +164,20 @@ class TestGetDataIsSuccessful(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(expected_response, actual_response)
 
+    async def test_get_data_if_modified_returns_none_when_not_modified(self):
+        def handler(request):
+            if request.headers.get('If-Modified-Since'):
+                return httpx.Response(304)
+            return httpx.Response(200, json={'auctions': []}, headers={'Last-Modified': 'Mon, 27 Jun 2022 18:28:56 GMT'})
+        await self.TestApi.client.aclose()
+        self.TestApi.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first_response = await self.TestApi.get_auctions_if_modified(4)
+        second_response = await self.TestApi.get_auctions_if_modified(4, first_response[1])
+
+        self.assertEqual(({'auctions': []}, 'Mon, 27 Jun 2022 18:28:56 GMT'), first_response)
+        self.assertEqual((None, 'Mon, 27 Jun 2022 18:28:56 GMT'), second_response)
+
     def test_build_urls_with_url_name(self):
         dummy_base_url = "https://dummy.com"
         dummy_path = "connected_realm_index"
@@ -250,9 +270,156 @@ class TestGetDataIsSuccessful(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(expected_response, actual_response)
 
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_all_items_returns_partial_results_at_deadline(self, mocked_get_data, mocked_search_data):
+        first_page = {'results': [{'key': {'href': "https://dummyurl.com/"}, 'data': {'id': 1}}]}
+        second_page = {'results': [{'key': {'href': "https://dummyurl.com/"}, 'data': {'id': 2}}]}
+        mocked_search_data.side_effect = [first_page, second_page]
+        started = []
+
+        async def get_item(url_name, path_ids):
+            started.append(path_ids['item_id'])
+            if path_ids['item_id'] == 2:
+                await asyncio.sleep(10)
+            return {'id': path_ids['item_id']}
+
+        mocked_get_data.side_effect = get_item
+
+        actual_response = await self.TestApi.get_all_items(deadline=0.1)
+
+        self.assertIsInstance(actual_response, PartialResults)
+        self.assertIsInstance(actual_response.error, DeadlineExceededError)
+        self.assertEqual([{'id': 1}], actual_response)
+        self.assertEqual([1, 2], started)
+
+    @patch('getwowdataasync.WowApi._get_last_item_id')
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_all_items_reports_progress(self, mocked_get_data, mocked_search_data, mocked_get_last_item_id):
+        pages = [
+            {'results': [{'key': {'href': "https://dummyurl.com/"}, 'data': {'id': item_id}} for item_id in item_ids]}
+            for item_ids in ((0, 1), (2, 3))
+        ]
+        mocked_search_data.side_effect = pages + [{'results': []}]
+        mocked_get_data.side_effect = lambda url_name, path_ids: {'id': path_ids['item_id']}
+        mocked_get_last_item_id.return_value = 3
+        events = []
+        self.TestApi.progress = ProgressReporter(events.append, interval=0)
+
+        await self.TestApi.get_all_items()
+
+        self.assertEqual(5, len(events))
+        self.assertEqual(('get_all_items', 4, True), (events[-1].operation, events[-1].done, events[-1].finished))
+        # The second page's events know the crawl is half done.
+        self.assertEqual([None, None], [event.eta for event in events[:2]])
+        self.assertTrue(all(event.eta is not None for event in events[2:]))
+
+    @patch('getwowdataasync.WowApi._get_last_item_id')
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_all_items_skips_last_item_id_without_progress(
+        self, mocked_get_data, mocked_search_data, mocked_get_last_item_id
+    ):
+        mocked_search_data.side_effect = [{'results': []}]
+
+        await self.TestApi.get_all_items()
+
+        mocked_get_last_item_id.assert_not_awaited()
+
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_all_items_limits_concurrent_detail_requests(self, mocked_get_data, mocked_search_data):
+        page = {'results': [{'key': {'href': "https://dummyurl.com/"}, 'data': {'id': item_id}} for item_id in range(10)]}
+        mocked_search_data.side_effect = [page, {'results': []}]
+        in_flight = []
+        most_in_flight = 0
+
+        async def get_item(url_name, path_ids):
+            nonlocal most_in_flight
+            in_flight.append(path_ids['item_id'])
+            most_in_flight = max(most_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(path_ids['item_id'])
+            return {'id': path_ids['item_id']}
+
+        mocked_get_data.side_effect = get_item
+
+        actual_response = await self.TestApi.get_all_items(concurrency=3)
+
+        self.assertEqual([{'id': item_id} for item_id in range(10)], actual_response)
+        self.assertEqual(3, most_in_flight)
+
+    @patch('getwowdataasync.WowApi._search_data')
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_all_items_writes_pages_to_sink(self, mocked_get_data, mocked_search_data):
+        pages = [
+            {'results': [{'key': {'href': "https://dummyurl.com/"}, 'data': {'id': item_id}}]}
+            for item_id in (1, 2)
+        ]
+        mocked_search_data.side_effect = pages + [{'results': []}]
+        mocked_get_data.side_effect = lambda url_name, path_ids: {'id': path_ids['item_id']}
+        batches = []
+
+        actual_response = await self.TestApi.get_all_items(sink=CallbackSink(batches.append))
+
+        self.assertEqual([], actual_response)
+        self.assertEqual([[{'id': 1}], [{'id': 2}]], batches)
+
     async def test_get_detailed_list_of_elements(self):
         pass
 
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_detailed_list_of_elements_uses_search_data_when_it_has_all_fields(self, mocked_get_data):
+        dummy_search_response = {
+            'results': [
+                {
+                    'data': {
+                        'id': 1,
+                        'name': {'en_US': 'Test Item', 'de_DE': 'Testgegenstand'},
+                        'level': 10,
+                    }
+                }
+            ]
+        }
+
+        actual_response = await self.TestApi._get_detailed_list_of_elements(dummy_search_response, ['name', 'level'])
+        expected_response = [{'id': 1, 'name': 'Test Item', 'level': 10}]
+
+        self.assertEqual(expected_response, actual_response)
+        mocked_get_data.assert_not_called()
+
+    @patch('getwowdataasync.WowApi._get_data')
+    async def test_get_detailed_list_of_elements_requests_item_when_a_field_is_missing(self, mocked_get_data):
+        dummy_search_response = {'results': [{'data': {'id': 1, 'level': 10}}]}
+        mocked_get_data.return_value = {'id': 1, 'level': 10, 'description': 'Detailed'}
+
+        actual_response = await self.TestApi._get_detailed_list_of_elements(dummy_search_response, ['description'])
+        expected_response = [{'id': 1, 'description': 'Detailed'}]
+
+        self.assertEqual(expected_response, actual_response)
+        mocked_get_data.assert_awaited_once()
+
+    @patch('getwowdataasync.WowApi.get_item_by_id')
+    async def test_get_items_by_ids_removes_duplicates_and_keeps_order(self, mocked_get_item_by_id):
+        mocked_get_item_by_id.side_effect = lambda item_id: {'id': item_id}
+
+        actual_items = await self.TestApi.get_items_by_ids([3, 1, 3, 2])
+        expected_items = {3: {'id': 3}, 1: {'id': 1}, 2: {'id': 2}}
+
+        self.assertEqual(list(expected_items.items()), list(actual_items.items()))
+        self.assertEqual(3, mocked_get_item_by_id.await_count)
+
+    @patch('getwowdataasync.WowApi.get_recipe')
+    async def test_get_recipes_by_ids_returns_errors_per_id(self, mocked_get_recipe):
+        error = httpx.ConnectError('failed')
+        mocked_get_recipe.side_effect = [{'id': 1}, error]
+
+        actual_recipes = await self.TestApi.get_recipes_by_ids([1, 2], concurrency=1)
+
+        self.assertEqual({'id': 1}, actual_recipes[1])
+        self.assertIs(error, actual_recipes[2])
+
     @patch('getwowdataasync.WowApi.get_connected_realm_index')
     @patch('getwowdataasync.WowApi._get_data')
     async def test_get_all_realms(self, mocked_get_data, mocked_get_connected_realm_index):
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+
+from getwowdataasync.deadlines import charge_request, run_bounded
+from getwowdataasync.hedging import Hedger, endpoint_of
+from getwowdataasync.ratelimit import RateLimiter
+
+
+class TestHedger(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.rate_limiter = RateLimiter()
+        self.hedger = Hedger(self.rate_limiter, max_extra_ratio=1, min_samples=3)
+        for _ in range(3):
+            self.hedger.record('/data/wow/item/{id}', 0.01)
+
+    def test_endpoint_of_groups_ids(self):
+        self.assertEqual(
+            '/data/wow/item/{id}',
+            endpoint_of('https://us.api.blizzard.com/data/wow/item/19019'),
+        )
+
+    def test_no_hedge_delay_until_min_samples(self):
+        self.assertIsNone(self.hedger.hedge_delay('/data/wow/recipe/{id}'))
+        self.assertEqual(0.01, self.hedger.hedge_delay('/data/wow/item/{id}'))
+
+    async def test_slow_request_is_hedged_and_first_response_wins(self):
+        delays = [1, 0]
+        started = []
+
+        async def make_request():
+            delay = delays[len(started)]
+            started.append(delay)
+            await asyncio.sleep(delay)
+            return delay
+
+        actual_result = await self.hedger.run('https://us.api.blizzard.com/data/wow/item/1', make_request)
+
+        self.assertEqual(0, actual_result)
+        self.assertEqual(2, len(started))
+        self.assertEqual(1, self.hedger.hedges)
+        self.assertEqual(1, await self.rate_limiter.used_this_hour())
+
+    async def test_hedges_count_against_the_request_budget(self):
+        started = []
+
+        async def make_request():
+            started.append(1)
+            await asyncio.sleep(0.05)
+            return 'item'
+
+        async def operation():
+            charge_request()  # the first request
+            results.append(await self.hedger.run('https://us.api.blizzard.com/data/wow/item/1', make_request))
+
+        results = []
+        actual_results = await run_bounded(operation(), results, max_requests=1)
+
+        self.assertEqual(['item'], actual_results)
+        self.assertEqual(1, len(started))
+        self.assertEqual(0, self.hedger.hedges)
+
+    async def test_hedges_are_capped_across_concurrent_requests(self):
+        self.hedger.max_extra_ratio = 0.05
+
+        async def make_request():
+            await asyncio.sleep(0.05)
+            return 'item'
+
+        await asyncio.gather(*(
+            self.hedger.run(f'https://us.api.blizzard.com/data/wow/item/{item_id}', make_request)
+            for item_id in range(100)
+        ))
+
+        self.assertEqual(100, self.hedger.requests)
+        self.assertLessEqual(self.hedger.hedges, self.hedger.max_extra_ratio * self.hedger.requests)
+        self.assertGreater(self.hedger.hedges, 0)
+
+    async def test_fast_request_is_not_hedged(self):
+        async def make_request():
+            return 'item'
+
+        actual_result = await self.hedger.run('https://us.api.blizzard.com/data/wow/item/1', make_request)
+
+        self.assertEqual('item', actual_result)
+        self.assertEqual(0, self.hedger.hedges)
+
+    async def test_hedges_are_capped(self):
+        self.hedger.max_extra_ratio = 0
+        calls = []
+
+        async def make_request():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'item'
+
+        await self.hedger.run('https://us.api.blizzard.com/data/wow/item/1', make_request)
+
+        self.assertEqual(1, len(calls))
+
+    async def test_failed_request_falls_back_to_the_other(self):
+        calls = []
+
+        async def make_request():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                raise ValueError('failed')
+            await asyncio.sleep(0.1)
+            return 'item'
+
+        actual_result = await self.hedger.run('https://us.api.blizzard.com/data/wow/item/1', make_request)
+
+        self.assertEqual('item', actual_result)
+
+    async def test_auctions_are_never_hedged(self):
+        for _ in range(3):
+            self.hedger.record('/data/wow/connected-realm/{id}/auctions', 0.01)
+        calls = []
+
+        async def make_request():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'auctions'
+
+        await self.hedger.run('https://us.api.blizzard.com/data/wow/connected-realm/4/auctions', make_request)
+
+        self.assertEqual(1, len(calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,6 +48,18 @@ class TestHelpers(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(expected_retry_count, actual_retry_count)
 
+    def test_localize_replaces_translations_with_locale(self):
+        search_data = {
+            'name': {'en_US': 'Armor', 'de_DE': 'Rüstung'},
+            'quality': {'type': 'EPIC', 'name': {'en_US': 'Epic', 'de_DE': 'Episch'}},
+            'id': 1,
+        }
+
+        actual_data = localize(search_data, 'en_US')
+        expected_data = {'name': 'Armor', 'quality': {'type': 'EPIC', 'name': 'Epic'}, 'id': 1}
+
+        self.assertEqual(expected_data, actual_data)
+
     async def test_retry_correctly_executes_decorated_function(self):
         test_func = AsyncMock()
         test_func.__name__ = ''
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+import zlib
+from unittest.mock import patch
+
+from getwowdataasync.auctions import AuctionSnapshot
+from getwowdataasync.history import AuctionHistoryStore
+
+
+def snapshot(*auctions):
+    return AuctionSnapshot.from_json({'auctions': [
+        {'id': auction_id, 'item': {'id': item_id}, 'quantity': quantity, 'unit_price': price}
+        for auction_id, item_id, quantity, price in auctions
+    ]})
+
+
+class TestAuctionHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.store = AuctionHistoryStore(self.temporary_directory.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.temporary_directory.cleanup()
+
+    def append_test_snapshots(self, compress):
+        self.store.append(snapshot((1, 10, 5, 300), (2, 20, 1, 50), (3, 10, 2, 100)), 1000, 4, compress)
+        self.store.append(snapshot((4, 20, 3, 40)), 2000, 4, compress)
+        self.store.append(snapshot((5, 10, 7, 90)), 2000, 5, compress)
+
+    def test_item_history_across_snapshots(self):
+        self.append_test_snapshots(compress=False)
+
+        actual_history = list(self.store.item_history(10))
+        expected_history = [
+            (1000, 4, [100, 300], [2, 5]),
+            (2000, 5, [90], [7]),
+        ]
+
+        self.assertEqual(expected_history, actual_history)
+
+    def test_item_history_of_compressed_snapshots(self):
+        self.append_test_snapshots(compress=True)
+
+        actual_history = list(self.store.item_history(20, connected_realm_id=4))
+        expected_history = [
+            (1000, 4, [50], [1]),
+            (2000, 4, [40], [3]),
+        ]
+
+        self.assertEqual(expected_history, actual_history)
+
+    @patch('getwowdataasync.history.block_rows', 2)
+    def test_compressed_lookups_only_decompress_the_items_blocks(self):
+        # item 10 spans blocks 0 and 1, item 30 is alone in block 2
+        self.store.append(
+            snapshot((1, 5, 1, 1), (2, 10, 1, 20), (3, 10, 2, 10), (4, 20, 3, 30), (5, 30, 4, 40)), 1000, 4, compress=True
+        )
+
+        with patch('getwowdataasync.history.zlib.decompress', side_effect=zlib.decompress) as mocked_decompress:
+            self.assertEqual(([10, 20], [2, 1]), self.store.read_item(0, 10))
+            self.assertEqual(3 * 2, mocked_decompress.call_count)
+
+            mocked_decompress.reset_mock()
+            self.assertEqual(([40], [4]), self.store.read_item(0, 30))
+            self.assertEqual(([], []), self.store.read_item(0, 25))
+            self.assertEqual(([], []), self.store.read_item(0, 1))
+        self.assertEqual([5, 10, 10, 20, 30], list(self.store.read_snapshot(0).item_ids))
+
+    def test_compressed_snapshots_keep_the_block_size_they_were_written_with(self):
+        auctions = [(auction_id, 10 * (auction_id // 3), 1, auction_id) for auction_id in range(10)]
+        with patch('getwowdataasync.history.block_rows', 2):
+            self.store.append(snapshot(*auctions), 1000, 4, compress=True)
+
+        self.assertEqual(([6, 7, 8], [1, 1, 1]), self.store.read_item(0, 20))
+        self.assertEqual(list(range(10)), list(self.store.read_snapshot(0).ids))
+
+    def test_growing_files_are_remapped_and_the_old_map_closed(self):
+        self.store.append(snapshot((1, 10, 5, 300)), 1000, 4)
+        self.store.read_item(0, 10)
+        old_map = self.store._maps[self.store.data_path]
+
+        self.store.append(snapshot((2, 10, 1, 50)), 2000, 4)
+
+        self.assertEqual(([50], [1]), self.store.read_item(1, 10))
+        self.assertTrue(old_map.closed)
+
+    def test_item_history_filters_by_time(self):
+        self.append_test_snapshots(compress=False)
+
+        actual_history = list(self.store.item_history(10, start=1500))
+
+        self.assertEqual([(2000, 5, [90], [7])], actual_history)
+
+    def test_store_is_readable_after_reopening(self):
+        self.append_test_snapshots(compress=True)
+
+        reopened_store = AuctionHistoryStore(self.temporary_directory.name)
+        read_snapshot = reopened_store.read_snapshot(0)
+        reopened_store.close()
+
+        self.assertEqual([3, 1, 2], list(read_snapshot.ids))
+        self.assertEqual([10, 10, 20], list(read_snapshot.item_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from getwowdataasync.interning import Interner
+
+
+def make_item(item_id):
+    # Builds the strings at runtime so they are distinct objects like
+    # strings parsed from separate responses would be.
+    return {
+        "id": item_id,
+        "name": f"Item {item_id}",
+        "quality": {"type": "".join(["EP", "IC"]), "name": "".join(["Ep", "ic"])},
+        "item_class": {
+            "key": {"href": "".join(["https://us.api.blizzard.com/", "item-class/4"])},
+            "name": "".join(["Arm", "or"]),
+            "id": 4,
+        },
+    }
+
+
+class TestInterner(unittest.TestCase):
+    def test_intern_returns_equal_json(self):
+        interner = Interner()
+        item = make_item(1)
+
+        actual_item = interner.intern(item)
+
+        self.assertEqual(make_item(1), actual_item)
+
+    def test_intern_shares_small_dicts_between_results(self):
+        interner = Interner()
+
+        first = interner.intern(make_item(1))
+        second = interner.intern(make_item(2))
+
+        self.assertIs(first["quality"], second["quality"])
+        self.assertIs(first["item_class"], second["item_class"])
+        self.assertIs(first["item_class"]["key"], second["item_class"]["key"])
+
+    def test_intern_does_not_share_dicts_with_different_values(self):
+        interner = Interner()
+
+        first = interner.intern({"quality": {"type": "EPIC"}})
+        second = interner.intern({"quality": {"type": "RARE"}})
+
+        self.assertIsNot(first["quality"], second["quality"])
+
+    def test_intern_does_not_confuse_bools_and_ints(self):
+        interner = Interner()
+
+        first = interner.intern({"value": 1})
+        second = interner.intern({"value": True})
+
+        self.assertIs(True, second["value"])
+        self.assertIsNot(first, second)
+
+    def test_intern_shares_repeated_strings(self):
+        interner = Interner()
+
+        first = interner.intern(["".join(["Dragon", "flight"])])
+        second = interner.intern(["".join(["Dragon", "flight"])])
+
+        self.assertIs(first[0], second[0])
+        self.assertEqual(1, interner.strings_deduplicated)
+
+    def test_report_counts_bytes_saved(self):
+        interner = Interner()
+
+        interner.intern(make_item(1))
+        interner.intern(make_item(2))
+        report = interner.report()
+
+        self.assertEqual(3, report["dicts_shared"])
+        self.assertGreater(report["bytes_saved"], 0)
+
+    def test_large_dicts_are_not_shared(self):
+        interner = Interner(max_shared_dict_size=2)
+
+        first = interner.intern({"a": 1, "b": 2, "c": 3})
+        second = interner.intern({"a": 1, "b": 2, "c": 3})
+
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
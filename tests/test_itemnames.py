@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.itemnames import ItemNameIndex
+
+
+def search_result(item_id, en_name, de_name):
+    return {'data': {'id': item_id, 'name': {'en_US': en_name, 'de_DE': de_name}}}
+
+
+class TestItemNameIndex(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.index = ItemNameIndex()
+        self.index.add([
+            search_result(19019, 'Thunderfury, Blessed Blade of the Windseeker', 'Donnerzorn, Gesegnete Klinge des Windsuchers'),
+            search_result(17182, 'Sulfuras, Hand of Ragnaros', 'Sulfuras, Hand von Ragnaros'),
+            search_result(2, 'Blade', 'Klinge'),
+        ])
+
+    def test_prefix_search(self):
+        self.assertEqual(
+            [(19019, 'Thunderfury, Blessed Blade of the Windseeker')], self.index.search('thunderf')
+        )
+
+    def test_every_word_must_match(self):
+        self.assertEqual([19019], [item_id for item_id, _ in self.index.search('blade of the w')])
+        self.assertEqual([], self.index.search('blade ragnaros'))
+
+    def test_names_starting_with_the_query_rank_first(self):
+        self.assertEqual([2, 19019], [item_id for item_id, _ in self.index.search('Bla')])
+
+    def test_search_other_locales(self):
+        self.assertEqual([(17182, 'Sulfuras, Hand von Ragnaros')], self.index.search('hand von', locale='de_DE'))
+
+    def test_replacing_an_item_removes_its_old_words(self):
+        self.index.add([{'id': 2, 'name': 'Sword'}])
+
+        self.assertEqual([19019], [item_id for item_id, _ in self.index.search('blade')])
+        self.assertEqual([(2, 'Sword')], self.index.search('sword'))
+
+    def test_short_prefixes_filter_longer_words_matches(self):
+        self.assertEqual([19019], [item_id for item_id, _ in self.index.search('bl of th')])
+        self.assertEqual([], self.index.search('blade x'))
+
+    def test_short_prefix_queries_are_cached_until_the_index_changes(self):
+        self.assertEqual([2, 19019], [item_id for item_id, _ in self.index.search('b')])
+        self.assertEqual([(2, 'Blade')], self.index.search('b', limit=1))
+        self.assertEqual(1, len(self.index._cache))
+
+        self.index.add([{'id': 1, 'name': 'B'}])
+
+        self.assertEqual([1, 2, 19019], [item_id for item_id, _ in self.index.search('b')])
+
+    @patch('getwowdataasync.WowApi.item_search')
+    async def test_refresh_searches_after_the_highest_id_and_persists(self, mocked_item_search):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        api = await WowApi.create('us')
+        mocked_item_search.side_effect = [
+            {'results': [search_result(19020, 'Thunderfury Replica', 'Donnerzorn Replik')]},
+            {'results': []},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            self.index.path = os.path.join(directory, 'item_names.json')
+
+            added = await self.index.refresh(api)
+
+            self.assertEqual(1, added)
+            self.assertEqual({'id': '[19020,]', 'orderby': 'id', '_pageSize': 1000}, mocked_item_search.await_args_list[0].args[0])
+            reloaded = ItemNameIndex(self.index.path)
+            self.assertEqual(4, len(reloaded))
+            self.assertEqual([19020], [item_id for item_id, _ in reloaded.search('replica')])
+        await api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.media import MediaDownloader
+
+
+class TestMediaDownloader(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        self.TestApi = await WowApi.create('us')
+        await self.TestApi.client.aclose()
+        self.requested_urls = []
+        self.TestApi.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle_asset_request))
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = self.temporary_directory.name
+
+    async def asyncTearDown(self):
+        await self.TestApi.close()
+        self.temporary_directory.cleanup()
+
+    def handle_asset_request(self, request):
+        self.requested_urls.append(str(request.url))
+        if request.url.path.endswith('missing.jpg'):
+            return httpx.Response(404)
+        # sword and sword_copy are different urls with the same image
+        content = b'axe' if 'axe' in request.url.path else b'sword'
+        return httpx.Response(200, content=content)
+
+    @staticmethod
+    def icon_media(file_name):
+        return {'assets': [{'key': 'icon', 'value': f'https://render.example.com/icons/{file_name}'}]}
+
+    @patch('getwowdataasync.WowApi.get_item_icon')
+    async def test_shared_icons_are_downloaded_once(self, mocked_get_item_icon):
+        mocked_get_item_icon.side_effect = lambda item_id: self.icon_media('sword.jpg')
+        downloader = MediaDownloader(self.TestApi, self.directory)
+
+        actual_paths = await downloader.download_item_icons([1, 2, 3])
+        expected_path = os.path.join(self.directory, 'sword.jpg')
+
+        self.assertEqual({1: {'icon': expected_path}, 2: {'icon': expected_path}, 3: {'icon': expected_path}}, actual_paths)
+        self.assertEqual(1, len(self.requested_urls))
+
+    @patch('getwowdataasync.WowApi.get_item_icon')
+    async def test_identical_content_is_saved_once(self, mocked_get_item_icon):
+        file_names = {1: 'sword.jpg', 2: 'sword_copy.jpg', 3: 'axe.jpg'}
+        mocked_get_item_icon.side_effect = lambda item_id: self.icon_media(file_names[item_id])
+        downloader = MediaDownloader(self.TestApi, self.directory, concurrency=1)
+
+        actual_paths = await downloader.download_item_icons([1, 2, 3])
+
+        self.assertEqual(actual_paths[1], actual_paths[2])
+        self.assertEqual(['axe.jpg', 'sword.jpg'], sorted(os.listdir(self.directory)))
+
+    @patch('getwowdataasync.WowApi.get_item_icon')
+    async def test_existing_files_are_skipped(self, mocked_get_item_icon):
+        mocked_get_item_icon.return_value = self.icon_media('sword.jpg')
+        with open(os.path.join(self.directory, 'sword.jpg'), 'wb') as file:
+            file.write(b'sword')
+        downloader = MediaDownloader(self.TestApi, self.directory)
+
+        await downloader.download_item_icons([1])
+
+        self.assertEqual([], self.requested_urls)
+
+    @patch('getwowdataasync.WowApi.get_item_icon')
+    async def test_failed_download_is_returned_per_id(self, mocked_get_item_icon):
+        mocked_get_item_icon.side_effect = lambda item_id: self.icon_media('missing.jpg' if item_id == 2 else 'axe.jpg')
+        downloader = MediaDownloader(self.TestApi, self.directory)
+
+        actual_paths = await downloader.download_item_icons([1, 2])
+
+        self.assertEqual({'icon': os.path.join(self.directory, 'axe.jpg')}, actual_paths[1])
+        self.assertIsInstance(actual_paths[2], httpx.HTTPStatusError)
+        self.assertEqual(['axe.jpg'], os.listdir(self.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+import httpx
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.mirror import ApiMirror, CachedResponse
+
+LAST_MODIFIED = 'Mon, 27 Jun 2022 18:28:56 GMT'
+
+
+class TestApiMirror(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        self.upstream_api = await WowApi.create('us')
+        await self.upstream_api.client.aclose()
+        self.upstream_requests = []
+        self.upstream_api.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle_upstream_request))
+        self.mirror = ApiMirror(self.upstream_api, port=0)
+        await self.mirror.start()
+        self.consumer = httpx.AsyncClient(base_url=f'http://127.0.0.1:{self.mirror.port}')
+
+    async def asyncTearDown(self):
+        await self.consumer.aclose()
+        await self.mirror.close()
+        await self.upstream_api.close()
+
+    async def handle_upstream_request(self, request):
+        self.upstream_requests.append(request)
+        await asyncio.sleep(0.01)
+        if request.headers.get('if-modified-since') == LAST_MODIFIED:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={'path': request.url.path, 'host': request.url.host},
+            headers={'last-modified': LAST_MODIFIED},
+        )
+
+    async def test_concurrent_identical_requests_are_coalesced(self):
+        responses = await asyncio.gather(*(
+            self.consumer.get('/data/wow/item/19019', params={'namespace': 'static-eu', 'locale': 'en_US'})
+            for _ in range(10)
+        ))
+
+        self.assertEqual(1, len(self.upstream_requests))
+        self.assertEqual('eu.api.blizzard.com', self.upstream_requests[0].url.host)
+        self.assertEqual('DummyAccessToken', self.upstream_requests[0].url.params['access_token'])
+        self.assertEqual(
+            [{'path': '/data/wow/item/19019', 'host': 'eu.api.blizzard.com'}] * 10,
+            [response.json() for response in responses],
+        )
+
+    async def test_static_responses_are_reused(self):
+        params = {'namespace': 'static-us', 'access_token': 'ignored'}
+        await self.consumer.get('/data/wow/item/19019', params=params)
+        await self.consumer.get('/data/wow/item/19019', params=params)
+
+        self.assertEqual(1, len(self.upstream_requests))
+        self.assertEqual(1, self.mirror.hits)
+
+    async def test_dynamic_responses_are_revalidated(self):
+        self.mirror.revalidate_interval = 0
+        params = {'namespace': 'dynamic-us'}
+        first = await self.consumer.get('/data/wow/connected-realm/4/auctions', params=params)
+        second = await self.consumer.get('/data/wow/connected-realm/4/auctions', params=params)
+
+        self.assertEqual(2, len(self.upstream_requests))
+        self.assertEqual(LAST_MODIFIED, self.upstream_requests[1].headers['if-modified-since'])
+        self.assertEqual(first.json(), second.json())
+
+    async def test_consumers_get_304_when_unchanged(self):
+        response = await self.consumer.get(
+            '/data/wow/auctions/commodities',
+            params={'namespace': 'dynamic-us'},
+            headers={'If-Modified-Since': LAST_MODIFIED},
+        )
+
+        self.assertEqual(304, response.status_code)
+
+    async def test_unknown_regions_are_rejected(self):
+        for namespace in ('static-evil.example#', 'static-evil.example/', 'dynamic-cn'):
+            response = await self.consumer.get('/data/wow/item/1', params={'namespace': namespace})
+            self.assertEqual(400, response.status_code)
+
+        self.assertEqual([], self.upstream_requests)
+
+    async def test_paths_naming_another_host_are_rejected(self):
+        for path in ('//evil.example/x', '////evil.example/x'):
+            response = await self.mirror.get(path, {'namespace': 'static-us'})
+            self.assertEqual(400, response.status)
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.mirror.port)
+        writer.write(b'GET ////evil.example/x?namespace=static-us HTTP/1.1\r\nConnection: close\r\n\r\n')
+        await writer.drain()
+        status_line = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+
+        self.assertIn(b' 400 ', status_line)
+        self.assertEqual([], self.upstream_requests)
+
+    async def test_wow_api_can_use_the_mirror(self):
+        consumer_api = await WowApi.create(
+            'us', api_url=f'http://127.0.0.1:{self.mirror.port}', access_token='unused'
+        )
+        try:
+            item = await consumer_api.get_item_by_id(19019)
+        finally:
+            await consumer_api.close()
+
+        self.assertEqual({'path': '/data/wow/item/19019', 'host': 'us.api.blizzard.com'}, item)
+
+    def test_least_recently_used_responses_are_dropped(self):
+        self.mirror.max_bytes = 10
+        self.mirror._store('a', CachedResponse(200, b'123456'))
+        self.mirror._store('b', CachedResponse(200, b'123456'))
+
+        self.assertEqual(['b'], list(self.mirror._cache))
+        self.assertEqual(6, self.mirror.cached_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
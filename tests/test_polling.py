@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+from getwowdataasync.polling import AuctionPoller, COMMODITIES, _Snapshot
+
+
+class FakeApi:
+    def __init__(self, last_modified_headers):
+        self.last_modified_headers = list(last_modified_headers)
+        self.requests = []
+
+    async def get_auctions_if_modified(self, connected_realm_id, last_modified=None):
+        self.requests.append((connected_realm_id, last_modified))
+        if not self.last_modified_headers:
+            return None, last_modified
+        header = self.last_modified_headers.pop(0)
+        return {'auctions': [header]}, header
+
+
+class TestAuctionPoller(unittest.IsolatedAsyncioTestCase):
+    async def test_new_snapshots_are_delivered_to_callback(self):
+        api = FakeApi(['Mon, 27 Jun 2022 18:00:00 GMT', 'Mon, 27 Jun 2022 19:00:00 GMT'])
+        received = []
+
+        async def callback(connected_realm_id, auctions, published):
+            received.append((connected_realm_id, published.hour))
+            if len(received) == 2:
+                poller.stop()
+
+        poller = AuctionPoller(api, callback, [4], include_commodities=False, jitter=0, spread=0)
+        await asyncio.wait_for(poller.run(), 5)
+
+        self.assertEqual([(4, 18), (4, 19)], received)
+        self.assertEqual((4, 'Mon, 27 Jun 2022 18:00:00 GMT'), api.requests[1])
+        self.assertEqual(3600, poller.snapshots[4].interval)
+
+    async def test_commodities_are_polled(self):
+        api = AsyncMock()
+        api.get_commodities_if_modified.return_value = ({'auctions': []}, 'Mon, 27 Jun 2022 18:00:00 GMT')
+
+        def callback(key, commodities, published):
+            poller.stop()
+
+        poller = AuctionPoller(api, callback, [], jitter=0)
+        await asyncio.wait_for(poller.run(), 5)
+
+        api.get_commodities_if_modified.assert_awaited_once_with(None)
+        self.assertIn(COMMODITIES, poller.snapshots)
+
+    def test_learn_interval_averages_intervals(self):
+        poller = AuctionPoller(None, None)
+        snapshot = _Snapshot(3600)
+
+        poller._learn_interval(snapshot, 0)
+        poller._learn_interval(snapshot, 3000)
+        poller._learn_interval(snapshot, 7000)
+
+        self.assertAlmostEqual(0.7 * 3000 + 0.3 * 4000, snapshot.interval)
+
+
+if __name__ == "__main__":
+    unittest.main()
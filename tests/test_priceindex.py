@@ -0,0 +1,46 @@
+import unittest
+
+from getwowdataasync.auctions import AuctionSnapshot
+from getwowdataasync.priceindex import CrossRealmPriceIndex
+
+
+def auctions(*listings):
+    return {'auctions': [
+        {'id': position, 'item': {'id': item_id}, 'quantity': quantity, 'buyout': price}
+        for position, (item_id, quantity, price) in enumerate(listings)
+    ]}
+
+
+class TestCrossRealmPriceIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = CrossRealmPriceIndex()
+        self.index.update_realm(4, auctions((10, 1, 500), (10, 2, 300), (11, 1, 50)))
+        self.index.update_realm(5, auctions((10, 1, 200)))
+        self.index.update_realm(6, AuctionSnapshot.from_json(auctions((10, 4, 900))))
+
+    def test_cheapest(self):
+        self.assertEqual([(5, 200, 1), (4, 300, 3)], self.index.cheapest(10, 2))
+
+    def test_most_expensive(self):
+        self.assertEqual([(6, 900, 4), (4, 300, 3)], self.index.most_expensive(10, 2))
+
+    def test_update_only_changes_affected_items(self):
+        changed = self.index.update_realm(4, auctions((10, 1, 100), (11, 1, 50)))
+
+        self.assertEqual(1, changed)
+        self.assertEqual([(4, 100, 1)], self.index.cheapest(10))
+
+    def test_items_missing_from_new_snapshot_are_removed(self):
+        self.index.update_realm(4, auctions((10, 3, 300)))
+
+        self.assertEqual([], self.index.cheapest(11))
+        self.assertIsNone(self.index.realm_price(11, 4))
+
+    def test_remove_realm(self):
+        self.index.remove_realm(5)
+
+        self.assertEqual([(4, 300, 3)], self.index.cheapest(10))
+
+
+if __name__ == "__main__":
+    unittest.main()
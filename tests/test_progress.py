@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+
+from getwowdataasync.progress import ProgressReporter
+
+
+class TestProgressReporter(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.reporter = ProgressReporter(self.events.append, interval=10)
+
+    def test_no_callback_reports_nothing(self):
+        progress = ProgressReporter().track('get_all_items')
+        progress.advance()
+        progress.finish()
+
+    @patch('getwowdataasync.progress.time.monotonic')
+    def test_events_are_rate_limited(self, mocked_monotonic):
+        mocked_monotonic.return_value = 0
+        progress = self.reporter.track('get_all_realms', total=100)
+        for _ in range(50):
+            progress.advance()
+        mocked_monotonic.return_value = 10
+        progress.advance(10)
+
+        self.assertEqual(1, len(self.events))
+        event = self.events[0]
+        self.assertEqual(('get_all_realms', 60, 100), (event.operation, event.done, event.total))
+        self.assertEqual(6, event.rate)
+        self.assertAlmostEqual(10 * 40 / 60, event.eta)
+        self.assertFalse(event.finished)
+
+    @patch('getwowdataasync.progress.time.monotonic')
+    def test_eta_from_fraction_when_total_unknown(self, mocked_monotonic):
+        mocked_monotonic.return_value = 0
+        progress = self.reporter.track('get_all_items')
+        progress.update(0.25)
+        mocked_monotonic.return_value = 10
+        progress.advance(1000)
+
+        self.assertEqual(30, self.events[0].eta)
+
+    def test_finish_always_reports(self):
+        progress = self.reporter.track('get_all_items')
+        progress.advance(3)
+        progress.finish()
+
+        self.assertEqual(1, len(self.events))
+        self.assertTrue(self.events[0].finished)
+        self.assertEqual(3, self.events[0].done)
+        self.assertEqual(0, self.events[0].eta)
+
+
+if __name__ == '__main__':
+    unittest.main()
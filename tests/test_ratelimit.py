@@ -0,0 +1,185 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from getwowdataasync.ratelimit import (
+    RateLimiter, SQLiteRateLimiter, QuotaPlanner, bulk_requests, request_priority, HIGH, BULK, _PriorityLock
+)
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_acquire_does_not_wait_under_the_limit(self):
+        limiter = RateLimiter(per_second=10)
+
+        start = time.monotonic()
+        for _ in range(10):
+            await limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.5)
+
+    async def test_acquire_waits_when_second_is_full(self):
+        limiter = RateLimiter(per_second=5)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.9)
+
+    async def test_acquire_counts_against_parent(self):
+        parent = RateLimiter(per_second=5)
+        limiter = RateLimiter(per_second=100, parent=parent)
+
+        for _ in range(3):
+            await limiter.acquire()
+
+        self.assertEqual(3, len(parent._windows[0][2]))
+
+    async def test_high_priority_requests_go_ahead_of_waiting_bulk_requests(self):
+        limiter = RateLimiter(per_second=1)
+        await limiter.acquire()
+        order = []
+
+        async def request(name, priority):
+            with request_priority(priority):
+                await limiter.acquire()
+            order.append(name)
+
+        first_bulk = asyncio.create_task(request('bulk 1', BULK))
+        second_bulk = asyncio.create_task(request('bulk 2', BULK))
+        await asyncio.sleep(0.1)
+        high = asyncio.create_task(request('high', HIGH))
+        await asyncio.gather(first_bulk, second_bulk, high)
+
+        # bulk 1 already held the lock when high arrived
+        self.assertEqual(['bulk 1', 'high', 'bulk 2'], order)
+
+    def test_delay_uses_the_hour_window(self):
+        limiter = RateLimiter(per_second=100, per_hour=2)
+        limiter._record(0)
+        limiter._record(10)
+
+        actual_delay = limiter._delay(20)
+        expected_delay = 3580
+
+        self.assertEqual(expected_delay, actual_delay)
+
+
+class TestPriorityLock(unittest.IsolatedAsyncioTestCase):
+    async def test_waiters_get_the_lock_by_priority_then_arrival(self):
+        lock = _PriorityLock()
+        order = []
+
+        async def wait_for_lock(name, priority):
+            with request_priority(priority):
+                async with lock:
+                    order.append(name)
+
+        async with lock:
+            tasks = [
+                asyncio.create_task(wait_for_lock('bulk', 2)),
+                asyncio.create_task(wait_for_lock('normal 1', 1)),
+                asyncio.create_task(wait_for_lock('high', 0)),
+                asyncio.create_task(wait_for_lock('normal 2', 1)),
+            ]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(['high', 'normal 1', 'normal 2', 'bulk'], order)
+
+    async def test_cancelled_waiter_is_skipped(self):
+        lock = _PriorityLock()
+
+        async with lock:
+            cancelled = asyncio.create_task(lock.__aenter__())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.gather(cancelled, return_exceptions=True)
+
+        await asyncio.wait_for(lock.__aenter__(), 0.1)
+
+
+class TestSQLiteRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, 'requests.sqlite')
+
+    async def asyncTearDown(self):
+        self.temporary_directory.cleanup()
+
+    async def test_limiters_on_the_same_file_share_a_budget(self):
+        # Two limiters stand in for two processes
+        first_limiter = SQLiteRateLimiter(self.path, per_second=3)
+        second_limiter = SQLiteRateLimiter(self.path, per_second=3)
+
+        start = time.monotonic()
+        await asyncio.gather(first_limiter.acquire(), first_limiter.acquire(), second_limiter.acquire())
+        first_elapsed = time.monotonic() - start
+        await second_limiter.acquire()
+        second_elapsed = time.monotonic() - start
+        first_limiter.close()
+        second_limiter.close()
+
+        self.assertLess(first_elapsed, 0.5)
+        self.assertGreaterEqual(second_elapsed, 0.9)
+
+    async def test_old_requests_are_deleted(self):
+        limiter = SQLiteRateLimiter(self.path)
+        limiter._connection.execute("INSERT INTO requests VALUES (?)", (time.time() - 7200,))
+
+        await limiter.acquire()
+        count = limiter._connection.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+        limiter.close()
+
+        self.assertEqual(1, count)
+
+
+class TestQuotaPlanner(unittest.IsolatedAsyncioTestCase):
+    async def test_bulk_requests_leave_the_reserve_for_other_requests(self):
+        planner = QuotaPlanner(RateLimiter(per_second=100, per_hour=10), reserve=0.2)
+        for _ in range(8):
+            with bulk_requests():
+                await planner.acquire()
+
+        with bulk_requests():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(planner.acquire(), 0.2)
+        await asyncio.wait_for(planner.acquire(), 0.2)
+
+        self.assertEqual(8, planner.bulk_requests_made)
+        self.assertEqual(9, await planner.rate_limiter.used_this_hour())
+
+    async def test_estimate_extrapolates_crawl_progress(self):
+        planner = QuotaPlanner(RateLimiter(per_second=100, per_hour=1000), reserve=0)
+        crawl = planner.start_crawl()
+        with bulk_requests():
+            for _ in range(100):
+                await planner.acquire()
+
+        crawl.update(0.25)
+        estimate = await planner.estimate()
+
+        self.assertEqual(300, estimate['remaining_requests'])
+        self.assertEqual(3, estimate['seconds'])
+
+    async def test_estimate_waits_for_next_hour_when_over_budget(self):
+        planner = QuotaPlanner(RateLimiter(per_second=100, per_hour=100), reserve=0)
+        crawl = planner.start_crawl()
+        with bulk_requests():
+            for _ in range(50):
+                await planner.acquire()
+
+        crawl.update(0.25)
+        estimate = await planner.estimate()
+        crawl.finish()
+
+        self.assertEqual(150, estimate['remaining_requests'])
+        self.assertEqual(3600, estimate['seconds'])
+        self.assertEqual([], planner.crawls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, call, patch
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.realms import RealmIndex
+
+
+def search_result(connected_realm_id, realms):
+    return {'data': {'id': connected_realm_id, 'realms': [
+        {'id': realm_id, 'slug': slug, 'name': {'en_US': name, 'de_DE': name + ' DE'}}
+        for realm_id, slug, name in realms
+    ]}}
+
+
+def index_json(connected_realm_ids):
+    return {'connected_realms': [
+        {'href': f'https://us.api.blizzard.com/data/wow/connected-realm/{connected_realm_id}?namespace=dynamic-us'}
+        for connected_realm_id in connected_realm_ids
+    ]}
+
+
+class TestRealmIndex(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        WowApi._get_access_token = AsyncMock(return_value='DummyAccessToken')
+        self.TestApi = await WowApi.create('us')
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, 'realms.json')
+
+    async def asyncTearDown(self):
+        await self.TestApi.close()
+        self.temporary_directory.cleanup()
+
+    @patch('getwowdataasync.WowApi.connected_realm_search')
+    async def build(self, mocked_connected_realm_search):
+        mocked_connected_realm_search.side_effect = [
+            {'pageCount': 2, 'results': [search_result(4, [(1, 'winterhoof', 'Winterhoof'), (2, 'kilrogg', "Kilrogg")])]},
+            {'pageCount': 2, 'results': [search_result(3676, [(3676, 'area-52', 'Area 52')])]},
+        ]
+        index = RealmIndex(self.path)
+        await index.build(self.TestApi)
+        self.assertEqual(2, mocked_connected_realm_search.await_count)
+        return index
+
+    async def test_lookup_by_name_slug_and_id(self):
+        index = await self.build()
+
+        self.assertEqual(4, index.connected_realm_id('Winterhoof'))
+        self.assertEqual(4, index.connected_realm_id('winterhoof DE'))
+        self.assertEqual(3676, index.connected_realm_id('area-52'))
+        self.assertEqual(4, index.connected_realm_id(2))
+        with self.assertRaises(KeyError):
+            index.connected_realm_id('Winterhoof', region='eu')
+
+    async def test_index_is_persisted(self):
+        await self.build()
+
+        index = RealmIndex(self.path)
+
+        self.assertIn('us', index)
+        self.assertEqual(4, index.connected_realm_id('Kilrogg'))
+        self.assertEqual({4, 3676}, index.connected_realm_ids())
+
+    @patch('getwowdataasync.WowApi.get_connected_realm_index')
+    @patch('getwowdataasync.WowApi.connected_realm_search')
+    async def test_refresh_only_requests_new_connected_realms(
+        self, mocked_connected_realm_search, mocked_get_connected_realm_index
+    ):
+        index = await self.build()
+        mocked_get_connected_realm_index.return_value = index_json([4, 5])
+        mocked_connected_realm_search.side_effect = [
+            {'results': [search_result(5, [(7, 'new-realm', 'New Realm')])]},
+            {'results': []},  # Area 52 is gone
+        ]
+
+        added, removed = await index.refresh(self.TestApi)
+
+        self.assertEqual(({5}, {3676}), (added, removed))
+        self.assertEqual(
+            [call({'id': 5}), call({'realms.id': 3676})],
+            mocked_connected_realm_search.await_args_list,
+        )
+        self.assertEqual(5, RealmIndex(self.path).connected_realm_id('New Realm'))
+        with self.assertRaises(KeyError):
+            index.connected_realm_id('Area 52')
+
+    @patch('getwowdataasync.WowApi.get_connected_realm_index')
+    @patch('getwowdataasync.WowApi.connected_realm_search')
+    async def test_refresh_finds_realms_merged_into_existing_connected_realms(
+        self, mocked_connected_realm_search, mocked_get_connected_realm_index
+    ):
+        index = await self.build()
+        mocked_get_connected_realm_index.return_value = index_json([4])
+        mocked_connected_realm_search.return_value = {'results': [search_result(4, [
+            (1, 'winterhoof', 'Winterhoof'), (2, 'kilrogg', 'Kilrogg'), (3676, 'area-52', 'Area 52'),
+        ])]}
+
+        added, removed = await index.refresh(self.TestApi)
+
+        self.assertEqual((set(), {3676}), (added, removed))
+        mocked_connected_realm_search.assert_awaited_once_with({'realms.id': 3676})
+        self.assertEqual(4, index.connected_realm_id('Area 52'))
+        self.assertEqual(4, RealmIndex(self.path).connected_realm_id('area-52'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from getwowdataasync.getdata import WowApi
+from getwowdataasync.regions import RegionPool
+
+
+class TestRegionPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.mocked_get_access_token = AsyncMock(return_value='DummyAccessToken')
+        WowApi._get_access_token = self.mocked_get_access_token
+        self.pool = await RegionPool.create(['us', 'eu'], region_rate_limits={'eu': (10, 100)})
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    def test_regions_share_token_and_client(self):
+        self.assertEqual(1, self.mocked_get_access_token.await_count)
+        self.assertEqual('DummyAccessToken', self.pool['eu'].access_token)
+        self.assertIs(self.pool['us'].client, self.pool['eu'].client)
+
+    def test_region_rate_limits_share_the_pool_budget(self):
+        self.assertIs(self.pool.rate_limiter, self.pool['us'].rate_limiter)
+        self.assertIs(self.pool.rate_limiter, self.pool['eu'].rate_limiter.parent)
+        self.assertEqual(10, self.pool['eu'].rate_limiter.per_second)
+
+    async def test_fan_out_tags_results_by_region(self):
+        async def get_data(api, url_name, path_ids={}):
+            return {'region': api.region}
+
+        with patch.object(WowApi, '_get_data', get_data):
+            actual_results = await self.pool.fan_out('get_wow_token')
+
+        self.assertEqual({'us': {'region': 'us'}, 'eu': {'region': 'eu'}}, actual_results)
+
+    async def test_fan_out_returns_errors_per_region(self):
+        async def fail_in_eu(api):
+            if api.region == 'eu':
+                raise ValueError('eu failed')
+            return 'ok'
+
+        actual_results = await self.pool.fan_out(fail_in_eu)
+
+        self.assertEqual('ok', actual_results['us'])
+        self.assertIsInstance(actual_results['eu'], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from getwowdataasync.sinks import CallbackSink, CSVSink, NDJSONSink, SinkWriter, SQLiteSink
+
+
+class TestSinks(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_ndjson_sink_writes_a_line_per_element(self):
+        path = os.path.join(self.directory.name, 'items.ndjson')
+        with NDJSONSink(path) as sink:
+            await sink.write([{'id': 1}, {'id': 2}])
+            await sink.write([{'id': 3}])
+
+        with open(path, encoding='utf-8') as file:
+            actual_elements = [json.loads(line) for line in file]
+        self.assertEqual([{'id': 1}, {'id': 2}, {'id': 3}], actual_elements)
+        self.assertEqual(3, sink.written)
+
+    async def test_csv_sink_flattens_elements_into_the_first_batchs_columns(self):
+        path = os.path.join(self.directory.name, 'items.csv')
+        with CSVSink(path) as sink:
+            await sink.write([{'id': 1, 'quality': {'type': 'EPIC'}, 'tags': [1, 2]}])
+            await sink.write([{'id': 2, 'extra': 'dropped'}])
+
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual('id,quality.type,tags\n1,EPIC,"[1, 2]"\n2,,\n', file.read())
+
+    async def test_csv_sink_appends_in_the_existing_headers_columns(self):
+        path = os.path.join(self.directory.name, 'items.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('id,name,level\n1,a,2\n')
+
+        with CSVSink(path, append=True) as sink:
+            await sink.write([{'level': 7, 'id': 2, 'name': 'b'}, {'name': 'c', 'id': 3}])
+
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual('id,name,level\n1,a,2\n2,b,7\n3,c,\n', file.read())
+
+    async def test_sqlite_sink_replaces_elements_by_id(self):
+        path = os.path.join(self.directory.name, 'wow.sqlite')
+        with SQLiteSink(path, table='items') as sink:
+            await sink.write([{'id': 1, 'name': 'old'}, {'id': 2, 'name': 'other'}])
+            await sink.write([{'id': 1, 'name': 'new'}])
+
+        connection = sqlite3.connect(path)
+        rows = connection.execute('SELECT id, json FROM items ORDER BY id').fetchall()
+        connection.close()
+        self.assertEqual([(1, {'id': 1, 'name': 'new'}), (2, {'id': 2, 'name': 'other'})],
+                         [(row[0], json.loads(row[1])) for row in rows])
+
+    async def test_callback_sink_awaits_async_callbacks(self):
+        batches = []
+
+        async def callback(elements):
+            batches.append(elements)
+
+        await CallbackSink(callback).write([{'id': 1}])
+
+        self.assertEqual([[{'id': 1}]], batches)
+
+
+class TestSinkWriter(unittest.IsolatedAsyncioTestCase):
+    async def test_write_waits_when_sink_falls_behind(self):
+        release = asyncio.Event()
+        written = []
+
+        async def slow_sink(elements):
+            await release.wait()
+            written.append(elements)
+
+        writer = SinkWriter(CallbackSink(slow_sink), max_pending=1)
+        await writer.write([1])  # taken by the sink
+        await asyncio.sleep(0)
+        await writer.write([2])  # waits in the queue
+        blocked_write = asyncio.ensure_future(writer.write([3]))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked_write.done())
+
+        release.set()
+        await blocked_write
+        await writer.close()
+        self.assertEqual([[1], [2], [3]], written)
+
+    async def test_sink_errors_reach_the_crawl(self):
+        def failing_sink(elements):
+            raise OSError('disk full')
+
+        writer = SinkWriter(CallbackSink(failing_sink), max_pending=1)
+        with self.assertRaises(OSError):
+            for batch in range(5):
+                await writer.write([batch])
+                await asyncio.sleep(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
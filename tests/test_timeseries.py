@@ -0,0 +1,58 @@
+import unittest
+
+from getwowdataasync.timeseries import CommodityPriceSeries, DAY, WEEK, PricePoint
+
+
+def commodities(*auctions):
+    return {'auctions': [
+        {'id': position, 'item': {'id': item_id}, 'quantity': quantity, 'unit_price': price}
+        for position, (item_id, quantity, price) in enumerate(auctions)
+    ]}
+
+
+class TestCommodityPriceSeries(unittest.TestCase):
+    def test_ingest_records_min_percentile_and_volume(self):
+        series = CommodityPriceSeries(percentile=0.5)
+
+        series.ingest(commodities((1, 10, 100), (1, 10, 300), (1, 20, 200)), 0)
+
+        self.assertEqual([PricePoint(0, 0, 100, 200, 40)], series.series(1))
+
+    def test_old_points_are_rolled_up_into_daily_buckets(self):
+        series = CommodityPriceSeries(percentile=0, raw_retention=DAY, daily_retention=30 * DAY)
+
+        series.ingest(commodities((1, 10, 100)), 0)
+        series.ingest(commodities((1, 30, 50)), 3600)
+        series.ingest(commodities((1, 10, 70)), 2 * DAY)
+
+        actual_points = series.series(1)
+        expected_points = [
+            PricePoint(0, DAY, 50, (100 * 10 + 50 * 30) / 40, 20),
+            PricePoint(2 * DAY, 0, 70, 70, 10),
+        ]
+
+        self.assertEqual(expected_points, actual_points)
+
+    def test_daily_buckets_are_rolled_up_into_weekly_buckets(self):
+        series = CommodityPriceSeries(raw_retention=DAY, daily_retention=WEEK)
+        monday = 4 * DAY
+
+        for day in range(20):
+            series.ingest(commodities((1, 1, 100 + day)), monday + day * DAY)
+
+        periods = [point.period for point in series.series(1)]
+
+        self.assertEqual([WEEK, WEEK] + [DAY] * 6 + [0, 0], periods)
+        self.assertEqual(monday, series.series(1)[0].timestamp)
+
+    def test_series_filters_by_time(self):
+        series = CommodityPriceSeries()
+
+        series.ingest(commodities((1, 1, 100)), 0)
+        series.ingest(commodities((1, 1, 100)), 3600)
+
+        self.assertEqual([3600], [point.timestamp for point in series.series(1, start=1)])
+
+
+if __name__ == "__main__":
+    unittest.main()